@@ -0,0 +1,227 @@
+"""
+Incremental, resumable harvesting of arXiv submissions.
+
+Papers are fetched from the arXiv Atom API one category and one day of
+submissions at a time, converted into ``Paper`` models as each page
+arrives and written in batches through ``PaperService.create_many``. After
+every page a checkpoint records how far each category got, so an
+interrupted harvest resumes from the last written page.
+"""
+
+# Standard Library
+import datetime
+import json
+import logging
+import os
+import time
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ElementTree
+
+# Third Party
+from pydantic import ValidationError
+
+# Library
+from mongodb_api.models.models import Paper
+
+logger = logging.getLogger(__name__)
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+# arXiv asks API clients to wait three seconds between requests.
+DEFAULT_DELAY = 3.0
+DEFAULT_PAGE_SIZE = 100
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ARXIV = "{http://arxiv.org/schemas/atom}"
+_OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+
+def fetch_url(url, timeout=30.0):
+    """Return the body of ``url`` as bytes."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+def window_query(category, day):
+    """Search query for the submissions of ``category`` on ``day`` (UTC)."""
+    start = day.strftime("%Y%m%d")
+    end = (day + datetime.timedelta(days=1)).strftime("%Y%m%d")
+    return f"cat:{category} AND submittedDate:[{start}0000 TO {end}0000]"
+
+
+def _text(element, tag):
+    child = element.find(tag)
+    if child is None or child.text is None:
+        return None
+    # Titles and abstracts are hard-wrapped in the feed.
+    return " ".join(child.text.split())
+
+
+def parse_entry(entry):
+    """Map one Atom ``<entry>`` element to ``Paper`` fields."""
+    pdf_url = None
+    for link in entry.findall(f"{_ATOM}link"):
+        if link.get("title") == "pdf":
+            pdf_url = link.get("href")
+    return {
+        "_id": _text(entry, f"{_ATOM}id"),
+        "title": _text(entry, f"{_ATOM}title"),
+        "summary": _text(entry, f"{_ATOM}summary"),
+        "published": _text(entry, f"{_ATOM}published"),
+        "updated": _text(entry, f"{_ATOM}updated"),
+        "pdf_url": pdf_url,
+        "doi": _text(entry, f"{_ARXIV}doi"),
+        "comment": _text(entry, f"{_ARXIV}comment"),
+    }
+
+
+def parse_feed(body):
+    """Return ``(total_results, entries)`` from an arXiv Atom feed."""
+    root = ElementTree.fromstring(body)
+    total = root.find(f"{_OPENSEARCH}totalResults")
+    entries = [parse_entry(entry) for entry in root.iter(f"{_ATOM}entry")]
+    total_results = int(total.text) if total is not None else len(entries)
+    return total_results, entries
+
+
+class RateLimiter:
+    """Enforce a minimum interval between successive calls to ``wait``."""
+
+    def __init__(self, min_interval=DEFAULT_DELAY, clock=time.monotonic,
+                 sleep=time.sleep):
+        self._min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._last = None
+
+    def wait(self):
+        if self._last is not None:
+            remaining = self._min_interval - (self._clock() - self._last)
+            if remaining > 0:
+                self._sleep(remaining)
+        self._last = self._clock()
+
+
+class Checkpoint:
+    """
+    Harvest progress persisted as JSON.
+
+    For each category it stores the day currently being harvested and the
+    number of results of that day already written. The file is replaced
+    atomically, so a crash never leaves a truncated checkpoint behind.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._state = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                self._state = json.load(file)
+
+    def position(self, category, default_day):
+        """Return the ``(day, offset)`` to resume ``category`` from."""
+        entry = self._state.get(category)
+        if entry is None:
+            return default_day, 0
+        return datetime.date.fromisoformat(entry["day"]), entry["offset"]
+
+    def save(self, category, day, offset):
+        self._state[category] = {"day": day.isoformat(), "offset": offset}
+        temporary_path = f"{self._path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self._state, file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self._path)
+
+
+class ArxivHarvester:
+    """
+    Harvest arXiv submissions by category and day into the paper service.
+
+    Parameters:
+    - service (PaperService): Service the papers are written through.
+    - checkpoint (Checkpoint): Persisted harvest progress.
+    - fetch (Callable[[str], bytes]): Returns the body of a feed URL; swap
+      it for a stub in tests.
+    - base_url (str): arXiv API query endpoint.
+    - page_size (int): Results requested per feed page.
+    - rate_limiter (RateLimiter): Spacing between feed requests.
+    """
+
+    def __init__(self, service, checkpoint, fetch=fetch_url,
+                 base_url=ARXIV_API_URL, page_size=DEFAULT_PAGE_SIZE,
+                 rate_limiter=None):
+        self._service = service
+        self._checkpoint = checkpoint
+        self._fetch = fetch
+        self._base_url = base_url
+        self._page_size = page_size
+        self._rate_limiter = rate_limiter or RateLimiter()
+
+    def page_url(self, category, day, offset):
+        params = {
+            "search_query": window_query(category, day),
+            "start": offset,
+            "max_results": self._page_size,
+            "sortBy": "submittedDate",
+            "sortOrder": "ascending",
+        }
+        return f"{self._base_url}?{urllib.parse.urlencode(params)}"
+
+    def harvest(self, categories, since, until):
+        """
+        Harvest every day in ``[since, until)`` for each category.
+
+        Days before a category's checkpoint are skipped, so the same call
+        can be repeated daily (e.g. with ``until`` set to today) to pick up
+        new submissions only.
+
+        Returns:
+        The number of papers reported as ``created``, ``duplicate`` and
+        ``invalid`` across all written batches.
+        """
+        totals = {"created": 0, "duplicate": 0, "invalid": 0}
+        for category in categories:
+            day, offset = self._checkpoint.position(category, since)
+            day = max(day, since)
+            while day < until:
+                for statuses in self._harvest_window(category, day, offset):
+                    for status in statuses:
+                        totals[status] += 1
+                day += datetime.timedelta(days=1)
+                offset = 0
+                self._checkpoint.save(category, day, offset)
+        return totals
+
+    def _harvest_window(self, category, day, offset):
+        while True:
+            self._rate_limiter.wait()
+            body = self._fetch(self.page_url(category, day, offset))
+            total_results, entries = parse_feed(body)
+            if not entries:
+                return
+
+            statuses = self._write(entries)
+            offset += len(entries)
+            self._checkpoint.save(category, day, offset)
+            logger.info(
+                "Harvested %s %s: %d/%d", category, day, offset,
+                total_results,
+            )
+            yield statuses
+            if offset >= total_results:
+                return
+
+    def _write(self, entries):
+        papers_data = []
+        statuses = []
+        for entry in entries:
+            try:
+                paper = Paper.model_validate(entry)
+            except ValidationError as error:
+                logger.warning("Skipping invalid entry %s: %s",
+                               entry.get("_id"), error)
+                statuses.append("invalid")
+                continue
+            papers_data.append(paper.model_dump_serialized(json_dump=False))
+        statuses.extend(self._service.create_many(papers_data))
+        return statuses
@@ -1,95 +1,109 @@
-#%%
-# Third Party
-import arxiv
+"""
+Command line entry point of the arXiv harvester.
 
-# Library
-from mongodb_api.models.models import Paper
+Harvests the submissions of the given categories day by day and writes
+them to the MongoDB ``papers`` collection configured in
+``~/creds/mongodb.env``, e.g. from a daily cron job::
 
-#%%
+    python -m arxiv_crawler.main --category cs.CR --category cs.LG \\
+        --since 2024-01-01
+"""
 
-search = arxiv.Search(
-  query = "image generation",
-  max_results = 1,
-  sort_by = arxiv.SortCriterion.Relevance
-)
+# Standard Library
+import argparse
+import datetime
+import logging
+import os
+from os.path import expanduser
 
-for result in arxiv.Client().results(search):
-    print(result)
-# %%
+# Third Party
+from dotenv import dotenv_values
+from pymongo import MongoClient
 
-# %%
-paper = Paper(result)
-# %%
-paper=Paper(
-    _id=result.entry_id,
-    title=result.title,
-    summary=result.summary,
-    published=result.published,
-    updated=result.updated,
-   # authors=result.authors,
-   # primary_category=result.primary_category,
-   # categories=result.categories,
-    doi=result.doi,
-   # links=result.links,
-    pdf_url=result.pdf_url,
-    comment=result.comment,
-    download_path=None,
-  #  journal_ref=result.journal_ref,
-  #  arxiv_comment=result.arxiv_comment,
-   # primary_arxiv_category=result.primary_arxiv_category,
-  #  arxiv_categories=result.arxiv_categories,
+# Library
+from arxiv_crawler.harvester import (
+    ARXIV_API_URL,
+    DEFAULT_DELAY,
+    DEFAULT_PAGE_SIZE,
+    ArxivHarvester,
+    Checkpoint,
+    RateLimiter,
 )
-# %%
+from mongodb_api.repositories.mongo_paper_repository import (
+    MongoPaperRepository,
+)
+from mongodb_api.services.paper_service import PaperService
 
 
-data = paper.model_dump_serialized(json_dump=False)
-# Make the POST request to create a new paper
-response = requests.post(url, json=data)
-response
-# Standard Library
-# %%
-import datetime
+def parse_args(argv=None):
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--category", dest="categories", action="append", required=True,
+        help="arXiv category to harvest, e.g. cs.CR (repeatable)",
+    )
+    parser.add_argument(
+        "--since", type=datetime.date.fromisoformat, required=True,
+        help="first submission day to harvest (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--until", type=datetime.date.fromisoformat, default=today,
+        help="stop before this day (default: today, UTC)",
+    )
+    parser.add_argument(
+        "--checkpoint", default="harvest_checkpoint.json",
+        help="file recording harvest progress",
+    )
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument(
+        "--delay", type=float, default=DEFAULT_DELAY,
+        help="minimum seconds between arXiv API requests",
+    )
+    parser.add_argument("--base-url", default=ARXIV_API_URL)
+    parser.add_argument(
+        "--collapse-versions", action="store_true",
+        help="keep only the latest version of each harvested paper",
+    )
+    parser.add_argument(
+        "--backfill-arxiv-ids", action="store_true",
+        help="first store arxiv_id/version on papers written without them",
+    )
+    return parser.parse_args(argv)
 
-paper = Paper(
-    entry_id="http://example.com/paper1",
-    title="Sample Paper",
-    summary="This is a summary of the sample paper.",
-    published=datetime.datetime.now(),
-    updated=datetime.datetime.now(),
-    pdf_url="http://example.com/paper1.pdf"
-)
 
-# Serialize to dictionary
-paper_dict = paper.model_dump()
-print(paper_dict)
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
 
-# Serialize to JSON string
-paper_json = paper.model_dump_json()
-print(paper_json)
-# %%
-response = requests.post(url, data=paper_dict)
-# %%
-response = requests.get(url, data="http://arxiv.org/abs/2210.06998v2")
-# %%
-response = requests.delete(url, data="http://arxiv.org/abs/2210.06998v2")
-print(response)
-print(response.text)
-# Standard Library
-import json
-
-# Third Party
-# %%
-import requests
+    config = dotenv_values(os.path.join(expanduser("~"), "creds",
+                                        "mongodb.env"))
+    client = MongoClient(config["ATLAS_URI"])
+    try:
+        service = PaperService(
+            MongoPaperRepository(client[config["DB_NAME"]]["papers"]),
+            collapse_versions=args.collapse_versions,
+        )
+        if args.backfill_arxiv_ids:
+            logging.info(
+                "Backfilled arXiv ids of %d papers",
+                service.backfill_arxiv_ids(),
+            )
+        harvester = ArxivHarvester(
+            service,
+            Checkpoint(args.checkpoint),
+            base_url=args.base_url,
+            page_size=args.page_size,
+            rate_limiter=RateLimiter(args.delay),
+        )
+        totals = harvester.harvest(args.categories, args.since, args.until)
+    finally:
+        client.close()
 
-# API endpoint for creating a paper
-url = "http://localhost:8000/paper/"  # Replace with your actual API URL
+    logging.info(
+        "Harvest finished: %d created, %d duplicate, %d invalid",
+        totals["created"], totals["duplicate"], totals["invalid"],
+    )
 
-response = requests.get(url)
-print(response)
-print(response.text)
-# %%
 
-response = requests.delete(url, data="http://arxiv.org/abs/2210.06998v2")
-print(response)
-print(response.text)
-# %%
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Concurrent download of paper PDFs into content-addressed storage.
+
+``PdfFetcher`` streams the ``pdf_url`` of every paper that has no
+``download_path`` yet and records where the file was stored through
+``PaperService.update_many``, a batch at a time. Downloads run
+concurrently, bounded overall and per host (with a minimum interval
+between requests to the same host), and the bounded queues between the
+paper source, the downloads and the database writes apply backpressure
+in both directions. Run it from a cron job, e.g.::
+
+    python -m arxiv_crawler.pdf_fetcher --storage /data/pdfs \\
+        --per-host 4 --host-delay 1
+
+Files are stored under the SHA-256 of their content, so the same PDF
+served under several URLs is stored once. A download interrupted by an
+error or a restart leaves its partial file behind, and the next attempt
+resumes it with an HTTP ``Range`` request.
+"""
+
+# Standard Library
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from os.path import expanduser
+from urllib.parse import urlsplit
+
+# Third Party
+import httpx
+from dotenv import dotenv_values
+from pymongo import MongoClient
+
+# Library
+from mongodb_api.repositories.mongo_paper_repository import (
+    MongoPaperRepository,
+)
+from mongodb_api.services.paper_service import PaperService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_HOST_DELAY = 1.0
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_DELAY = 2.0
+DEFAULT_TIMEOUT = 60.0
+CHUNK_SIZE = 64 * 1024
+# Statuses worth retrying later; the origin is overloaded or flaky.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PDF_MAGIC = b"%PDF-"
+USER_AGENT = "arxiv-db-pdf-fetcher"
+
+
+class DownloadError(Exception):
+    """A download failed; ``retryable`` tells whether trying again later
+    could succeed."""
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def retry_after(response):
+    """Seconds to wait asked for by a ``Retry-After`` header, if any."""
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class HostLimiter:
+    """
+    Politeness towards one host: at most ``concurrency`` requests in
+    flight and request starts spaced at least ``min_interval`` seconds
+    apart. ``pause`` pushes the next start back, e.g. on ``Retry-After``.
+    """
+
+    def __init__(self, concurrency=DEFAULT_PER_HOST,
+                 min_interval=DEFAULT_HOST_DELAY, clock=time.monotonic):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._min_interval = min_interval
+        self._clock = clock
+        self._next_start = 0.0
+
+    def pause(self, seconds):
+        self._next_start = max(self._next_start, self._clock() + seconds)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                delay = self._next_start - self._clock()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start = self._clock() + self._min_interval
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class ContentStore:
+    """
+    PDFs on disk under ``root``, named by the SHA-256 of their content
+    (``root/ab/ab12...pdf``). Downloads in progress live in
+    ``root/partial``, named after their URL, until they are committed.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._partial_root = os.path.join(self.root, "partial")
+        os.makedirs(self._partial_root, exist_ok=True)
+
+    def partial_path(self, url):
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self._partial_root, f"{name}.part")
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}.pdf")
+
+    def commit(self, partial_path, digest):
+        """
+        Move a finished download to its content address.
+
+        Returns the stored path and whether an identical file was already
+        stored, in which case the download is discarded.
+        """
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            os.remove(partial_path)
+            return path, True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(partial_path, path)
+        return path, False
+
+
+def hash_file(path):
+    """A SHA-256 hash object fed with the content of ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest
+
+
+class PdfFetcher:
+    """
+    Download the PDFs of papers and store their ``download_path``.
+
+    Parameters:
+    - service (PaperService): Service the paths are written through.
+    - store (ContentStore): Where the PDFs are stored.
+    - concurrency (int): Downloads in flight across all hosts.
+    - per_host (int): Downloads in flight per host.
+    - host_delay (float): Minimum seconds between request starts per host.
+    - batch_size (int): Paths written per ``update_many`` call.
+    - queue_size (int): Papers (and finished downloads) buffered between
+      stages; a full queue stops the stage feeding it.
+    - retries (int): Attempts after the first one for retryable failures,
+      with exponential backoff from ``retry_delay`` seconds.
+    - client (httpx.AsyncClient): Client to use instead of a new one.
+    """
+
+    def __init__(self, service, store, concurrency=DEFAULT_CONCURRENCY,
+                 per_host=DEFAULT_PER_HOST, host_delay=DEFAULT_HOST_DELAY,
+                 batch_size=DEFAULT_BATCH_SIZE, queue_size=None,
+                 retries=DEFAULT_RETRIES, retry_delay=DEFAULT_RETRY_DELAY,
+                 timeout=DEFAULT_TIMEOUT, client=None):
+        self._service = service
+        self._store = store
+        self._concurrency = concurrency
+        self._per_host = per_host
+        self._host_delay = host_delay
+        self._batch_size = batch_size
+        self._queue_size = queue_size or 2 * concurrency
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._timeout = timeout
+        self._client = client
+        self._limiters = {}
+        self.stats = Counter()
+
+    async def run(self, papers):
+        """
+        Download the PDFs of ``papers`` (an iterable of paper dicts, e.g.
+        ``PaperService.export_papers()``), skipping those already
+        downloaded or without a ``pdf_url``.
+
+        Returns:
+        Counts of papers ``queued``, files ``downloaded``, ``deduplicated``
+        and ``resumed``, downloads that ``failed``, papers ``updated`` and
+        ``bytes`` received.
+        """
+        self.stats = Counter()
+        downloads = asyncio.Queue(self._queue_size)
+        results = asyncio.Queue(self._queue_size)
+        client = self._client or httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=self._timeout,
+            limits=httpx.Limits(max_connections=self._concurrency),
+            headers={"User-Agent": USER_AGENT},
+        )
+        writer = asyncio.create_task(self._write(results))
+        workers = [
+            asyncio.create_task(self._work(client, downloads, results))
+            for _ in range(self._concurrency)
+        ]
+        try:
+            await self._produce(papers, downloads)
+            await asyncio.gather(*workers)
+            await results.put(None)
+            await writer
+        finally:
+            for task in (*workers, writer):
+                task.cancel()
+            if self._client is None:
+                await client.aclose()
+        return dict(self.stats)
+
+    async def _produce(self, papers, downloads):
+        papers = iter(papers)
+        while True:
+            # The source may be a database cursor; read it off the loop.
+            paper = await asyncio.to_thread(next, papers, None)
+            if paper is None:
+                break
+            if paper.get("download_path") or not paper.get("pdf_url"):
+                continue
+            self.stats["queued"] += 1
+            await downloads.put(paper)
+        for _ in range(self._concurrency):
+            await downloads.put(None)
+
+    async def _work(self, client, downloads, results):
+        while (paper := await downloads.get()) is not None:
+            path = await self.fetch(client, paper["pdf_url"])
+            if path is not None:
+                await results.put((paper["_id"], {"download_path": path}))
+
+    async def _write(self, results):
+        updates = []
+        while (update := await results.get()) is not None:
+            updates.append(update)
+            if len(updates) >= self._batch_size:
+                await self._flush(updates)
+                updates = []
+        if updates:
+            await self._flush(updates)
+
+    async def _flush(self, updates):
+        counts = await asyncio.to_thread(self._service.update_many, updates)
+        self.stats["updated"] += counts["modified"]
+        logger.info("Stored the download path of %d papers", len(updates))
+
+    def _limiter(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(
+                self._per_host, self._host_delay
+            )
+        return self._limiters[host]
+
+    async def fetch(self, client, url):
+        """
+        Download ``url`` into the store, retrying retryable failures.
+
+        Returns the stored path, or ``None`` when the download failed.
+        """
+        limiter = self._limiter(url)
+        partial_path = self._store.partial_path(url)
+        for attempt in range(self._retries + 1):
+            try:
+                async with limiter:
+                    digest = await self._download(
+                        client, url, partial_path, limiter
+                    )
+                break
+            except (DownloadError, httpx.HTTPError) as error:
+                retryable = getattr(error, "retryable", True)
+                if not retryable or attempt == self._retries:
+                    logger.warning("Failed to download %s: %s", url, error)
+                    self.stats["failed"] += 1
+                    return None
+                await asyncio.sleep(self._retry_delay * 2 ** attempt)
+
+        path, deduplicated = self._store.commit(partial_path, digest)
+        self.stats["deduplicated" if deduplicated else "downloaded"] += 1
+        return path
+
+    async def _download(self, client, url, partial_path, limiter):
+        offset = (
+            os.path.getsize(partial_path)
+            if os.path.exists(partial_path) else 0
+        )
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code in RETRY_STATUSES:
+                limiter.pause(retry_after(response) or 0)
+                raise DownloadError(
+                    f"HTTP {response.status_code}", retryable=True
+                )
+            if response.status_code == 416:
+                # The partial file does not match the origin file any more.
+                os.remove(partial_path)
+                raise DownloadError("stale partial download", retryable=True)
+            if response.status_code not in (200, 206):
+                raise DownloadError(f"HTTP {response.status_code}")
+
+            content_range = response.headers.get("content-range", "")
+            if (
+                response.status_code == 206
+                and content_range.startswith(f"bytes {offset}-")
+            ):
+                digest = hash_file(partial_path)
+                mode = "ab"
+                self.stats["resumed"] += 1
+            else:
+                digest = hashlib.sha256()
+                mode = "wb"
+            with open(partial_path, mode) as file:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    file.write(chunk)
+                    digest.update(chunk)
+                    self.stats["bytes"] += len(chunk)
+
+        with open(partial_path, "rb") as file:
+            if file.read(len(PDF_MAGIC)) != PDF_MAGIC:
+                os.remove(partial_path)
+                raise DownloadError("response is not a PDF")
+        return digest.hexdigest()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--storage", required=True,
+                        help="directory the PDFs are stored in")
+    parser.add_argument("--concurrency", type=int,
+                        default=DEFAULT_CONCURRENCY,
+                        help="downloads in flight across all hosts")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help="downloads in flight per host")
+    parser.add_argument(
+        "--host-delay", type=float, default=DEFAULT_HOST_DELAY,
+        help="minimum seconds between requests to the same host",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="download paths written per database batch")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    config = dotenv_values(os.path.join(expanduser("~"), "creds",
+                                        "mongodb.env"))
+    client = MongoClient(config["ATLAS_URI"])
+    try:
+        service = PaperService(
+            MongoPaperRepository(client[config["DB_NAME"]]["papers"])
+        )
+        fetcher = PdfFetcher(
+            service,
+            ContentStore(args.storage),
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            host_delay=args.host_delay,
+            batch_size=args.batch_size,
+            retries=args.retries,
+        )
+        totals = asyncio.run(fetcher.run(service.export_papers()))
+    finally:
+        client.close()
+
+    logging.info(
+        "PDF fetch finished: %d downloaded, %d deduplicated, %d failed",
+        totals.get("downloaded", 0), totals.get("deduplicated", 0),
+        totals.get("failed", 0),
+    )
+
+
+if __name__ == "__main__":
+    main()
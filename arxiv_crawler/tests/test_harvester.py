@@ -0,0 +1,146 @@
+"""Tests for the arXiv harvester against a local stub feed."""
+
+# Standard Library
+import datetime
+import urllib.parse
+
+# Third Party
+import mongomock
+import pytest
+
+# Library
+from arxiv_crawler.harvester import (
+    ArxivHarvester,
+    Checkpoint,
+    RateLimiter,
+    parse_feed,
+)
+from mongodb_api.repositories.mongo_paper_repository import (
+    MongoPaperRepository,
+)
+from mongodb_api.services.paper_service import PaperService
+
+DAY = datetime.date(2024, 1, 1)
+
+ENTRY = """
+  <entry>
+    <id>http://arxiv.org/abs/2401.{index:05d}v1</id>
+    <updated>2024-01-0{day}T10:00:00Z</updated>
+    <published>2024-01-0{day}T10:00:00Z</published>
+    <title>Paper
+      {index}</title>
+    <summary>Summary {index}</summary>
+    <arxiv:comment>10 pages</arxiv:comment>
+    <link href="http://arxiv.org/abs/2401.{index:05d}v1" rel="alternate"
+          type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{index:05d}v1"
+          rel="related" type="application/pdf"/>
+  </entry>"""
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"
+      xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  {entries}
+</feed>"""
+
+
+class StubFeed:
+    """Serve ``papers_per_day`` entries per day, paged like the arXiv API."""
+
+    def __init__(self, papers_per_day, fail_after=None):
+        self.papers_per_day = papers_per_day
+        self.fail_after = fail_after
+        self.urls = []
+
+    def __call__(self, url):
+        if self.fail_after is not None and len(self.urls) >= self.fail_after:
+            raise ConnectionError("feed unavailable")
+        self.urls.append(url)
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        start = int(params["start"][0])
+        page_size = int(params["max_results"][0])
+        day = int(params["search_query"][0].split("[")[1][6:8])
+        total = self.papers_per_day.get(day, 0)
+        entries = "".join(
+            ENTRY.format(index=day * 100 + i, day=day)
+            for i in range(start, min(start + page_size, total))
+        )
+        return FEED.format(total=total, entries=entries).encode("utf-8")
+
+
+@pytest.fixture
+def service():
+    collection = mongomock.MongoClient().db.papers
+    return PaperService(MongoPaperRepository(collection))
+
+
+def make_harvester(service, checkpoint_path, feed):
+    return ArxivHarvester(
+        service,
+        Checkpoint(str(checkpoint_path)),
+        fetch=feed,
+        page_size=2,
+        rate_limiter=RateLimiter(0),
+    )
+
+
+def test_parse_feed_maps_paper_fields():
+    body = FEED.format(total=1, entries=ENTRY.format(index=7, day=1))
+
+    total, entries = parse_feed(body)
+
+    assert total == 1
+    assert entries[0]["_id"] == "http://arxiv.org/abs/2401.00007v1"
+    assert entries[0]["title"] == "Paper 7"
+    assert entries[0]["pdf_url"] == "http://arxiv.org/pdf/2401.00007v1"
+    assert entries[0]["comment"] == "10 pages"
+
+
+def test_harvest_pages_through_each_day(service, tmp_path):
+    feed = StubFeed({1: 3, 2: 1})
+    harvester = make_harvester(service, tmp_path / "checkpoint.json", feed)
+
+    totals = harvester.harvest(["cs.CR"], DAY, DAY + datetime.timedelta(2))
+
+    assert totals == {"created": 4, "duplicate": 0, "invalid": 0}
+    assert len(feed.urls) == 3
+    assert service.find_paper("http://arxiv.org/abs/2401.00200v1")
+
+
+def test_harvest_resumes_from_checkpoint(service, tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.json"
+    until = DAY + datetime.timedelta(1)
+    failing_feed = StubFeed({1: 5}, fail_after=1)
+    with pytest.raises(ConnectionError):
+        make_harvester(service, checkpoint_path, failing_feed).harvest(
+            ["cs.CR"], DAY, until
+        )
+
+    feed = StubFeed({1: 5})
+    totals = make_harvester(service, checkpoint_path, feed).harvest(
+        ["cs.CR"], DAY, until
+    )
+
+    assert totals["created"] == 3
+    assert "start=2" in feed.urls[0]
+
+    # A later run over the same window fetches nothing.
+    rerun_feed = StubFeed({1: 5})
+    make_harvester(service, checkpoint_path, rerun_feed).harvest(
+        ["cs.CR"], DAY, until
+    )
+    assert rerun_feed.urls == []
+
+
+def test_rate_limiter_spaces_requests():
+    now = [0.0]
+    sleeps = []
+    limiter = RateLimiter(3.0, clock=lambda: now[0], sleep=sleeps.append)
+
+    limiter.wait()
+    now[0] = 1.0
+    limiter.wait()
+
+    assert sleeps == [2.0]
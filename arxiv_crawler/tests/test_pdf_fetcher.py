@@ -0,0 +1,156 @@
+"""Tests for the PDF fetcher against a local HTTP server."""
+
+# Standard Library
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third Party
+import pytest
+
+# Library
+from arxiv_crawler.pdf_fetcher import ContentStore, PdfFetcher
+from mongodb_api.repositories.memory_paper_repository import (
+    InMemoryPaperRepository,
+)
+from mongodb_api.services.paper_service import PaperService
+
+
+class PdfServer(ThreadingHTTPServer):
+    """Serve ``files`` by path, honouring ``Range`` requests."""
+
+    daemon_threads = True
+
+    def __init__(self, files, delay=0.0):
+        super().__init__(("127.0.0.1", 0), PdfHandler)
+        self.files = files
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+
+class PdfHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Range")))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight,
+                                       server.in_flight)
+        try:
+            time.sleep(server.delay)
+            self._respond(server.files.get(self.path))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _respond(self, body):
+        if body is None:
+            self.send_error(404)
+            return
+        start = 0
+        requested = self.headers.get("Range")
+        if requested:
+            start = int(requested.removeprefix("bytes=").rstrip("-"))
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(files, delay=0.0):
+        server = PdfServer(files, delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_paper(index, pdf_url):
+    return {
+        "_id": f"http://arxiv.org/abs/2401.{index:05d}v1",
+        "title": f"Paper {index}",
+        "summary": "Summary",
+        "published": "2024-01-01T00:00:00Z",
+        "updated": "2024-01-01T00:00:00Z",
+        "pdf_url": pdf_url,
+        "download_path": None,
+    }
+
+
+def fetch(service, store, **options):
+    fetcher = PdfFetcher(service, store, host_delay=0, retry_delay=0,
+                         **options)
+    return asyncio.run(fetcher.run(service.export_papers()))
+
+
+def test_downloads_dedupe_resume_and_update_paths(serve, tmp_path):
+    body = b"%PDF-1.5 " + b"x" * 200_000
+    server = serve({
+        "/a": body, "/b": body, "/c": b"%PDF-1.5 other", "/d": b"<html>",
+    })
+    papers = [
+        make_paper(i, server.url(f"/{name}"))
+        for i, name in enumerate("abcde")
+    ]
+    papers[4]["download_path"] = "/already/there.pdf"
+    repository = InMemoryPaperRepository(papers)
+    service = PaperService(repository)
+    store = ContentStore(str(tmp_path))
+    with open(store.partial_path(server.url("/a")), "wb") as partial:
+        partial.write(body[:1000])
+
+    stats = fetch(service, store, batch_size=2)
+
+    paths = [repository.get_by_id(p["_id"])["download_path"] for p in papers]
+    assert paths[0] == paths[1] == store.path_for(
+        os.path.basename(paths[0]).removesuffix(".pdf")
+    )
+    with open(paths[0], "rb") as stored:
+        assert stored.read() == body
+    assert paths[2] != paths[0]
+    assert paths[3] is None
+    assert paths[4] == "/already/there.pdf"
+    assert ("/a", "bytes=1000-") in server.requests
+    assert stats["downloaded"] + stats["deduplicated"] == 3
+    assert stats["deduplicated"] == 1
+    assert stats["resumed"] == 1
+    assert stats["updated"] == 3
+    assert stats["failed"] == 1
+    assert os.listdir(os.path.join(store.root, "partial")) == []
+
+
+def test_concurrency_is_bounded_per_host(serve, tmp_path):
+    files = {f"/{i}": b"%PDF-1.5 " + bytes([i]) for i in range(12)}
+    server = serve(files, delay=0.05)
+    papers = [make_paper(i, server.url(f"/{i}")) for i in range(12)]
+    service = PaperService(InMemoryPaperRepository(papers))
+
+    stats = fetch(service, ContentStore(str(tmp_path)), concurrency=8,
+                  per_host=3, queue_size=2)
+
+    assert stats["downloaded"] == 12
+    assert 1 < server.max_in_flight <= 3
@@ -0,0 +1,346 @@
+"""
+End-to-end benchmark of the paper API.
+
+Drives the FastAPI app in-process, through the whole middleware, routing,
+validation and serialization stack, against a local backend (the
+in-memory repository or MongoPaperRepository on mongomock), and writes
+throughput, latency percentiles and memory allocated per request as
+JSON, e.g.::
+
+    python -m mongodb_api.benchmark --corpus 1000 --corpus 10000 \\
+        --concurrency 1 --concurrency 16 --output bench.json \\
+        --compare baseline.json
+
+With ``--compare`` the run exits with status 1 when a scenario is slower
+than the baseline by more than ``--tolerance``.
+"""
+
+# Standard Library
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from urllib.parse import quote
+
+# Third Party
+import httpx
+
+# Library
+from mongodb_api.main import create_app
+from mongodb_api.pool_monitor import percentile
+from mongodb_api.repositories.memory_paper_repository import (
+    AsyncInMemoryPaperRepository,
+    InMemoryPaperRepository,
+)
+from mongodb_api.repositories.mongo_paper_repository import (
+    MongoPaperRepository,
+)
+from mongodb_api.services.paper_service import PaperService
+
+SCENARIOS = ("get", "list", "update", "create", "bulk")
+BACKENDS = ("memory", "mongomock")
+DEFAULT_CORPUS = 1000
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REQUESTS = 500
+DEFAULT_BULK_SIZE = 100
+DEFAULT_ALLOC_SAMPLES = 50
+DEFAULT_TOLERANCE = 0.2
+EPOCH = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_paper(index):
+    """A valid ``Paper`` document, as the API stores it."""
+    published = (EPOCH + datetime.timedelta(hours=index)).isoformat()
+    return {
+        "_id": f"http://arxiv.org/abs/2001.{index:05d}v1",
+        "title": f"Benchmark paper {index}",
+        "summary": f"Summary of benchmark paper {index} about graphs.",
+        "published": published.replace("+00:00", "Z"),
+        "updated": published.replace("+00:00", "Z"),
+        "pdf_url": f"http://arxiv.org/pdf/2001.{index:05d}v1",
+        "download_path": None,
+        "doi": None,
+        "comment": "",
+    }
+
+
+def make_app(backend, corpus):
+    """Build the app on a fresh backend holding ``corpus`` papers."""
+    papers = [make_paper(index) for index in range(corpus)]
+    api_app = create_app()
+    api_app.mongodb_client = None
+    if backend == "memory":
+        repository = InMemoryPaperRepository(papers)
+        api_app.paper_service = PaperService(
+            repository,
+            async_repository=AsyncInMemoryPaperRepository(repository),
+        )
+    else:
+        # Third Party
+        import mongomock
+
+        # No ensure_indexes: mongomock ignores the partial filter of the
+        # DOI index and would reject every paper without a DOI but one.
+        collection = mongomock.MongoClient().db.papers
+        repository = MongoPaperRepository(collection)
+        repository.create_many(papers)
+        api_app.paper_service = PaperService(repository)
+    return api_app
+
+
+class Workload:
+    """Yield the requests of a scenario as ``(method, url, json)``."""
+
+    def __init__(self, corpus, bulk_size=DEFAULT_BULK_SIZE, seed=0):
+        self._corpus = corpus
+        self._bulk_size = bulk_size
+        self._random = random.Random(seed)
+        self._next_index = corpus
+
+    def _paper_url(self):
+        index = self._random.randrange(self._corpus)
+        return "/paper/" + quote(make_paper(index)["_id"], safe="")
+
+    def _new_papers(self, count):
+        start = self._next_index
+        self._next_index += count
+        return [make_paper(index) for index in range(start, start + count)]
+
+    def request(self, scenario, number):
+        if scenario == "get":
+            return "GET", self._paper_url(), None
+        if scenario == "list":
+            published_from = make_paper(
+                self._random.randrange(self._corpus)
+            )["published"]
+            return (
+                "GET",
+                "/paper/?limit=50&sort=published&published_from="
+                + quote(published_from),
+                None,
+            )
+        if scenario == "update":
+            url = self._paper_url()
+            paper = make_paper(0)
+            del paper["_id"]
+            paper["title"] = f"Updated benchmark paper {number}"
+            return "PUT", url, paper
+        if scenario == "create":
+            return "POST", "/paper/", self._new_papers(1)[0]
+        if scenario == "bulk":
+            return "POST", "/paper/bulk", self._new_papers(self._bulk_size)
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def send(client, method, url, payload):
+    response = await client.request(method, url, json=payload)
+    return response.status_code < 400
+
+
+async def measure_latency(client, workload, scenario, requests, concurrency):
+    """Send ``requests`` requests from ``concurrency`` concurrent workers."""
+    pending = iter(range(requests))
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for number in pending:
+            method, url, payload = workload.request(scenario, number)
+            start = time.perf_counter()
+            ok = await send(client, method, url, payload)
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def measure_allocations(client, workload, scenario, samples):
+    """Peak memory allocated while serving each request, and memory still
+    allocated after it, measured one request at a time with tracemalloc.
+
+    This is a separate pass because tracing slows every allocation down.
+    """
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for number in range(samples):
+            method, url, payload = workload.request(scenario, -number)
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await send(client, method, url, payload)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib_per_request": round(sum(peaks) / len(peaks) / 1024, 2),
+        "retained_kib_per_request": round(
+            sum(retained) / len(retained) / 1024, 2
+        ),
+    }
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        },
+    }
+
+
+async def run_case(backend, corpus, concurrency, scenarios, requests,
+                   bulk_size=DEFAULT_BULK_SIZE,
+                   alloc_samples=DEFAULT_ALLOC_SAMPLES):
+    """Benchmark each scenario at one corpus size and concurrency level."""
+    api_app = make_app(backend, corpus)
+    workload = Workload(corpus, bulk_size=bulk_size)
+    transport = httpx.ASGITransport(app=api_app)
+    results = []
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        for scenario in scenarios:
+            # Warm up lazily built routes, validators and caches.
+            await measure_latency(client, workload, scenario, 10, 1)
+            result = {
+                "scenario": scenario,
+                "backend": backend,
+                "corpus": corpus,
+                "concurrency": concurrency,
+                **summarize(
+                    *await measure_latency(
+                        client, workload, scenario, requests, concurrency
+                    )
+                ),
+            }
+            if alloc_samples:
+                result["alloc"] = await measure_allocations(
+                    client, workload, scenario, alloc_samples
+                )
+            results.append(result)
+    return results
+
+
+def case_key(result):
+    return (result["scenario"], result["backend"], result["corpus"],
+            result["concurrency"])
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return a description of each result that regressed against the
+    matching baseline result by more than ``tolerance``."""
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None:
+            continue
+        name = "{} backend={} corpus={} concurrency={}".format(
+            *case_key(result)
+        )
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['rps']} req/s, was {before['rps']}"
+            )
+        p95, before_p95 = (result["latency_ms"]["p95"],
+                           before["latency_ms"]["p95"])
+        if p95 > before_p95 * (1 + tolerance):
+            regressions.append(f"{name}: p95 {p95} ms, was {before_p95}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=BACKENDS, default="memory")
+    parser.add_argument(
+        "--corpus", type=int, action="append",
+        help=f"papers stored before the run (repeatable, default "
+             f"{DEFAULT_CORPUS})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, action="append",
+        help=f"concurrent clients (repeatable, default "
+             f"{DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--scenario", dest="scenarios", action="append", choices=SCENARIOS,
+        help="scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS,
+                        help="requests per scenario")
+    parser.add_argument("--bulk-size", type=int, default=DEFAULT_BULK_SIZE,
+                        help="papers per bulk create request")
+    parser.add_argument(
+        "--alloc-samples", type=int, default=DEFAULT_ALLOC_SAMPLES,
+        help="requests traced for allocations per scenario (0 disables)",
+    )
+    parser.add_argument("--output", help="JSON results file (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown against the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for corpus in args.corpus or [DEFAULT_CORPUS]:
+        for concurrency in args.concurrency or [DEFAULT_CONCURRENCY]:
+            results.extend(
+                asyncio.run(
+                    run_case(
+                        args.backend, corpus, concurrency,
+                        args.scenarios or SCENARIOS, args.requests,
+                        bulk_size=args.bulk_size,
+                        alloc_samples=args.alloc_samples,
+                    )
+                )
+            )
+    report = {
+        "meta": {
+            "created": datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "argv": sys.argv[1:] if argv is None else list(argv),
+        },
+        "results": results,
+    }
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
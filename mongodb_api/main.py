@@ -3,13 +3,19 @@
 This module sets up the FastAPI application with MongoDB integration.
 
 It includes configuration for logging, database connections, and API routes.
+Importing it performs no I/O: logging and the MongoDB settings are loaded
+when the app starts, inside ``lifespan``. ``create_app`` builds a fresh
+app, e.g. ``uvicorn --factory mongodb_api.main:create_app``.
 
 """
 
 # Standard Library
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 from contextlib import asynccontextmanager
 from os.path import expanduser
 
@@ -20,15 +26,91 @@ from fastapi import FastAPI
 from pymongo import MongoClient
 
 # Local imports
-from .repositories.mongo_paper_repository import MongoPaperRepository
+from .repositories.async_mongo_paper_repository import (
+    AsyncMongoPaperRepository,
+)
+from .repositories.caching_paper_repository import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    AsyncCachingPaperRepository,
+    CachingPaperRepository,
+    PaperCache,
+)
+from .repositories.memory_paper_repository import (
+    AsyncInMemoryPaperRepository,
+    InMemoryPaperRepository,
+)
+from .repositories.mongo_paper_repository import (
+    MongoPaperRepository,
+    ensure_indexes,
+)
+from .repositories.paper_repository import ReadOnlyRepositoryError
+from .pool_monitor import PoolMonitor
+from .routes import health_router, read_only_handler
 from .routes import router as paper_router  # Adjusted to absolute import
 from .services.paper_service import PaperService
+from .services.search_index import SearchIndex
 
-os.chdir(os.path.dirname(__file__))
+LOGGING_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "logging.conf")
+# (.env is not on git nor project folder, so copilot will not be able to
+# find it)
+MONGO_CONFIG_PATH = os.path.join(expanduser("~"), "creds", "mongodb.env")
+
+# Connection settings passed to the MongoDB clients when they are set, as
+# ``setting: (client option, type)``. Unset ones keep the value of the URI
+# or the driver default.
+MONGO_CLIENT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": ("maxPoolSize", int),
+    "MONGO_MIN_POOL_SIZE": ("minPoolSize", int),
+    "MONGO_MAX_CONNECTING": ("maxConnecting", int),
+    "MONGO_MAX_IDLE_TIME_MS": ("maxIdleTimeMS", int),
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": ("waitQueueTimeoutMS", int),
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": ("serverSelectionTimeoutMS", int),
+    "MONGO_CONNECT_TIMEOUT_MS": ("connectTimeoutMS", int),
+    "MONGO_SOCKET_TIMEOUT_MS": ("socketTimeoutMS", int),
+    "MONGO_COMPRESSORS": ("compressors", str.strip),
+}
+DEFAULT_READY_TIMEOUT_MS = 2000
+
+_logging_configured = False
+
+
+def enable_queue_logging(*logger_names):
+    """
+    Move the handlers of the given loggers behind a queue.
+
+    Request threads and the event loop only enqueue records; a
+    ``QueueListener`` thread per logger formats them and writes them to the
+    handlers configured in ``logging.conf``. The listeners are stopped, and
+    the queues drained, at interpreter exit.
+    """
+    for name in logger_names:
+        target = logging.getLogger(name)
+        if not target.handlers:
+            continue
+        record_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            record_queue, *target.handlers, respect_handler_level=True
+        )
+        target.handlers = [logging.handlers.QueueHandler(record_queue)]
+        listener.start()
+        atexit.register(listener.stop)
 
 
-# setup loggers
-logging.config.fileConfig("logging.conf", disable_existing_loggers=False)
+def configure_logging(config_path=LOGGING_CONFIG_PATH):
+    """Load ``logging.conf`` and queue its handlers, once per process."""
+    global _logging_configured
+    if _logging_configured:
+        return
+    logging.config.fileConfig(config_path, disable_existing_loggers=False)
+    enable_queue_logging(None, "uicheckapp")
+    _logging_configured = True
+
+
+def load_mongo_config(config_path=MONGO_CONFIG_PATH):
+    """Read the MongoDB settings (``ATLAS_URI``, ``DB_NAME``, ...)."""
+    return dotenv_values(config_path)
+
 
 # get root logger
 # the __name__ resolve to "main" since we are at the root of the project.
@@ -36,11 +118,81 @@ logger = logging.getLogger(__name__)
 # This will get the root logger since no logger in the configuration has
 # this name.
 
-home = expanduser("~")
-# Load environment variables
-# (.env is not on git nor project folder, so copilot will not be able to
-# find it)
-mongo_config = dotenv_values(os.path.join(home, "creds", "mongodb.env"))
+
+def config_flag(config, key, default=False):
+    """Read a boolean setting such as ``USE_ASYNC_DRIVER=true``."""
+    value = config.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def config_number(config, key, default, cast=int):
+    """Read a numeric setting, falling back to ``default`` when unset."""
+    value = config.get(key)
+    if value is None or not value.strip():
+        return default
+    return cast(value)
+
+
+def mongo_client_options(config):
+    """Keyword arguments for ``MongoClient`` from the ``MONGO_*`` settings."""
+    options = {}
+    for key, (option, cast) in MONGO_CLIENT_OPTIONS.items():
+        value = config_number(config, key, None, cast)
+        if value is not None:
+            options[option] = value
+    return options
+
+
+def connect_mongo(api_app, mongo_config, text_index=True):
+    """
+    Open the MongoDB client(s) and the paper repositories on top of them.
+
+    Attaches the clients, the database and the sync repository to the app,
+    ensures the collection indexes and returns the async repository, which
+    is ``None`` unless ``USE_ASYNC_DRIVER`` is enabled.
+    """
+    client_options = mongo_client_options(mongo_config)
+    api_app.mongodb_client = MongoClient(
+        mongo_config["ATLAS_URI"],
+        event_listeners=[api_app.pool_monitor],
+        **client_options,
+    )
+    api_app.database = api_app.mongodb_client[mongo_config["DB_NAME"]]
+    explain_queries = config_flag(mongo_config, "QUERY_DEBUG")
+    api_app.paper_repository = MongoPaperRepository(
+        api_app.database["papers"], explain_queries=explain_queries
+    )
+    ensure_indexes(api_app.database["papers"], text_index=text_index)
+    if not config_flag(mongo_config, "USE_ASYNC_DRIVER"):
+        return None
+
+    # Third Party
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    api_app.async_mongodb_client = AsyncIOMotorClient(
+        mongo_config["ATLAS_URI"],
+        event_listeners=[api_app.pool_monitor],
+        **client_options,
+    )
+    async_database = api_app.async_mongodb_client[mongo_config["DB_NAME"]]
+    logger.info("Serving async routes with the Motor driver")
+    return AsyncMongoPaperRepository(
+        async_database["papers"], explain_queries=explain_queries
+    )
+
+
+def open_memory_repository(mongo_config):
+    """Build the in-memory repository, loaded from ``PAPER_SNAPSHOT`` (an
+    NDJSON export, optionally gzipped) when it is set."""
+    read_only = config_flag(mongo_config, "PAPER_READ_ONLY")
+    snapshot = mongo_config.get("PAPER_SNAPSHOT")
+    if snapshot:
+        return InMemoryPaperRepository.from_snapshot(
+            snapshot, read_only=read_only
+        )
+    return InMemoryPaperRepository(read_only=read_only)
 
 
 @asynccontextmanager
@@ -49,9 +201,33 @@ async def lifespan(api_app: FastAPI):
     Asynchronous context manager for managing the lifecycle of the MongoDB
     connection. Intended for use with FastAPI's startup and shutdown events.
 
-    Initializes and attaches the MongoDB client and database to the FastAPI
-    app instance. Pings the MongoDB server to ensure a successful connection.
-    Closes the MongoDB connection upon exiting the context.
+    Configures logging, then initializes and attaches the MongoDB client and
+    database to the FastAPI app instance. The settings are the app's
+    ``mongo_config`` if it was given one, otherwise they are read from
+    ``~/creds/mongodb.env``. Pings the MongoDB server to ensure a successful
+    connection. Closes the MongoDB connection upon exiting the context.
+
+    When ``USE_ASYNC_DRIVER`` is enabled in the configuration, a Motor client
+    is opened as well and the service serves the async route handlers from
+    an ``AsyncMongoPaperRepository``; otherwise those handlers run the sync
+    repository in worker threads. ``PAPER_CACHE`` wraps the repositories in
+    a read-through cache of single-paper lookups, sized by
+    ``PAPER_CACHE_SIZE`` and expired after ``PAPER_CACHE_TTL`` seconds.
+    ``STRICT_RESPONSE_VALIDATION`` validates read responses against the
+    ``Paper`` model instead of encoding stored documents directly.
+    ``SEARCH_BACKEND`` selects the full-text search implementation: the
+    MongoDB text index (``text``, the default) or an in-process BM25 index
+    built at startup (``memory``). The collection indexes are ensured on
+    every startup; with ``QUERY_DEBUG`` the repositories log the plan of
+    each listing query and warn about collection scans. The ``MONGO_*``
+    settings of ``MONGO_CLIENT_OPTIONS`` size and time out the connection
+    pools of both clients, which report to one ``PoolMonitor``;
+    ``HEALTH_CHECK_TIMEOUT_MS`` bounds the ping of ``/health/ready``.
+
+    With ``PAPER_REPOSITORY=memory`` no MongoDB client is opened: papers are
+    served from an ``InMemoryPaperRepository``, loaded from the NDJSON
+    export in ``PAPER_SNAPSHOT`` when it is set and rejecting writes with
+    ``PAPER_READ_ONLY``.
 
     Parameters:
     app (FastAPI): The FastAPI app instance to attach the MongoDB client and
@@ -64,28 +240,100 @@ async def lifespan(api_app: FastAPI):
     pymongo.errors.ConnectionFailure: If connection to the MongoDB database
     fails.
     """
+    configure_logging()
+    mongo_config = api_app.mongo_config
+    if mongo_config is None:
+        mongo_config = load_mongo_config()
+    api_app.strict_responses = config_flag(
+        mongo_config, "STRICT_RESPONSE_VALIDATION"
+    )
+    api_app.mongodb_client = None
+    api_app.async_mongodb_client = None
+    api_app.pool_monitor = PoolMonitor()
+    api_app.ready_timeout = config_number(
+        mongo_config, "HEALTH_CHECK_TIMEOUT_MS", DEFAULT_READY_TIMEOUT_MS
+    ) / 1000
     try:
-        api_app.mongodb_client = MongoClient(mongo_config["ATLAS_URI"])
-        api_app.database = api_app.mongodb_client[mongo_config["DB_NAME"]]
-        api_app.paper_repository = MongoPaperRepository(
-            api_app.database["papers"]
-        )
-        api_app.paper_service = PaperService(api_app.paper_repository)
-        api_app.mongodb_client.admin.command("ping")
-        logger.info(
-            "Successfully connected to MongoDB! See API documentation at"
-            " http://localhost:8000/docs#/papers"
+        search_index = None
+        if mongo_config.get("PAPER_REPOSITORY", "mongo") == "memory":
+            api_app.paper_repository = open_memory_repository(mongo_config)
+            async_repository = AsyncInMemoryPaperRepository(
+                api_app.paper_repository
+            )
+            logger.info(
+                "Serving %d papers from memory", len(api_app.paper_repository)
+            )
+        else:
+            if mongo_config.get("SEARCH_BACKEND", "text") == "memory":
+                search_index = SearchIndex()
+            async_repository = connect_mongo(
+                api_app, mongo_config, text_index=search_index is None
+            )
+        api_app.paper_cache = None
+        if config_flag(mongo_config, "PAPER_CACHE"):
+            # One cache for both repositories, so a write through either
+            # invalidates what the other one serves.
+            api_app.paper_cache = PaperCache(
+                max_size=config_number(
+                    mongo_config, "PAPER_CACHE_SIZE", DEFAULT_CACHE_SIZE
+                ),
+                ttl=config_number(
+                    mongo_config, "PAPER_CACHE_TTL", DEFAULT_CACHE_TTL, float
+                ),
+            )
+            api_app.paper_repository = CachingPaperRepository(
+                api_app.paper_repository, api_app.paper_cache
+            )
+            if async_repository is not None:
+                async_repository = AsyncCachingPaperRepository(
+                    async_repository, api_app.paper_cache
+                )
+            logger.info("Caching single-paper reads")
+        api_app.paper_service = PaperService(
+            api_app.paper_repository,
+            async_repository=async_repository,
+            search_index=search_index,
+            collapse_versions=config_flag(mongo_config, "COLLAPSE_VERSIONS"),
         )
+        if search_index is not None:
+            api_app.paper_service.build_search_index()
+            logger.info("Indexed %d papers for search", len(search_index))
+        if api_app.mongodb_client is not None:
+            api_app.mongodb_client.admin.command("ping")
+            logger.info(
+                "Successfully connected to MongoDB! See API documentation at"
+                " http://localhost:8000/docs#/papers"
+            )
     except pymongo.errors.ConnectionFailure as e:
-        logger.error(f"Failed to connect to MongoDB database: {e}")
+        logger.error("Failed to connect to MongoDB database: %s", e)
         raise
     else:
         yield
     finally:
-        logger.info("Closing MongoDB connection!")
-        api_app.mongodb_client.close()
+        if api_app.mongodb_client is not None:
+            logger.info("Closing MongoDB connection!")
+            api_app.mongodb_client.close()
+        if api_app.async_mongodb_client is not None:
+            api_app.async_mongodb_client.close()
 
 
-app = FastAPI(lifespan=lifespan)
+def create_app(mongo_config=None):
+    """
+    Build the FastAPI app without touching the network or the filesystem.
+
+    Parameters:
+    mongo_config (Optional[dict]): MongoDB settings to use instead of
+    ``~/creds/mongodb.env``.
+
+    Returns:
+    FastAPI: The app with the paper routes registered.
+    """
+    api_app = FastAPI(lifespan=lifespan)
+    api_app.mongo_config = mongo_config
+    api_app.include_router(paper_router, tags=["papers"], prefix="/paper")
+    api_app.include_router(health_router, tags=["health"], prefix="/health")
+    api_app.add_exception_handler(ReadOnlyRepositoryError, read_only_handler)
+    return api_app
+
 
-app.include_router(paper_router, tags=["papers"], prefix="/paper")
+app = create_app()
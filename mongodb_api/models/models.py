@@ -7,16 +7,22 @@ The models defined in this module are:
     including title, summary, URLs, and metadata.
 - PaperUpdate: Model for updating the details of a research paper.
     Each field is optional.
+- BulkCreateResult: Per-item outcome of a bulk paper creation.
+- PaperFilter, BulkUpdateRequest, BulkUpdateResult, BulkDeleteResult:
+    Selection, body and outcomes of bulk updates and deletes.
+- PaperSearchResult: A paper matched by full-text search, with its score.
+- PaperFields: A paper restricted to a requested subset of its fields.
 """
 
 # Standard Library
 import datetime
+import functools
 import logging
 import os
-from typing import Optional
+from typing import List, Literal, Optional
 
 # Third Party
-from pydantic import AnyUrl, BaseModel, Field
+from pydantic import AnyUrl, BaseModel, Field, model_validator
 
 # the __name__ resolve to "uicheckapp.services"
 logger = logging.getLogger(__name__)
@@ -29,6 +35,26 @@ from mongodb_api.utils import custom_serialize, load_paper_json
 current_path = os.path.dirname(os.path.abspath(__file__))
 
 
+@functools.lru_cache(maxsize=None)
+def load_example(file_name):
+    """Load an example payload shipped next to this module, once."""
+    return load_paper_json(os.path.join(current_path, file_name))
+
+
+def example_schema(file_name):
+    """
+    ``json_schema_extra`` hook adding an example payload to the schema.
+
+    The example file is only read when the JSON schema is generated (e.g.
+    for ``/docs``), not when the model class is defined.
+    """
+
+    def add_example(schema, model_class):
+        schema["example"] = load_example(file_name)
+
+    return add_example
+
+
 class Paper(BaseModel):
     """
     Represents a research paper with details including title, summary, URLs,
@@ -47,6 +73,11 @@ class Paper(BaseModel):
       downloaded.
     - doi (Optional[str]): Digital Object Identifier for the paper.
     - comment (Optional[str]): Additional comments or notes about the paper.
+    - arxiv_id (Optional[str]): Canonical arXiv id without version, derived
+      from ``entry_id`` when the paper is stored.
+    - version (Optional[int]): arXiv version number, derived likewise.
+    - change_seq (Optional[int]): Change sequence number, stamped by the
+      server on every write; the change feed is ordered by it.
 
     The model supports automatic population by field names and allows
     arbitrary types.
@@ -75,21 +106,67 @@ class Paper(BaseModel):
         description="Digital Object Identifier",
     )
     comment: Optional[str] = Field(None, description="Additional comments")
+    arxiv_id: Optional[str] = Field(
+        None, description="arXiv id without version, derived from entry_id"
+    )
+    version: Optional[int] = Field(
+        None, description="arXiv version, derived from entry_id"
+    )
+    change_seq: Optional[int] = Field(
+        None, description="Change sequence number, set by the server"
+    )
 
     model_config = {
         "populate_by_name": True,
         "arbitrary_types_allowed": True,
-        "json_schema_extra": {
-            "example": load_paper_json(
-                os.path.join(current_path, "example_entry.json")
-            )
-        },
+        "json_schema_extra": example_schema("example_entry.json"),
     }
 
     def model_dump_serialized(self, json_dump: bool = False):
         return custom_serialize(self, json_dump=json_dump)
 
 
+class PaperSearchResult(Paper):
+    """
+    A paper matched by a full-text search.
+
+    Attributes:
+    - score (float): Relevance of the paper to the query; higher is better.
+    """
+
+    score: float = Field(..., description="Relevance score of the match")
+
+
+class PaperFields(BaseModel):
+    """
+    A paper restricted to the fields requested with ``?fields=``.
+
+    Every field of ``Paper`` is optional; only the requested ones (and
+    ``_id``) are present in the response.
+    """
+
+    entry_id: Optional[AnyUrl] = Field(None, alias="_id")
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    published: Optional[datetime.datetime] = None
+    updated: Optional[datetime.datetime] = None
+    pdf_url: Optional[AnyUrl] = None
+    download_path: Optional[str] = None
+    doi: Optional[str] = None
+    comment: Optional[str] = None
+    arxiv_id: Optional[str] = None
+    version: Optional[int] = None
+    change_seq: Optional[int] = None
+
+    model_config = {"populate_by_name": True}
+
+
+# Stored names of the Paper fields, e.g. for ``?fields=`` validation.
+PAPER_FIELDS = tuple(
+    field.alias or name for name, field in Paper.model_fields.items()
+)
+
+
 class PaperUpdate(BaseModel):
     """
     Model for updating the details of a research paper. Each field is optional.
@@ -121,15 +198,171 @@ class PaperUpdate(BaseModel):
     comment: Optional[str] = None
 
     model_config = {
-        "json_schema_extra": {
-            "example": load_paper_json(
-                os.path.join(current_path, "example_update.json")
-            )
-        }
+        "json_schema_extra": example_schema("example_update.json"),
     }
 
     def model_dump_serialized(self, json_dump: bool = False, ignore_none: bool = False):
         return custom_serialize(self, json_dump=json_dump, ignore_none=ignore_none)
 
 
+class BulkCreateItem(BaseModel):
+    """
+    Outcome of a single item in a bulk paper creation.
+
+    Attributes:
+    - index (int): Position of the item in the request body.
+    - id (Optional[str]): Paper id of the item, if it could be read.
+    - status (str): One of "created", "duplicate" or "invalid".
+    - detail (Optional[str]): Validation or backend error message.
+    """
+
+    index: int
+    id: Optional[str] = None
+    status: Literal["created", "duplicate", "invalid"]
+    detail: Optional[str] = None
+
+
+class BulkCreateResult(BaseModel):
+    """
+    Summary of a bulk paper creation.
+
+    Attributes:
+    - created (int): Number of papers inserted.
+    - duplicate (int): Number of items whose id already existed.
+    - invalid (int): Number of items rejected by validation or the backend.
+    - items (List[BulkCreateItem]): Per-item outcomes in request order.
+    """
+
+    created: int = 0
+    duplicate: int = 0
+    invalid: int = 0
+    items: List[BulkCreateItem] = []
+
+
+class PaperFilter(BaseModel):
+    """
+    Selection of papers for a bulk update or delete. Criteria are combined,
+    and at least one is required.
+
+    Attributes:
+    - ids (Optional[List[str]]): Paper ids.
+    - published_from, published_to (Optional[datetime.datetime]): Publication
+      date range, lower bound inclusive and upper bound exclusive.
+    - updated_from, updated_to (Optional[datetime.datetime]): Last update date
+      range, lower bound inclusive and upper bound exclusive.
+    - doi (Optional[str]): Exact DOI.
+    """
+
+    ids: Optional[List[str]] = None
+    published_from: Optional[datetime.datetime] = None
+    published_to: Optional[datetime.datetime] = None
+    updated_from: Optional[datetime.datetime] = None
+    updated_to: Optional[datetime.datetime] = None
+    doi: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_fields_set:
+            raise ValueError("At least one filter criterion is required")
+        return self
+
+
+class BulkUpdateItem(BaseModel):
+    """
+    Partial update of one paper in a bulk update.
+
+    Attributes:
+    - id (str): Paper id.
+    - update (PaperUpdate): Fields to set; only the given ones are written.
+    """
+
+    id: str
+    update: PaperUpdate
+
+
+class BulkUpdateRequest(BaseModel):
+    """
+    Body of a bulk update: either one partial update per paper in
+    ``updates``, or the same ``set`` for every paper matching ``filter``.
+    """
+
+    updates: Optional[List[BulkUpdateItem]] = None
+    filter: Optional[PaperFilter] = None
+    set: Optional[PaperUpdate] = None
+
+    @model_validator(mode="after")
+    def check_mode(self):
+        by_id = self.updates is not None
+        by_filter = self.filter is not None or self.set is not None
+        if by_id == by_filter:
+            raise ValueError('Give either "updates" or "filter" and "set"')
+        if by_filter and (self.filter is None or self.set is None):
+            raise ValueError('"filter" and "set" go together')
+        return self
+
+
+class BulkUpdateResult(BaseModel):
+    """
+    Summary of a bulk update.
+
+    Attributes:
+    - matched (int): Number of papers selected by the update that it
+      would change.
+    - modified (int): Number of papers actually changed.
+    - failed (int): Number of per-paper updates rejected by the backend,
+      e.g. for a DOI another paper already has.
+    """
+
+    matched: int = 0
+    modified: int = 0
+    failed: int = 0
+
+
+class BulkDeleteResult(BaseModel):
+    """
+    Summary of a bulk delete.
+
+    Attributes:
+    - deleted (int): Number of papers deleted.
+    """
+
+    deleted: int = 0
+
+
+class PaperChange(BaseModel):
+    """
+    One entry of the change feed.
+
+    Attributes:
+    - entry_id (str): Id of the changed paper.
+    - change_seq (int): Change sequence number of the write.
+    - deleted (bool): Whether the paper was deleted.
+    - paper (Optional[Paper]): The paper as stored after the write, unless
+      it was deleted.
+    """
+
+    entry_id: str = Field(..., alias="_id")
+    change_seq: int
+    deleted: bool = False
+    paper: Optional[Paper] = None
+
+    model_config = {"populate_by_name": True}
+
+
+class ChangeFeedPage(BaseModel):
+    """
+    A page of the change feed.
+
+    Attributes:
+    - changes (List[PaperChange]): Changes in ``(change_seq, _id)`` order.
+    - token (Optional[str]): Resume token to pass as ``since`` to get the
+      changes after this page; ``None`` while the feed is empty.
+    - more (bool): Whether more changes are ready past this page.
+    """
+
+    changes: List[PaperChange]
+    token: Optional[str] = None
+    more: bool = False
+
+
 # %%
@@ -0,0 +1,136 @@
+"""Connection pool telemetry for the MongoDB clients."""
+
+# Standard Library
+import logging
+import threading
+import time
+from collections import Counter, deque
+
+# Third Party
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Number of recent checkout waits the percentiles are computed over.
+DEFAULT_WAIT_WINDOW = 1024
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(0, round(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Track connection checkouts of every pool of the clients it is
+    registered with (``MongoClient(..., event_listeners=[monitor])``).
+
+    Reports how many connections are checked out, how long requests wait
+    for one and how many checkouts fail, so tail latency caused by pool
+    starvation can be told apart from slow queries. Checkout events are
+    published on the thread that requests the connection, which is how the
+    wait of each checkout is measured.
+    """
+
+    def __init__(self, wait_window=DEFAULT_WAIT_WINDOW,
+                 clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._waits = deque(maxlen=wait_window)
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.failed_checkouts = Counter()
+        self.connections = 0
+        self.pool_clears = 0
+        self.max_wait = 0.0
+
+    def _pending(self):
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = self._local.pending = []
+        return pending
+
+    def _wait(self):
+        pending = self._pending()
+        if not pending:
+            return None
+        return self._clock() - pending.pop()
+
+    def connection_check_out_started(self, event):
+        self._pending().append(self._clock())
+
+    def connection_checked_out(self, event):
+        wait = self._wait()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            if wait is not None:
+                self._waits.append(wait)
+                self.max_wait = max(self.max_wait, wait)
+
+    def connection_check_out_failed(self, event):
+        wait = self._wait()
+        with self._lock:
+            self.failed_checkouts[event.reason] += 1
+        logger.warning(
+            "Connection checkout from %s failed (%s) after %.1f ms",
+            event.address, event.reason, (wait or 0.0) * 1000,
+        )
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections = max(0, self.connections - 1)
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+        logger.warning("Connection pool for %s was cleared", event.address)
+
+    # The remaining pool events carry nothing the stats report.
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def stats(self):
+        """Snapshot of the counters; wait times are in milliseconds and the
+        percentiles cover the most recent checkouts."""
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "connections": self.connections,
+                "checkouts": self.checkouts,
+                "failed_checkouts": sum(self.failed_checkouts.values()),
+                "failed_checkouts_by_reason": dict(self.failed_checkouts),
+                "pool_clears": self.pool_clears,
+                "wait_ms": {"max": round(self.max_wait * 1000, 3)},
+            }
+        if waits:
+            stats["wait_ms"].update({
+                "mean": round(sum(waits) / len(waits) * 1000, 3),
+                "p50": round(percentile(waits, 0.50) * 1000, 3),
+                "p95": round(percentile(waits, 0.95) * 1000, 3),
+                "p99": round(percentile(waits, 0.99) * 1000, 3),
+            })
+        return stats
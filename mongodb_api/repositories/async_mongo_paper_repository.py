@@ -0,0 +1,168 @@
+"""Asynchronous MongoDB-backed paper repository implementation."""
+
+# Third Party
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# Library
+from .mongo_paper_repository import (
+    TEXT_SCORE,
+    TOMBSTONES_COLLECTION,
+    VERSIONS_SORT,
+    bulk_update_counts,
+    changed_query,
+    changes_predicate,
+    filter_query,
+    insert_statuses,
+    list_query,
+    projection,
+    report_plan,
+    sort_spec,
+    tombstone_operations,
+    tombstones_query,
+    update_operations,
+)
+from .paper_repository import (
+    CHANGE_SEQ_FIELD,
+    AsyncPaperRepository,
+    DuplicatePaperError,
+)
+
+
+class AsyncMongoPaperRepository(AsyncPaperRepository):
+    """Concrete async repository using a Motor collection."""
+
+    def __init__(self, papers_collection, explain_queries=False):
+        self._papers_collection = papers_collection
+        self._tombstones_collection = papers_collection.database[
+            TOMBSTONES_COLLECTION
+        ]
+        self._explain_queries = explain_queries
+
+    async def create(self, paper_data):
+        try:
+            await self._papers_collection.insert_one(paper_data)
+        except DuplicateKeyError as error:
+            raise DuplicatePaperError(paper_data["_id"]) from error
+        return paper_data
+
+    async def create_many(self, papers_data):
+        if not papers_data:
+            return []
+
+        try:
+            await self._papers_collection.insert_many(
+                papers_data, ordered=False
+            )
+        except BulkWriteError as error:
+            return insert_statuses(
+                len(papers_data), error.details.get("writeErrors", [])
+            )
+        return insert_statuses(len(papers_data))
+
+    async def get_by_id(self, paper_id, fields=None):
+        return await self._papers_collection.find_one(
+            {"_id": paper_id}, projection(fields)
+        )
+
+    async def update_many(self, updates):
+        operations = update_operations(updates)
+        if not operations:
+            return bulk_update_counts()
+
+        try:
+            result = await self._papers_collection.bulk_write(
+                operations, ordered=False
+            )
+        except BulkWriteError as error:
+            return bulk_update_counts(details=error.details)
+        return bulk_update_counts(result)
+
+    async def update_matching(self, filters, update_data):
+        try:
+            result = await self._papers_collection.update_many(
+                {"$and": [filter_query(filters),
+                          changes_predicate(update_data)]},
+                {"$set": update_data},
+            )
+        except DuplicateKeyError as error:
+            raise DuplicatePaperError(update_data.get("doi")) from error
+        return {"matched": result.matched_count,
+                "modified": result.modified_count}
+
+    async def delete_matching(self, filters):
+        delete_result = await self._papers_collection.delete_many(
+            filter_query(filters)
+        )
+        return delete_result.deleted_count
+
+    async def add_tombstones(self, paper_ids, change_seq):
+        if paper_ids:
+            await self._tombstones_collection.bulk_write(
+                tombstone_operations(paper_ids, change_seq), ordered=False
+            )
+
+    async def list_tombstones(self, limit=100, after=None, before=None):
+        cursor = self._tombstones_collection.find(
+            tombstones_query(after, before),
+            sort=sort_spec(CHANGE_SEQ_FIELD, False),
+            limit=limit,
+        )
+        return await cursor.to_list(length=limit)
+
+    async def list(self, limit=100, sort_by="_id", descending=False,
+                   after=None, filters=None, fields=None):
+        query = list_query(sort_by, descending, after, filters)
+        cursor = self._papers_collection.find(
+            query,
+            projection(fields),
+            sort=sort_spec(sort_by, descending),
+            limit=limit,
+        )
+        if self._explain_queries:
+            report_plan(query, await cursor.explain())
+        return await cursor.to_list(length=limit)
+
+    async def list_versions(self, arxiv_id, limit=None, fields=None):
+        cursor = self._papers_collection.find(
+            {"arxiv_id": arxiv_id},
+            projection(fields),
+            sort=VERSIONS_SORT,
+            limit=limit or 0,
+        )
+        return await cursor.to_list(length=limit)
+
+    async def search(self, query, limit=20, offset=0):
+        cursor = self._papers_collection.find(
+            {"$text": {"$search": query}},
+            {"score": TEXT_SCORE},
+            sort=[("score", TEXT_SCORE)],
+            skip=offset,
+            limit=limit,
+        )
+        return await cursor.to_list(length=limit)
+
+    async def iter_papers(self, batch_size=1000):
+        cursor = self._papers_collection.find(
+            {}, sort=[("_id", ASCENDING)], batch_size=batch_size
+        )
+        try:
+            async for paper in cursor:
+                yield paper
+        finally:
+            await cursor.close()
+
+    async def update(self, paper_id, update_data, expected=None):
+        if not update_data:
+            return None
+        return await self._papers_collection.find_one_and_update(
+            changed_query(paper_id, update_data, expected),
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def delete(self, paper_id):
+        delete_result = await self._papers_collection.delete_one(
+            {"_id": paper_id}
+        )
+        return delete_result.deleted_count
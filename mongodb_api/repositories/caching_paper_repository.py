@@ -0,0 +1,299 @@
+"""Read-through caching decorators for paper repositories."""
+
+# Standard Library
+import threading
+import time
+from collections import OrderedDict
+
+# Library
+from .paper_repository import AsyncPaperRepository, PaperRepository
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_TTL = 300.0
+
+_MISSING = object()
+
+
+class PaperCache:
+    """Bounded LRU cache of papers by id with a per-entry time to live.
+
+    Misses are cached as well (as ``None``), so repeated lookups of an
+    unknown id do not reach the database until the entry expires or the id
+    is written.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL,
+                 clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so a read that raced a write does
+        # not put the pre-write document back into the cache.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, paper_id):
+        """Return the cached paper (or ``None`` for a cached miss), or
+        ``_MISSING`` when the id has to be read from the repository."""
+        with self._lock:
+            entry = self._entries.get(paper_id)
+            if entry is not None:
+                expires_at, paper = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(paper_id)
+                    self.hits += 1
+                    return paper
+                del self._entries[paper_id]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, paper_id, paper, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[paper_id] = (self._clock() + self._ttl, paper)
+            self._entries.move_to_end(paper_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, paper_id):
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(paper_id, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _copy(paper, fields=None):
+    # Hand out copies so callers cannot mutate the cached document.
+    if paper is None:
+        return None
+    if fields is None:
+        return dict(paper)
+    return {
+        key: value
+        for key, value in paper.items()
+        if key == "_id" or key in fields
+    }
+
+
+def _invalidate_matching(cache, filters):
+    # Only a filter on ids says which papers a bulk write touched.
+    criteria = {name for name, value in filters.items() if value is not None}
+    if criteria == {"ids"}:
+        for paper_id in filters["ids"]:
+            cache.invalidate(paper_id)
+    else:
+        cache.clear()
+
+
+class CachingPaperRepository(PaperRepository):
+    """Cache ``get_by_id`` results of another repository.
+
+    Only whole papers are cached. A projected read is answered from a
+    cached paper when there is one and is otherwise passed through without
+    being cached. Writes go straight to the wrapped repository and
+    invalidate the ids they touch; bulk writes selected by anything else
+    than ids clear the whole cache.
+    """
+
+    def __init__(self, repository, cache=None):
+        self._repository = repository
+        self.cache = cache if cache is not None else PaperCache()
+
+    def create(self, paper_data):
+        try:
+            return self._repository.create(paper_data)
+        finally:
+            self.cache.invalidate(paper_data["_id"])
+
+    def create_many(self, papers_data):
+        try:
+            return self._repository.create_many(papers_data)
+        finally:
+            for paper_data in papers_data:
+                self.cache.invalidate(paper_data["_id"])
+
+    def get_by_id(self, paper_id, fields=None):
+        paper = self.cache.get(paper_id)
+        if paper is _MISSING:
+            if fields is not None:
+                return self._repository.get_by_id(paper_id, fields=fields)
+            generation = self.cache.generation
+            paper = self._repository.get_by_id(paper_id)
+            self.cache.put(paper_id, paper, generation)
+        return _copy(paper, fields)
+
+    def update_many(self, updates):
+        try:
+            return self._repository.update_many(updates)
+        finally:
+            for paper_id, _ in updates:
+                self.cache.invalidate(paper_id)
+
+    def update_matching(self, filters, update_data):
+        try:
+            return self._repository.update_matching(filters, update_data)
+        finally:
+            _invalidate_matching(self.cache, filters)
+
+    def delete_matching(self, filters):
+        try:
+            return self._repository.delete_matching(filters)
+        finally:
+            _invalidate_matching(self.cache, filters)
+
+    def list(self, limit=100, sort_by="_id", descending=False, after=None,
+             filters=None, fields=None):
+        return self._repository.list(
+            limit=limit, sort_by=sort_by, descending=descending, after=after,
+            filters=filters, fields=fields,
+        )
+
+    def add_tombstones(self, paper_ids, change_seq):
+        self._repository.add_tombstones(paper_ids, change_seq)
+
+    def list_tombstones(self, limit=100, after=None, before=None):
+        return self._repository.list_tombstones(
+            limit=limit, after=after, before=before
+        )
+
+    def list_versions(self, arxiv_id, limit=None, fields=None):
+        return self._repository.list_versions(
+            arxiv_id, limit=limit, fields=fields
+        )
+
+    def search(self, query, limit=20, offset=0):
+        return self._repository.search(query, limit=limit, offset=offset)
+
+    def iter_papers(self, batch_size=1000):
+        return self._repository.iter_papers(batch_size=batch_size)
+
+    def update(self, paper_id, update_data, expected=None):
+        try:
+            return self._repository.update(
+                paper_id, update_data, expected=expected
+            )
+        finally:
+            self.cache.invalidate(paper_id)
+
+    def delete(self, paper_id):
+        try:
+            return self._repository.delete(paper_id)
+        finally:
+            self.cache.invalidate(paper_id)
+
+
+class AsyncCachingPaperRepository(AsyncPaperRepository):
+    """Async counterpart of ``CachingPaperRepository``."""
+
+    def __init__(self, repository, cache=None):
+        self._repository = repository
+        self.cache = cache if cache is not None else PaperCache()
+
+    async def create(self, paper_data):
+        try:
+            return await self._repository.create(paper_data)
+        finally:
+            self.cache.invalidate(paper_data["_id"])
+
+    async def create_many(self, papers_data):
+        try:
+            return await self._repository.create_many(papers_data)
+        finally:
+            for paper_data in papers_data:
+                self.cache.invalidate(paper_data["_id"])
+
+    async def get_by_id(self, paper_id, fields=None):
+        paper = self.cache.get(paper_id)
+        if paper is _MISSING:
+            if fields is not None:
+                return await self._repository.get_by_id(
+                    paper_id, fields=fields
+                )
+            generation = self.cache.generation
+            paper = await self._repository.get_by_id(paper_id)
+            self.cache.put(paper_id, paper, generation)
+        return _copy(paper, fields)
+
+    async def update_many(self, updates):
+        try:
+            return await self._repository.update_many(updates)
+        finally:
+            for paper_id, _ in updates:
+                self.cache.invalidate(paper_id)
+
+    async def update_matching(self, filters, update_data):
+        try:
+            return await self._repository.update_matching(
+                filters, update_data
+            )
+        finally:
+            _invalidate_matching(self.cache, filters)
+
+    async def delete_matching(self, filters):
+        try:
+            return await self._repository.delete_matching(filters)
+        finally:
+            _invalidate_matching(self.cache, filters)
+
+    async def list(self, limit=100, sort_by="_id", descending=False,
+                   after=None, filters=None, fields=None):
+        return await self._repository.list(
+            limit=limit, sort_by=sort_by, descending=descending, after=after,
+            filters=filters, fields=fields,
+        )
+
+    async def add_tombstones(self, paper_ids, change_seq):
+        await self._repository.add_tombstones(paper_ids, change_seq)
+
+    async def list_tombstones(self, limit=100, after=None, before=None):
+        return await self._repository.list_tombstones(
+            limit=limit, after=after, before=before
+        )
+
+    async def list_versions(self, arxiv_id, limit=None, fields=None):
+        return await self._repository.list_versions(
+            arxiv_id, limit=limit, fields=fields
+        )
+
+    async def search(self, query, limit=20, offset=0):
+        return await self._repository.search(
+            query, limit=limit, offset=offset
+        )
+
+    def iter_papers(self, batch_size=1000):
+        return self._repository.iter_papers(batch_size=batch_size)
+
+    async def update(self, paper_id, update_data, expected=None):
+        try:
+            return await self._repository.update(
+                paper_id, update_data, expected=expected
+            )
+        finally:
+            self.cache.invalidate(paper_id)
+
+    async def delete(self, paper_id):
+        try:
+            return await self._repository.delete(paper_id)
+        finally:
+            self.cache.invalidate(paper_id)
@@ -0,0 +1,495 @@
+"""In-memory paper repository with sorted secondary indexes."""
+
+# Standard Library
+import gzip
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+# Library
+from mongodb_api.models.models import PAPER_FIELDS
+from mongodb_api.services.search_index import SearchIndex
+from .mongo_paper_repository import RANGE_FILTERS
+from .paper_repository import (
+    CHANGE_SEQ_FIELD,
+    AsyncPaperRepository,
+    DuplicatePaperError,
+    PaperRepository,
+    ReadOnlyRepositoryError,
+)
+
+SORTED_FIELDS = ("_id", "published", "updated", CHANGE_SEQ_FIELD)
+
+# Missing values sort before every other value, as in MongoDB.
+_NO_VALUE = (0,)
+# Sorts after every missing value and before every present one.
+_FIRST_VALUE = ((1,),)
+
+
+def sort_key(value):
+    return _NO_VALUE if value is None else (1, value)
+
+
+def read_ndjson(path):
+    """Yield the papers of an NDJSON snapshot, e.g. a saved
+    ``GET /paper/export``; ``.gz`` files are decompressed."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as snapshot:
+        for line in snapshot:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _project(paper, fields=None):
+    # Hand out copies so callers cannot mutate the stored document.
+    if fields is None:
+        return dict(paper)
+    return {
+        key: value
+        for key, value in paper.items()
+        if key == "_id" or key in fields
+    }
+
+
+class InMemoryPaperRepository(PaperRepository):
+    """Keep papers in a dict by id, with sorted ``(value, _id)`` indexes.
+
+    Each field of ``SORTED_FIELDS`` has a sorted list of
+    ``(sort_key(value), _id)`` entries, so a listing finds its range
+    filter bounds and its keyset position with a binary search and then
+    reads the page in order, like an index scan. DOIs have a hash index
+    that enforces their uniqueness, as the MongoDB ``doi_unique`` index
+    does, and the versions of each ``arxiv_id`` are grouped in another one.
+    Tombstones of deleted papers are kept sorted by ``(change_seq, _id)``.
+    Full-text search uses an in-process ``SearchIndex``.
+
+    All operations hold one lock, so the repository can be shared between
+    threads. With ``read_only`` every write raises
+    ``ReadOnlyRepositoryError``; ``load`` still replaces the contents, e.g.
+    of an edge replica loaded from a snapshot.
+    """
+
+    def __init__(self, papers=(), read_only=False):
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._papers = {}
+        self._dois = {}
+        self._versions = {}
+        self._tombstones = {}
+        self._tombstone_index = []
+        self._indexes = {field: [] for field in SORTED_FIELDS}
+        self._search_index = SearchIndex()
+        self.load(papers)
+
+    @classmethod
+    def from_snapshot(cls, path, read_only=True):
+        """Build a repository from an NDJSON snapshot file."""
+        return cls(read_ndjson(path), read_only=read_only)
+
+    def __len__(self):
+        return len(self._papers)
+
+    def load(self, papers):
+        """Replace the contents with ``papers``, sorting each index once
+        instead of inserting into it paper by paper."""
+        papers = {paper["_id"]: dict(paper) for paper in papers}
+        dois = {}
+        versions = {}
+        for paper_id, paper in papers.items():
+            doi = paper.get("doi")
+            if isinstance(doi, str):
+                if doi in dois:
+                    raise DuplicatePaperError(paper_id)
+                dois[doi] = paper_id
+            if paper.get("arxiv_id") is not None:
+                versions.setdefault(paper["arxiv_id"], set()).add(paper_id)
+        indexes = {
+            field: sorted(
+                (sort_key(paper.get(field)), paper_id)
+                for paper_id, paper in papers.items()
+            )
+            for field in SORTED_FIELDS
+        }
+        with self._lock:
+            self._papers = papers
+            self._dois = dois
+            self._versions = versions
+            self._tombstones = {}
+            self._tombstone_index = []
+            self._indexes = indexes
+            self._search_index.rebuild(papers.values())
+
+    def create(self, paper_data):
+        with self._lock:
+            self._check_writable()
+            self._check_unique(paper_data["_id"], paper_data)
+            self._insert(dict(paper_data))
+        return paper_data
+
+    def create_many(self, papers_data):
+        statuses = []
+        with self._lock:
+            self._check_writable()
+            for paper_data in papers_data:
+                try:
+                    self._check_unique(paper_data["_id"], paper_data)
+                except DuplicatePaperError:
+                    statuses.append("duplicate")
+                    continue
+                self._insert(dict(paper_data))
+                statuses.append("created")
+        return statuses
+
+    def get_by_id(self, paper_id, fields=None):
+        with self._lock:
+            paper = self._papers.get(paper_id)
+            return None if paper is None else _project(paper, fields)
+
+    def list(self, limit=100, sort_by="_id", descending=False, after=None,
+             filters=None, fields=None):
+        with self._lock:
+            ids, ranges = self._parse_filters(filters)
+            if ids is not None:
+                entries = sorted(
+                    (sort_key(self._papers[paper_id].get(sort_by)), paper_id)
+                    for paper_id in ids
+                    if paper_id in self._papers
+                )
+            else:
+                entries = self._indexes[sort_by]
+            start, stop = self._bounds(
+                entries, sort_by, descending, after, ranges.pop(sort_by, None)
+            )
+            positions = range(start, stop)
+            if descending:
+                positions = reversed(positions)
+
+            papers = []
+            for position in positions:
+                if len(papers) >= limit:
+                    break
+                paper = self._papers[entries[position][1]]
+                if all(
+                    self._in_range(paper.get(field), bounds)
+                    for field, bounds in ranges.items()
+                ):
+                    papers.append(_project(paper, fields))
+            return papers
+
+    def list_versions(self, arxiv_id, limit=None, fields=None):
+        with self._lock:
+            papers = sorted(
+                (self._papers[paper_id]
+                 for paper_id in self._versions.get(arxiv_id, ())),
+                key=lambda paper: sort_key(paper.get("version")),
+                reverse=True,
+            )
+            return [_project(paper, fields) for paper in papers[:limit]]
+
+    def search(self, query, limit=20, offset=0):
+        papers = []
+        with self._lock:
+            for paper_id, score in self._search_index.search(
+                query, limit=limit, offset=offset
+            ):
+                paper = self._papers.get(paper_id)
+                if paper is not None:
+                    papers.append({**paper, "score": score})
+        return papers
+
+    def iter_papers(self, batch_size=1000):
+        # Seek past the last id of the previous batch, so papers written
+        # meanwhile are not skipped or repeated because of shifted offsets.
+        last = None
+        while True:
+            with self._lock:
+                entries = self._indexes["_id"]
+                start = 0 if last is None else bisect_right(entries, last)
+                batch = [
+                    dict(self._papers[paper_id])
+                    for _, paper_id in entries[start:start + batch_size]
+                ]
+                if batch:
+                    last = entries[start + len(batch) - 1]
+            if not batch:
+                return
+            yield from batch
+
+    def update_many(self, updates):
+        counts = {"matched": 0, "modified": 0, "failed": 0}
+        with self._lock:
+            self._check_writable()
+            for paper_id, update_data in updates:
+                if not update_data or paper_id not in self._papers:
+                    continue
+                try:
+                    if self._apply(paper_id, update_data) is None:
+                        continue
+                except DuplicatePaperError:
+                    counts["failed"] += 1
+                    continue
+                counts["matched"] += 1
+                counts["modified"] += 1
+        return counts
+
+    def update_matching(self, filters, update_data):
+        counts = {"matched": 0, "modified": 0}
+        with self._lock:
+            self._check_writable()
+            for paper_id in self._matching_ids(filters):
+                if self._apply(paper_id, update_data) is not None:
+                    counts["matched"] += 1
+                    counts["modified"] += 1
+        return counts
+
+    def delete_matching(self, filters):
+        with self._lock:
+            self._check_writable()
+            paper_ids = self._matching_ids(filters)
+            for paper_id in paper_ids:
+                self._remove(paper_id)
+        return len(paper_ids)
+
+    def add_tombstones(self, paper_ids, change_seq):
+        with self._lock:
+            self._check_writable()
+            for paper_id in paper_ids:
+                recorded = self._tombstones.get(paper_id)
+                if recorded is not None:
+                    if recorded >= change_seq:
+                        continue
+                    entries = self._tombstone_index
+                    del entries[bisect_left(entries, (recorded, paper_id))]
+                self._tombstones[paper_id] = change_seq
+                insort(self._tombstone_index, (change_seq, paper_id))
+
+    def list_tombstones(self, limit=100, after=None, before=None):
+        with self._lock:
+            entries = self._tombstone_index
+            start = 0 if after is None else bisect_right(entries, after)
+            stop = (
+                len(entries) if before is None
+                else bisect_left(entries, (before,))
+            )
+            return [
+                {"_id": paper_id, CHANGE_SEQ_FIELD: change_seq}
+                for change_seq, paper_id in entries[start:stop][:limit]
+            ]
+
+    def update(self, paper_id, update_data, expected=None):
+        if not update_data:
+            return None
+        with self._lock:
+            self._check_writable()
+            paper = self._papers.get(paper_id)
+            if paper is None:
+                return None
+            if expected is not None and not self._equals(paper, expected):
+                return None
+            updated = self._apply(paper_id, update_data)
+            return None if updated is None else dict(updated)
+
+    def delete(self, paper_id):
+        with self._lock:
+            self._check_writable()
+            if paper_id not in self._papers:
+                return 0
+            self._remove(paper_id)
+            return 1
+
+    def _apply(self, paper_id, update_data):
+        # Returns the stored paper after the update, or None if the update
+        # would not change it.
+        paper = self._papers[paper_id]
+        if all(paper.get(field) == value
+               for field, value in update_data.items()
+               if field != CHANGE_SEQ_FIELD):
+            return None
+        updated = {**paper, **update_data}
+        self._check_unique(paper_id, updated, creating=False)
+        self._remove(paper_id)
+        self._insert(updated)
+        return updated
+
+    def _matching_ids(self, filters):
+        # Scan the index of a filtered date field when there is one.
+        sort_by = next(
+            (field for name, (field, _) in RANGE_FILTERS.items()
+             if (filters or {}).get(name) is not None),
+            "_id",
+        )
+        return [
+            paper["_id"]
+            for paper in self.list(
+                limit=len(self._papers), sort_by=sort_by, filters=filters,
+                fields=[],
+            )
+        ]
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ReadOnlyRepositoryError
+
+    def _check_unique(self, paper_id, paper, creating=True):
+        if creating and paper_id in self._papers:
+            raise DuplicatePaperError(paper_id)
+        doi = paper.get("doi")
+        if isinstance(doi, str) and self._dois.get(doi, paper_id) != paper_id:
+            raise DuplicatePaperError(paper_id)
+
+    def _insert(self, paper):
+        paper_id = paper["_id"]
+        self._papers[paper_id] = paper
+        if isinstance(paper.get("doi"), str):
+            self._dois[paper["doi"]] = paper_id
+        if paper.get("arxiv_id") is not None:
+            self._versions.setdefault(paper["arxiv_id"], set()).add(paper_id)
+        for field, entries in self._indexes.items():
+            insort(entries, (sort_key(paper.get(field)), paper_id))
+        self._search_index.add(paper)
+
+    def _remove(self, paper_id):
+        paper = self._papers.pop(paper_id)
+        if isinstance(paper.get("doi"), str):
+            self._dois.pop(paper["doi"], None)
+        versions = self._versions.get(paper.get("arxiv_id"))
+        if versions is not None:
+            versions.discard(paper_id)
+            if not versions:
+                del self._versions[paper["arxiv_id"]]
+        for field, entries in self._indexes.items():
+            entry = (sort_key(paper.get(field)), paper_id)
+            del entries[bisect_left(entries, entry)]
+        self._search_index.remove(paper_id)
+
+    @staticmethod
+    def _equals(paper, expected):
+        # Same fields as the MongoDB compare-and-set of ``changed_query``.
+        for field in PAPER_FIELDS:
+            if field == "_id":
+                continue
+            if field in expected:
+                if paper.get(field) != expected[field]:
+                    return False
+            elif field in paper:
+                return False
+        return True
+
+    def _parse_filters(self, filters):
+        """Candidate ids of the ``ids`` and ``doi`` filters (``None`` when
+        there are neither) and the bounds of the range filters by field."""
+        ids = None
+        ranges = {}
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            if name == "doi":
+                paper_id = self._dois.get(value)
+                doi_ids = set() if paper_id is None else {paper_id}
+                ids = doi_ids if ids is None else ids & doi_ids
+            elif name == "ids":
+                ids = set(value) if ids is None else ids & set(value)
+            elif name in RANGE_FILTERS:
+                field, operator = RANGE_FILTERS[name]
+                ranges.setdefault(field, {})[operator] = value
+            else:
+                raise ValueError(f"Unsupported filter: {name}")
+        return ids, ranges
+
+    @staticmethod
+    def _in_range(value, bounds):
+        # Range filters never match missing values.
+        if value is None:
+            return False
+        return (
+            ("$gte" not in bounds or value >= bounds["$gte"])
+            and ("$lt" not in bounds or value < bounds["$lt"])
+        )
+
+    @staticmethod
+    def _bounds(entries, sort_by, descending, after, bounds):
+        """Positions ``[start, stop)`` of the entries within the range
+        filter on the sort field and past the ``after`` key."""
+        start, stop = 0, len(entries)
+        if bounds is not None:
+            start = bisect_left(
+                entries,
+                (sort_key(bounds["$gte"]),) if "$gte" in bounds
+                else _FIRST_VALUE,
+            )
+            if "$lt" in bounds:
+                stop = bisect_left(entries, (sort_key(bounds["$lt"]),))
+        if after is not None:
+            sort_value, paper_id = after
+            if sort_by == "_id":
+                sort_value = paper_id
+            key = (sort_key(sort_value), paper_id)
+            if descending:
+                stop = min(stop, bisect_left(entries, key))
+            else:
+                start = max(start, bisect_right(entries, key))
+        return start, max(start, stop)
+
+
+class AsyncInMemoryPaperRepository(AsyncPaperRepository):
+    """Serve ``InMemoryPaperRepository`` to the async route handlers.
+
+    Its operations never wait on I/O, so they run directly on the event
+    loop instead of taking a worker thread each.
+    """
+
+    def __init__(self, repository):
+        self._repository = repository
+
+    async def create(self, paper_data):
+        return self._repository.create(paper_data)
+
+    async def create_many(self, papers_data):
+        return self._repository.create_many(papers_data)
+
+    async def get_by_id(self, paper_id, fields=None):
+        return self._repository.get_by_id(paper_id, fields=fields)
+
+    async def update_many(self, updates):
+        return self._repository.update_many(updates)
+
+    async def update_matching(self, filters, update_data):
+        return self._repository.update_matching(filters, update_data)
+
+    async def delete_matching(self, filters):
+        return self._repository.delete_matching(filters)
+
+    async def add_tombstones(self, paper_ids, change_seq):
+        self._repository.add_tombstones(paper_ids, change_seq)
+
+    async def list_tombstones(self, limit=100, after=None, before=None):
+        return self._repository.list_tombstones(
+            limit=limit, after=after, before=before
+        )
+
+    async def list(self, limit=100, sort_by="_id", descending=False,
+                   after=None, filters=None, fields=None):
+        return self._repository.list(
+            limit=limit, sort_by=sort_by, descending=descending, after=after,
+            filters=filters, fields=fields,
+        )
+
+    async def list_versions(self, arxiv_id, limit=None, fields=None):
+        return self._repository.list_versions(
+            arxiv_id, limit=limit, fields=fields
+        )
+
+    async def search(self, query, limit=20, offset=0):
+        return self._repository.search(query, limit=limit, offset=offset)
+
+    async def iter_papers(self, batch_size=1000):
+        for paper in self._repository.iter_papers(batch_size=batch_size):
+            yield paper
+
+    async def update(self, paper_id, update_data, expected=None):
+        return self._repository.update(
+            paper_id, update_data, expected=expected
+        )
+
+    async def delete(self, paper_id):
+        return self._repository.delete(paper_id)
@@ -1,30 +1,404 @@
 """MongoDB-backed paper repository implementation."""
 
+# Standard Library
+import logging
+
+# Third Party
+from pymongo import (
+    ASCENDING,
+    DESCENDING,
+    TEXT,
+    IndexModel,
+    ReturnDocument,
+    UpdateOne,
+)
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
 # Library
-from .paper_repository import PaperRepository
+from mongodb_api.models.models import PAPER_FIELDS
+from .paper_repository import (
+    CHANGE_SEQ_FIELD,
+    DuplicatePaperError,
+    PaperRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR_CODE = 11000
+TEXT_SCORE = {"$meta": "textScore"}
+
+# Secondary indexes of the papers collection. The compound keys end with
+# _id so keyset pages sorted by (field, _id) in either direction, with or
+# without a range filter on the same field, are served from the index.
+PAPER_INDEXES = [
+    IndexModel([("published", ASCENDING), ("_id", ASCENDING)],
+               name="published_id"),
+    IndexModel([("updated", ASCENDING), ("_id", ASCENDING)],
+               name="updated_id"),
+    # Papers are stored with doi=None when they have none, which a sparse
+    # index would still index (and reject as duplicates), so uniqueness is
+    # only enforced on actual DOI strings.
+    IndexModel([("doi", ASCENDING)], name="doi_unique", unique=True,
+               partialFilterExpression={"doi": {"$type": "string"}}),
+    # Versions of a paper, latest first: the latest one is the first
+    # index entry of its arxiv_id.
+    IndexModel([("arxiv_id", ASCENDING), ("version", DESCENDING)],
+               name="arxiv_id_version"),
+    # Change feed: papers written past a (change_seq, _id) key.
+    IndexModel([(CHANGE_SEQ_FIELD, ASCENDING), ("_id", ASCENDING)],
+               name="change_seq_id"),
+]
+VERSIONS_SORT = [("version", DESCENDING)]
+# Deleted papers are recorded in a sibling collection of the papers one, so
+# the change feed can report them.
+TOMBSTONES_COLLECTION = "paper_tombstones"
+TOMBSTONE_INDEXES = [
+    IndexModel([(CHANGE_SEQ_FIELD, ASCENDING), ("_id", ASCENDING)],
+               name="change_seq_id"),
+]
+TEXT_INDEX = IndexModel(
+    [("title", TEXT), ("summary", TEXT)],
+    name="paper_text",
+    weights={"title": 3, "summary": 1},
+)
+
+RANGE_FILTERS = {
+    "published_from": ("published", "$gte"),
+    "published_to": ("published", "$lt"),
+    "updated_from": ("updated", "$gte"),
+    "updated_to": ("updated", "$lt"),
+    "changed_from": (CHANGE_SEQ_FIELD, "$gte"),
+    "changed_to": (CHANGE_SEQ_FIELD, "$lt"),
+}
+
+
+def ensure_indexes(papers_collection, text_index=True):
+    """Create the paper indexes that do not exist yet.
+
+    ``create_indexes`` is a no-op for indexes that already exist with the
+    same definition, so this is safe to call on every startup.
+    """
+    indexes = list(PAPER_INDEXES)
+    if text_index:
+        indexes.append(TEXT_INDEX)
+    papers_collection.database[TOMBSTONES_COLLECTION].create_indexes(
+        TOMBSTONE_INDEXES
+    )
+    return papers_collection.create_indexes(indexes)
+
+
+def filter_query(filters):
+    """Translate listing filters into a MongoDB query.
+
+    Supported filters are ``published_from``/``published_to`` and
+    ``updated_from``/``updated_to`` (ISO timestamps, lower bound inclusive,
+    upper bound exclusive), ``changed_from``/``changed_to`` (change
+    sequence numbers, likewise), an exact ``doi`` and a list of ``ids``.
+    """
+    query = {}
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        if name == "doi":
+            query["doi"] = value
+        elif name == "ids":
+            query["_id"] = {"$in": list(value)}
+        elif name in RANGE_FILTERS:
+            field, operator = RANGE_FILTERS[name]
+            query.setdefault(field, {})[operator] = value
+        else:
+            raise ValueError(f"Unsupported filter: {name}")
+    return query
+
+
+def projection(fields):
+    """MongoDB projection reading only ``fields``, or everything if None."""
+    if fields is None:
+        return None
+    return dict.fromkeys(fields, 1)
+
+
+def list_query(sort_by, descending, after, filters):
+    """Combine listing filters with the keyset seek predicate."""
+    query = filter_query(filters)
+    if after is None:
+        return query
+    seek = keyset_query(sort_by, descending, after)
+    return {"$and": [query, seek]} if query else seek
+
+
+def plan_stages(plan):
+    """Return the stage names of a query plan, outermost first."""
+    stages = [plan.get("stage")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages.extend(plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(plan_stages(child))
+    return [stage for stage in stages if stage]
+
+
+def report_plan(query, explanation):
+    """Log the winning plan of a query and warn about collection scans."""
+    stages = plan_stages(
+        explanation.get("queryPlanner", {}).get("winningPlan", {})
+    )
+    logger.debug("Query plan for %s: %s", query, " <- ".join(stages))
+    if "COLLSCAN" in stages:
+        logger.warning("Collection scan for query %s", query)
+    return stages
+
+
+def insert_statuses(papers_count, write_errors=()):
+    """Map ``insert_many`` write errors to one status per inserted item."""
+    statuses = ["created"] * papers_count
+    for write_error in write_errors:
+        statuses[write_error["index"]] = (
+            "duplicate"
+            if write_error["code"] == DUPLICATE_KEY_ERROR_CODE
+            else "invalid"
+        )
+    return statuses
+
+
+def update_operations(updates):
+    """One ``UpdateOne`` per ``(paper_id, update_data)`` pair, skipping
+    empty updates and matching only papers the update changes."""
+    return [
+        UpdateOne(changed_query(paper_id, update_data), {"$set": update_data})
+        for paper_id, update_data in updates
+        if update_data
+    ]
+
+
+def tombstone_operations(paper_ids, change_seq):
+    """Upsert one tombstone per id, never moving its ``change_seq`` back."""
+    return [
+        UpdateOne(
+            {"_id": paper_id},
+            {"$max": {CHANGE_SEQ_FIELD: change_seq}},
+            upsert=True,
+        )
+        for paper_id in paper_ids
+    ]
+
+
+def tombstones_query(after, before):
+    """Tombstones past the ``after`` key and below ``before``."""
+    query = {}
+    if before is not None:
+        query[CHANGE_SEQ_FIELD] = {"$lt": before}
+    if after is None:
+        return query
+    seek = keyset_query(CHANGE_SEQ_FIELD, False, after)
+    return {"$and": [query, seek]} if query else seek
+
+
+def changes_predicate(update_data):
+    """Match papers on which ``update_data`` would change a field; the
+    change sequence stamp alone does not count."""
+    return {
+        "$or": [
+            {field: {"$ne": value}}
+            for field, value in update_data.items()
+            if field != CHANGE_SEQ_FIELD
+        ]
+    }
+
+
+def bulk_update_counts(result=None, details=None):
+    """``matched``/``modified``/``failed`` counts of a ``bulk_write``, from
+    its result or, when it raised ``BulkWriteError``, its error details."""
+    if details is not None:
+        return {
+            "matched": details.get("nMatched", 0),
+            "modified": details.get("nModified", 0),
+            "failed": len(details.get("writeErrors", [])),
+        }
+    if result is None:
+        return {"matched": 0, "modified": 0, "failed": 0}
+    return {
+        "matched": result.matched_count,
+        "modified": result.modified_count,
+        "failed": 0,
+    }
+
+
+def changed_query(paper_id, update_data, expected=None):
+    """Match the paper only if ``update_data`` would change one of its fields.
+
+    This lets a single ``find_one_and_update`` tell an unchanged paper apart
+    from a modified one without reading it first. With ``expected``, the
+    paper must also still have exactly those field values, which turns the
+    update into a compare-and-set.
+    """
+    query = {}
+    if expected is not None:
+        for field in PAPER_FIELDS:
+            if field == "_id":
+                continue
+            if field in expected:
+                query[field] = expected[field]
+            else:
+                query[field] = {"$exists": False}
+    query["_id"] = paper_id
+    query.update(changes_predicate(update_data))
+    return query
+
+
+def sort_spec(sort_by, descending):
+    """Return the ``(sort_by, _id)`` sort specification for a listing."""
+    direction = DESCENDING if descending else ASCENDING
+    sort = [("_id", direction)]
+    if sort_by != "_id":
+        sort.insert(0, (sort_by, direction))
+    return sort
+
+
+def keyset_query(sort_by, descending, after):
+    """Build the seek predicate for papers past the ``after`` key."""
+    operator = "$lt" if descending else "$gt"
+    sort_value, paper_id = after
+    if sort_by == "_id":
+        return {"_id": {operator: paper_id}}
+    return {
+        "$or": [
+            {sort_by: {operator: sort_value}},
+            {sort_by: sort_value, "_id": {operator: paper_id}},
+        ]
+    }
 
 
 class MongoPaperRepository(PaperRepository):
     """Concrete repository using a Mongo collection."""
 
-    def __init__(self, papers_collection):
+    def __init__(self, papers_collection, explain_queries=False):
         self._papers_collection = papers_collection
+        self._tombstones_collection = papers_collection.database[
+            TOMBSTONES_COLLECTION
+        ]
+        self._explain_queries = explain_queries
 
     def create(self, paper_data):
-        result = self._papers_collection.insert_one(paper_data)
-        return self.get_by_id(result.inserted_id)
+        # The unique _id index rejects duplicates, so no pre-read is needed
+        # and concurrent creates of the same paper cannot both succeed.
+        try:
+            self._papers_collection.insert_one(paper_data)
+        except DuplicateKeyError as error:
+            raise DuplicatePaperError(paper_data["_id"]) from error
+        return paper_data
 
-    def get_by_id(self, paper_id):
-        return self._papers_collection.find_one({"_id": paper_id})
+    def create_many(self, papers_data):
+        if not papers_data:
+            return []
+
+        try:
+            self._papers_collection.insert_many(papers_data, ordered=False)
+        except BulkWriteError as error:
+            return insert_statuses(
+                len(papers_data), error.details.get("writeErrors", [])
+            )
+        return insert_statuses(len(papers_data))
+
+    def get_by_id(self, paper_id, fields=None):
+        return self._papers_collection.find_one(
+            {"_id": paper_id}, projection(fields)
+        )
 
-    def list(self, limit=100):
-        return list(self._papers_collection.find(limit=limit))
+    def update_many(self, updates):
+        operations = update_operations(updates)
+        if not operations:
+            return bulk_update_counts()
+
+        try:
+            result = self._papers_collection.bulk_write(
+                operations, ordered=False
+            )
+        except BulkWriteError as error:
+            return bulk_update_counts(details=error.details)
+        return bulk_update_counts(result)
+
+    def update_matching(self, filters, update_data):
+        try:
+            result = self._papers_collection.update_many(
+                {"$and": [filter_query(filters),
+                          changes_predicate(update_data)]},
+                {"$set": update_data},
+            )
+        except DuplicateKeyError as error:
+            raise DuplicatePaperError(update_data.get("doi")) from error
+        return {"matched": result.matched_count,
+                "modified": result.modified_count}
+
+    def delete_matching(self, filters):
+        return self._papers_collection.delete_many(
+            filter_query(filters)
+        ).deleted_count
+
+    def add_tombstones(self, paper_ids, change_seq):
+        if paper_ids:
+            self._tombstones_collection.bulk_write(
+                tombstone_operations(paper_ids, change_seq), ordered=False
+            )
+
+    def list_tombstones(self, limit=100, after=None, before=None):
+        return list(
+            self._tombstones_collection.find(
+                tombstones_query(after, before),
+                sort=sort_spec(CHANGE_SEQ_FIELD, False),
+                limit=limit,
+            )
+        )
+
+    def list(self, limit=100, sort_by="_id", descending=False, after=None,
+             filters=None, fields=None):
+        query = list_query(sort_by, descending, after, filters)
+        cursor = self._papers_collection.find(
+            query,
+            projection(fields),
+            sort=sort_spec(sort_by, descending),
+            limit=limit,
+        )
+        if self._explain_queries:
+            report_plan(query, cursor.explain())
+        return list(cursor)
+
+    def list_versions(self, arxiv_id, limit=None, fields=None):
+        return list(
+            self._papers_collection.find(
+                {"arxiv_id": arxiv_id},
+                projection(fields),
+                sort=VERSIONS_SORT,
+                limit=limit or 0,
+            )
+        )
+
+    def search(self, query, limit=20, offset=0):
+        return list(
+            self._papers_collection.find(
+                {"$text": {"$search": query}},
+                {"score": TEXT_SCORE},
+                sort=[("score", TEXT_SCORE)],
+                skip=offset,
+                limit=limit,
+            )
+        )
+
+    def iter_papers(self, batch_size=1000):
+        # The cursor is returned as-is so documents are pulled from the
+        # server one batch at a time while the caller consumes them.
+        return self._papers_collection.find(
+            {}, sort=[("_id", ASCENDING)], batch_size=batch_size
+        )
 
-    def update(self, paper_id, update_data):
-        update_result = self._papers_collection.update_one(
-            {"_id": paper_id}, {"$set": update_data}
+    def update(self, paper_id, update_data, expected=None):
+        if not update_data:
+            return None
+        return self._papers_collection.find_one_and_update(
+            changed_query(paper_id, update_data, expected),
+            {"$set": update_data},
+            return_document=ReturnDocument.AFTER,
         )
-        return update_result.modified_count
 
     def delete(self, paper_id):
         delete_result = self._papers_collection.delete_one({"_id": paper_id})
@@ -2,7 +2,21 @@
 
 # Standard Library
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
+
+# Field holding the change sequence number the service stamps on every
+# write. Updates carry it along, but it does not count as a change by
+# itself: a paper the rest of the update leaves as is is not written.
+CHANGE_SEQ_FIELD = "change_seq"
+
+
+class DuplicatePaperError(Exception):
+    """Raised by a repository when a paper with the same id already exists."""
+
+
+class ReadOnlyRepositoryError(Exception):
+    """Raised by a read-only repository, e.g. a replica loaded from a
+    snapshot, when it is asked to write."""
 
 
 class PaperRepository(ABC):
@@ -10,20 +24,245 @@ class PaperRepository(ABC):
 
     @abstractmethod
     def create(self, paper_data: dict[str, Any]) -> dict[str, Any]:
-        """Create and return a persisted paper."""
+        """Create and return a persisted paper.
+
+        Raises ``DuplicatePaperError`` if the id already exists.
+        """
 
     @abstractmethod
-    def get_by_id(self, paper_id: str) -> dict[str, Any] | None:
-        """Get one paper by id."""
+    def create_many(self, papers_data: list[dict[str, Any]]) -> list[str]:
+        """Create papers in one batch and return a status per input item.
+
+        Each status is ``"created"``, ``"duplicate"`` (the id already exists)
+        or ``"invalid"`` (rejected by the backend), in input order.
+        """
 
     @abstractmethod
-    def list(self, limit: int = 100) -> list[dict[str, Any]]:
-        """List papers."""
+    def get_by_id(
+        self, paper_id: str, fields: list[str] | None = None
+    ) -> dict[str, Any] | None:
+        """Get one paper by id.
+
+        When ``fields`` is given, only those fields (and ``_id``) are read.
+        """
+
+    @abstractmethod
+    def list_versions(
+        self,
+        arxiv_id: str,
+        limit: int | None = None,
+        fields: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get the stored versions of an arXiv paper, latest first.
+
+        ``arxiv_id`` is the canonical unversioned id. ``limit=1`` reads the
+        latest version only.
+        """
+
+    @abstractmethod
+    def search(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """Full-text search over title and summary.
+
+        Returns matching papers, best first, each with its relevance in a
+        ``score`` field.
+        """
+
+    @abstractmethod
+    def update_many(
+        self, updates: list[tuple[str, dict[str, Any]]]
+    ) -> dict[str, int]:
+        """Apply one partial update per ``(paper_id, update_data)`` pair in a
+        single batch.
+
+        Returns the number of papers ``matched`` (those the update would
+        change), ``modified`` and the number of updates that ``failed``
+        (e.g. on a duplicate DOI).
+        """
 
     @abstractmethod
-    def update(self, paper_id: str, update_data: dict[str, Any]) -> int:
-        """Update a paper and return modified count."""
+    def update_matching(
+        self, filters: dict[str, Any], update_data: dict[str, Any]
+    ) -> dict[str, int]:
+        """Set ``update_data`` on every paper matching ``filters``.
+
+        ``filters`` are the same as for ``list``. Returns the
+        ``matched`` and ``modified`` counts. Raises ``DuplicatePaperError``
+        if the update would give two papers the same DOI.
+        """
+
+    @abstractmethod
+    def delete_matching(self, filters: dict[str, Any]) -> int:
+        """Delete every paper matching ``filters`` and return deleted count.
+        """
+
+    @abstractmethod
+    def add_tombstones(self, paper_ids: list[str], change_seq: int) -> None:
+        """Record that ``paper_ids`` were deleted at ``change_seq``.
+
+        A tombstone only moves forward: an older ``change_seq`` than the
+        recorded one is ignored.
+        """
+
+    @abstractmethod
+    def list_tombstones(
+        self,
+        limit: int = 100,
+        after: tuple[int, str] | None = None,
+        before: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """List ``{"_id", "change_seq"}`` tombstones ordered by
+        ``(change_seq, _id)``, past the ``after`` key and below ``before``.
+        """
+
+    @abstractmethod
+    def list(
+        self,
+        limit: int = 100,
+        sort_by: str = "_id",
+        descending: bool = False,
+        after: tuple[Any, str] | None = None,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """List papers ordered by ``(sort_by, _id)``.
+
+        ``after`` is the ``(sort_value, _id)`` key of the last paper of the
+        previous page; only papers strictly past it are returned.
+        ``filters`` restricts the listing with ``published_from``,
+        ``published_to``, ``updated_from``, ``updated_to`` (ISO timestamps,
+        upper bounds exclusive), ``changed_from``/``changed_to`` (change
+        sequence numbers), an exact ``doi`` and a list of ``ids``.
+        When ``fields`` is given, only those fields (and ``_id``) are read.
+        """
+
+    @abstractmethod
+    def iter_papers(self, batch_size: int = 1000) -> Iterator[dict[str, Any]]:
+        """Lazily iterate over every paper, fetching ``batch_size`` at a time.
+        """
+
+    @abstractmethod
+    def update(
+        self,
+        paper_id: str,
+        update_data: dict[str, Any],
+        expected: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Update a paper and return it as stored after the update.
+
+        Returns ``None`` when the paper does not exist, when the update
+        would not change any of its fields or, if ``expected`` is given,
+        when the stored paper no longer equals ``expected``.
+        """
 
     @abstractmethod
     def delete(self, paper_id: str) -> int:
         """Delete a paper and return deleted count."""
+
+
+class AsyncPaperRepository(ABC):
+    """Asynchronous persistence contract for paper CRUD operations.
+
+    Mirrors ``PaperRepository`` for drivers with a native event-loop API
+    (e.g. Motor), so request handlers never block a worker thread on I/O.
+    """
+
+    @abstractmethod
+    async def create(self, paper_data: dict[str, Any]) -> dict[str, Any]:
+        """Create and return a persisted paper.
+
+        Raises ``DuplicatePaperError`` if the id already exists.
+        """
+
+    @abstractmethod
+    async def create_many(self, papers_data: list[dict[str, Any]]) -> list[str]:
+        """Create papers in one batch and return a status per input item."""
+
+    @abstractmethod
+    async def get_by_id(
+        self, paper_id: str, fields: list[str] | None = None
+    ) -> dict[str, Any] | None:
+        """Get one paper by id, reading only ``fields`` when given."""
+
+    @abstractmethod
+    async def list_versions(
+        self,
+        arxiv_id: str,
+        limit: int | None = None,
+        fields: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get the stored versions of an arXiv paper, latest first."""
+
+    @abstractmethod
+    async def search(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        """Full-text search over title and summary, best matches first."""
+
+    @abstractmethod
+    async def update_many(
+        self, updates: list[tuple[str, dict[str, Any]]]
+    ) -> dict[str, int]:
+        """Apply one partial update per ``(paper_id, update_data)`` pair in a
+        single batch and return the ``matched``/``modified``/``failed``
+        counts."""
+
+    @abstractmethod
+    async def update_matching(
+        self, filters: dict[str, Any], update_data: dict[str, Any]
+    ) -> dict[str, int]:
+        """Set ``update_data`` on every paper matching ``filters`` and return
+        the ``matched``/``modified`` counts."""
+
+    @abstractmethod
+    async def delete_matching(self, filters: dict[str, Any]) -> int:
+        """Delete every paper matching ``filters`` and return deleted count.
+        """
+
+    @abstractmethod
+    async def add_tombstones(
+        self, paper_ids: list[str], change_seq: int
+    ) -> None:
+        """Record that ``paper_ids`` were deleted at ``change_seq``."""
+
+    @abstractmethod
+    async def list_tombstones(
+        self,
+        limit: int = 100,
+        after: tuple[int, str] | None = None,
+        before: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """List tombstones ordered by ``(change_seq, _id)``."""
+
+    @abstractmethod
+    async def list(
+        self,
+        limit: int = 100,
+        sort_by: str = "_id",
+        descending: bool = False,
+        after: tuple[Any, str] | None = None,
+        filters: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """List filtered papers ordered by ``(sort_by, _id)``, seeking past
+        ``after``."""
+
+    @abstractmethod
+    def iter_papers(self, batch_size: int = 1000) -> AsyncIterator[dict[str, Any]]:
+        """Asynchronously iterate over every paper, ``batch_size`` at a time.
+        """
+
+    @abstractmethod
+    async def update(
+        self,
+        paper_id: str,
+        update_data: dict[str, Any],
+        expected: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Update a paper and return it, or ``None`` if missing, unchanged or
+        no longer equal to ``expected``."""
+
+    @abstractmethod
+    async def delete(self, paper_id: str) -> int:
+        """Delete a paper and return deleted count."""
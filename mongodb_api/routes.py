@@ -6,17 +6,61 @@ for building APIs with minimal code.
 """
 
 import logging
-from typing import List
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Literal, Optional, Union
 from urllib.parse import unquote
 
 # Third Party
-from fastapi import APIRouter, Body, HTTPException, Request, Response, status
-
-from .models.models import Paper, PaperUpdate
+import pymongo
+from anyio import to_thread
+from fastapi import (
+    APIRouter,
+    Body,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+
+from .models.models import (
+    BulkCreateItem,
+    BulkCreateResult,
+    BulkDeleteResult,
+    BulkUpdateRequest,
+    BulkUpdateResult,
+    PAPER_FIELDS,
+    Paper,
+    PaperFields,
+    PaperFilter,
+    PaperSearchResult,
+    PaperUpdate,
+)
 from .services.paper_service import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SEARCH_LIMIT,
+    EXPORT_BATCH_SIZE,
+    InvalidCursorError,
     PaperAlreadyExistsError,
     PaperNotFoundError,
     PaperNotModifiedError,
+    PaperPreconditionFailedError,
+)
+from .utils import (
+    TrustedJSONResponse,
+    aiter_gzip,
+    aiter_ndjson,
+    etag_matches,
+    format_datetime,
+    http_date,
+    paper_etag,
+    paper_last_modified,
+    parse_arxiv_id,
+    parse_http_date,
 )
 
 # the __name__ resolve to "uicheckapp.services"
@@ -24,6 +68,99 @@ logger = logging.getLogger(__name__)
 # This will load the uicheckapp logger
 
 router = APIRouter()
+health_router = APIRouter()
+
+FIELDS_QUERY = Query(
+    None,
+    description=(
+        "Comma-separated fields to return, e.g. title,published,pdf_url. "
+        "_id is always included."
+    ),
+)
+
+
+def parse_fields(fields):
+    """
+    Parse a ``?fields=`` value into a list of stored field names.
+
+    Returns ``None`` (whole papers) when no fields are requested and raises
+    an HTTP 400 error on unknown fields.
+    """
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(PAPER_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    return names
+
+
+def paper_response(request, content, status_code=status.HTTP_200_OK,
+                   headers=None, model=Paper, partial=False):
+    """
+    Build the response for papers read back from the database.
+
+    By default the stored documents are encoded to JSON directly, skipping
+    the ``response_model`` round trip through ``Paper``. When the app is
+    started with ``STRICT_RESPONSE_VALIDATION`` (``app.strict_responses``),
+    each paper is validated against ``model`` first, or against
+    ``PaperFields`` for ``partial`` papers read with ``?fields=``.
+    """
+    if getattr(request.app, "strict_responses", False):
+        if partial:
+            model = PaperFields
+        adapter = TypeAdapter(List[model] if isinstance(content, list)
+                              else model)
+        content = adapter.dump_python(
+            adapter.validate_python(content),
+            mode="json",
+            by_alias=True,
+            exclude_unset=partial,
+        )
+    return TrustedJSONResponse(
+        content, status_code=status_code, headers=headers
+    )
+
+
+def filter_criteria(paper_filter):
+    """Translate a ``PaperFilter`` into the service's bulk write filters."""
+    filters = {}
+    for name, value in paper_filter.model_dump(exclude_none=True).items():
+        if isinstance(value, datetime):
+            value = format_datetime(value)
+        filters[name] = value
+    return filters
+
+
+def update_fields(update):
+    """The fields a partial ``PaperUpdate`` sets, as they are stored."""
+    return update.model_dump(mode="json", exclude_unset=True)
+
+
+def arxiv_identifier(value):
+    """
+    Parse an arXiv id from the path into ``(arxiv_id, version)``, raising
+    an HTTP 400 error when it is not one.
+    """
+    try:
+        return parse_arxiv_id(unquote(value))
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(error)
+        ) from error
+
+
+def paper_headers(paper):
+    """Validator headers of a paper: a strong ``ETag`` and, when the paper
+    has an ``updated`` timestamp, ``Last-Modified``."""
+    headers = {"ETag": paper_etag(paper)}
+    last_modified = paper_last_modified(paper)
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
 
 
 @router.post(
@@ -32,7 +169,7 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     response_model=Paper,
 )
-def create_paper(request: Request, paper: Paper = Body(...)):
+async def create_paper(request: Request, paper: Paper = Body(...)):
     """
     Create a new paper in the database.
 
@@ -44,92 +181,509 @@ def create_paper(request: Request, paper: Paper = Body(...)):
     The created paper as a dictionary.
     """
     try:
-        logger.info(f"Creating paper with id {paper.entry_id}")
-        logger.info(paper)
+        logger.debug("Creating paper with id %s: %s", paper.entry_id, paper)
         paper_data = paper.model_dump_serialized(json_dump=False)
-        logger.info(paper_data)
-        created_paper = request.app.paper_service.create_paper(paper_data)
+        created_paper = await request.app.paper_service.create_paper_async(
+            paper_data
+        )
     except PaperAlreadyExistsError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Paper with ID {paper.entry_id} already exists",
         )
-    except PaperNotFoundError:
+    except Exception as e:
+        logger.error("Error creating paper: %s", e)
+        raise e
+
+    logger.info("Created paper with id %s", paper.entry_id)
+    return paper_response(
+        request,
+        created_paper,
+        status_code=status.HTTP_201_CREATED,
+        headers=paper_headers(created_paper),
+    )
+
+
+@router.post(
+    "/bulk",
+    response_description="Create many papers in one batch",
+    response_model=BulkCreateResult,
+)
+async def create_papers_bulk(
+    request: Request, papers: List[Dict[str, Any]] = Body(...)
+):
+    """
+    Create many papers with one unordered batch write per chunk.
+
+    Items are validated one by one, so a malformed item is reported as
+    invalid instead of failing the whole request. Created papers are not
+    read back from the database.
+
+    Parameters:
+    - request (Request): The request object.
+    - papers (List[Dict[str, Any]]): The paper documents to be created.
+
+    Returns:
+    The per-item outcome ("created", "duplicate" or "invalid") and the
+    totals for each outcome.
+    """
+    items = []
+    valid_indexes = []
+    papers_data = []
+    for index, raw_paper in enumerate(papers):
+        paper_id = raw_paper.get("_id", raw_paper.get("entry_id"))
+        item = BulkCreateItem(
+            index=index,
+            id=None if paper_id is None else str(paper_id),
+            status="invalid",
+        )
+        try:
+            paper = Paper.model_validate(raw_paper)
+        except ValidationError as e:
+            item.detail = str(e)
+        else:
+            item.id = str(paper.entry_id)
+            valid_indexes.append(index)
+            papers_data.append(paper.model_dump_serialized(json_dump=False))
+        items.append(item)
+
+    try:
+        statuses = await request.app.paper_service.create_many_async(
+            papers_data
+        )
+    except Exception as e:
+        logger.error("Error creating papers in bulk: %s", e)
+        raise e
+
+    for index, item_status in zip(valid_indexes, statuses):
+        items[index].status = item_status
+
+    result = BulkCreateResult(items=items)
+    for item in items:
+        setattr(result, item.status, getattr(result, item.status) + 1)
+
+    logger.info(
+        "Bulk create: %d created, %d duplicate, %d invalid",
+        result.created,
+        result.duplicate,
+        result.invalid,
+    )
+    return result
+
+
+@router.patch(
+    "/bulk",
+    response_description="Update many papers",
+    response_model=BulkUpdateResult,
+)
+async def update_papers_bulk(
+    request: Request, bulk_update: BulkUpdateRequest = Body(...)
+):
+    """
+    Update many papers without reading them first.
+
+    The body holds either ``updates``, a list of ``{"id", "update"}`` items
+    applied with one unordered batch write per chunk, or a ``filter`` (the
+    listing filters and/or ``ids``) and one ``set`` applied to every
+    matching paper in a single write. Only the fields given in an update
+    are written.
+
+    Parameters:
+    - request (Request): The request object.
+    - bulk_update (BulkUpdateRequest): The updates to apply.
+
+    Returns:
+    The number of papers matched and modified, and of per-paper updates
+    that failed; HTTP 400 for an empty ``set`` and HTTP 409 if the ``set``
+    would give several papers the same DOI.
+    """
+    service = request.app.paper_service
+    try:
+        if bulk_update.updates is not None:
+            counts = await service.update_many_async(
+                [
+                    (item.id, update_fields(item.update))
+                    for item in bulk_update.updates
+                ]
+            )
+        else:
+            update_data = update_fields(bulk_update.set)
+            if not update_data:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Nothing to set",
+                )
+            counts = await service.update_matching_async(
+                filter_criteria(bulk_update.filter), update_data
+            )
+    except PaperAlreadyExistsError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Created paper not found",
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The update would duplicate a DOI",
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error updating papers in bulk: %s", e)
+        raise e
+
+    logger.info(
+        "Bulk update: %d matched, %d modified",
+        counts["matched"],
+        counts["modified"],
+    )
+    return BulkUpdateResult(**counts)
+
+
+@router.post(
+    "/bulk-delete",
+    response_description="Delete many papers",
+    response_model=BulkDeleteResult,
+)
+async def delete_papers_bulk(
+    request: Request, paper_filter: PaperFilter = Body(...)
+):
+    """
+    Delete every paper matching a filter in one write.
+
+    Parameters:
+    - request (Request): The request object.
+    - paper_filter (PaperFilter): ``ids`` and/or the listing filters; at
+      least one criterion is required.
+
+    Returns:
+    The number of papers deleted.
+    """
+    try:
+        deleted_count = await request.app.paper_service.delete_matching_async(
+            filter_criteria(paper_filter)
         )
     except Exception as e:
-        logger.error(f"Error creating paper: {e}")
+        logger.error("Error deleting papers in bulk: %s", e)
         raise e
 
-    logger.info(f"Created paper with id {paper.entry_id}")
-    return Paper(**created_paper)
+    logger.info("Bulk delete: %d deleted", deleted_count)
+    return BulkDeleteResult(deleted=deleted_count)
 
 
 @router.get(
-    "/", response_description="List all papers", response_model=List[Paper]
+    "/",
+    response_description="List all papers",
+    response_model=Union[List[Paper], List[PaperFields]],
 )
-def list_papers(request: Request):
+async def list_papers(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000),
+    sort: Literal["_id", "published", "updated"] = "_id",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: Optional[str] = None,
+    published_from: Optional[datetime] = None,
+    published_to: Optional[datetime] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+    doi: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+):
     """
-    Retrieve a list of papers from the database.
+    Retrieve one page of papers from the database.
+
+    Pages are ordered by ``(sort, _id)`` and fetched with a keyset seek, so
+    every page costs the same regardless of its depth. When more papers are
+    available, the opaque cursor of the next page is returned in the
+    ``X-Next-Cursor`` header (and as a ``Link: rel="next"`` header); pass it
+    back as ``cursor`` with the same ``sort``, ``order`` and filters.
+    Filtering and sorting on the same date field is served by one index.
 
     Parameters:
     - request (Request): The request object.
+    - limit (int): Page size, between 1 and 1000.
+    - sort (str): Sort key, one of "_id", "published" or "updated".
+    - order (str): Sort direction, "asc" or "desc".
+    - cursor (Optional[str]): Cursor returned by the previous page.
+    - published_from, published_to (Optional[datetime]): Publication date
+      range, lower bound inclusive and upper bound exclusive.
+    - updated_from, updated_to (Optional[datetime]): Last update date range,
+      lower bound inclusive and upper bound exclusive.
+    - doi (Optional[str]): Exact DOI.
+    - fields (Optional[str]): Comma-separated fields to return; only these
+      are read from the database.
 
     Returns:
     A list of papers, each as a dictionary.
     """
+    filters = {
+        name: format_datetime(value)
+        for name, value in (
+            ("published_from", published_from),
+            ("published_to", published_to),
+            ("updated_from", updated_from),
+            ("updated_to", updated_to),
+        )
+        if value is not None
+    }
+    if doi is not None:
+        filters["doi"] = doi
+    field_names = parse_fields(fields)
     try:
-        papers = request.app.paper_service.list_papers()
+        service = request.app.paper_service
+        papers, next_cursor = await service.list_papers_async(
+            limit=limit,
+            sort_by=sort,
+            descending=order == "desc",
+            cursor=cursor,
+            filters=filters or None,
+            fields=field_names,
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor for the requested sort order",
+        )
     except Exception as e:
-        logger.error(f"Error listing papers: {e}")
+        logger.error("Error listing papers: %s", e)
         raise e
 
-    logger.info(f"Found {len(papers)} papers")
-    logger.info(papers)
-    return papers
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    logger.info("Found %d papers", len(papers))
+    logger.debug("Listed papers: %s", papers)
+    return paper_response(
+        request, papers, headers=headers, partial=field_names is not None
+    )
+
+
+@router.get(
+    "/export",
+    response_description="Stream every paper as NDJSON",
+    response_class=StreamingResponse,
+)
+async def export_papers(
+    request: Request,
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000),
+    gzip: bool = False,
+):
+    """
+    Stream the whole collection as newline-delimited JSON.
+
+    Documents are pulled from the database cursor ``batch_size`` at a time
+    and written to the response as they arrive, so memory use stays flat
+    regardless of the collection size.
+
+    Parameters:
+    - request (Request): The request object.
+    - batch_size (int): Number of documents fetched per database round trip.
+    - gzip (bool): Compress the stream with gzip.
+
+    Returns:
+    A streaming ``application/x-ndjson`` response, one paper per line.
+    """
+    logger.info("Exporting papers with batch size %d", batch_size)
+    chunks = aiter_ndjson(
+        request.app.paper_service.export_papers_async(batch_size=batch_size)
+    )
+    headers = {}
+    if gzip:
+        chunks = aiter_gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks, media_type="application/x-ndjson", headers=headers
+    )
+
+
+@router.get(
+    "/search",
+    response_description="Search papers by title and summary",
+    response_model=List[PaperSearchResult],
+)
+async def search_papers(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=512),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+):
+    """
+    Full-text search over paper titles and summaries.
+
+    Parameters:
+    - request (Request): The request object.
+    - q (str): The search terms.
+    - limit (int): Page size, between 1 and 100.
+    - offset (int): Number of matches to skip, at most 1000.
+
+    Returns:
+    The matching papers, most relevant first, each with its ``score``.
+    """
+    try:
+        papers = await request.app.paper_service.search_papers_async(
+            q, limit=limit, offset=offset
+        )
+    except Exception as e:
+        logger.error("Error searching papers for %r: %s", q, e)
+        raise e
+
+    logger.info("Found %d papers for search %r", len(papers), q)
+    return paper_response(request, papers, model=PaperSearchResult)
+
+
+@router.get(
+    "/arxiv/{arxiv_id:path}/versions",
+    response_description="List the stored versions of an arXiv paper",
+    response_model=Union[List[Paper], List[PaperFields]],
+)
+async def list_paper_versions(
+    arxiv_id: str, request: Request, fields: Optional[str] = FIELDS_QUERY
+):
+    """
+    List every stored version of an arXiv paper, latest first.
+
+    Parameters:
+    - arxiv_id (str): The arXiv id, e.g. 2210.06998 or hep-th/9901001; a
+      version suffix or an abs/pdf URL are accepted and ignored.
+    - request (Request): The request object.
+    - fields (Optional[str]): Comma-separated fields to return.
+
+    Returns:
+    The stored versions, or raises an HTTP 404 error if there are none.
+    """
+    field_names = parse_fields(fields)
+    arxiv_id, _ = arxiv_identifier(arxiv_id)
+    try:
+        papers = await request.app.paper_service.list_versions_async(
+            arxiv_id, fields=field_names
+        )
+    except PaperNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Paper with arXiv ID {arxiv_id} not found"
+        )
+
+    logger.info("Found %d versions of %s", len(papers), arxiv_id)
+    return paper_response(
+        request, papers, partial=field_names is not None
+    )
+
+
+@router.get(
+    "/arxiv/{arxiv_id:path}",
+    response_description="Get the latest version of an arXiv paper",
+    response_model=Union[Paper, PaperFields],
+)
+async def find_paper_version(
+    arxiv_id: str, request: Request, fields: Optional[str] = FIELDS_QUERY
+):
+    """
+    Retrieve an arXiv paper by its arXiv id.
+
+    The latest stored version is returned, read with a single seek on the
+    ``(arxiv_id, version)`` index, unless the id names a version
+    (e.g. 2210.06998v1).
+
+    Parameters:
+    - arxiv_id (str): The arXiv id, optionally versioned, or its abs/pdf URL.
+    - request (Request): The request object.
+    - fields (Optional[str]): Comma-separated fields to return.
+
+    Returns:
+    The paper, or raises an HTTP 404 error if not found.
+    """
+    field_names = parse_fields(fields)
+    arxiv_id, version = arxiv_identifier(arxiv_id)
+    try:
+        paper = await request.app.paper_service.find_version_async(
+            arxiv_id, version=version, fields=field_names
+        )
+    except PaperNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Paper with arXiv ID {arxiv_id} not found"
+        )
+
+    return paper_response(
+        request, paper, headers=paper_headers(paper),
+        partial=field_names is not None,
+    )
 
 
 @router.get(
     "/{id:path}",
     response_description="Get a single paper by id",
-    response_model=Paper,
+    response_model=Union[Paper, PaperFields],
 )
-def find_paper(id: str, request: Request):
+async def find_paper(
+    id: str, request: Request, fields: Optional[str] = FIELDS_QUERY
+):
     """
     Retrieve a single paper by its ID.
 
     Parameters:
     - id (str): The ID of the paper to retrieve.
     - request (Request): The request object.
+    - fields (Optional[str]): Comma-separated fields to return; only these
+      are read from the database.
+
+    The response carries a strong ``ETag`` and a ``Last-Modified`` header
+    taken from the paper's ``updated`` timestamp. A matching
+    ``If-None-Match`` is answered with 304. ``If-Modified-Since`` (which is
+    ignored when ``If-None-Match`` is present) is checked against a lookup
+    of the ``updated`` field alone before the paper itself is read.
 
     Returns:
-    The requested paper as a dictionary, or raises an HTTP 404 error if not
-    found.
+    The requested paper as a dictionary, a 304 response if the client's
+    copy is current, or raises an HTTP 404 error if not found.
     """
+    field_names = parse_fields(fields)
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = parse_http_date(
+        request.headers.get("if-modified-since")
+    )
     try:
         id = unquote(id)
-        logger.info(f"Finding paper with id {id}")
-        paper = request.app.paper_service.find_paper(id)
-        logger.info(paper)
+        service = request.app.paper_service
+        if if_none_match is None and if_modified_since is not None:
+            stamp = await service.find_paper_async(id, fields=["updated"])
+            last_modified = paper_last_modified(stamp)
+            # HTTP dates have a one second resolution.
+            if (
+                last_modified is not None
+                and last_modified.replace(microsecond=0) <= if_modified_since
+            ):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"Last-Modified": http_date(last_modified)},
+                )
+        paper = await service.find_paper_async(id, fields=field_names)
+        logger.debug("Found paper: %s", paper)
     except PaperNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Paper with ID {id} not found"
         )
     except Exception as e:
-        logger.error(f"Error finding paper with id {id}: {e}")
+        logger.error("Error finding paper with id %s: %s", id, e)
         raise e
 
-    logger.info(f"Found paper with ID {id}")
-    return paper
+    headers = paper_headers(paper)
+    if etag_matches(if_none_match, headers["ETag"], weak=True):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    logger.info("Found paper with ID %s", id)
+    return paper_response(
+        request, paper, headers=headers, partial=field_names is not None
+    )
 
 
 @router.put(
     "/{id:path}", response_description="Update a paper", response_model=Paper
 )
-def update_paper(id: str, request: Request, paper: PaperUpdate = Body(...)):
+async def update_paper(
+    id: str, request: Request, paper: PaperUpdate = Body(...)
+):
     """
     Update an existing paper's details.
 
@@ -138,18 +692,23 @@ def update_paper(id: str, request: Request, paper: PaperUpdate = Body(...)):
     - request (Request): The request object.
     - paper (PaperUpdate): The updated paper data.
 
+    An ``If-Match`` header makes the update conditional: it is only applied
+    if the stored paper still has one of the given ETags, otherwise HTTP 412
+    is returned.
+
     Returns:
-    The updated paper as a dictionary, or raises an HTTP 404 error if not
-    found or not updated.
+    The updated paper as a dictionary with its new ``ETag``, or raises an
+    HTTP 404 error if not found or not updated.
     """
     id = unquote(id)
-    logger.info(f"Updating paper with id {id}")
     #update_data = paper.model_dump_serialized(json_dump=False)
 
     update_data = paper.model_dump_serialized(json_dump=False, ignore_none=True)
-    logger.info(update_data)
+    logger.debug("Updating paper with id %s: %s", id, update_data)
     try:
-        updated_paper = request.app.paper_service.update_paper(id, update_data)
+        updated_paper = await request.app.paper_service.update_paper_async(
+            id, update_data, if_match=request.headers.get("if-match")
+        )
     except PaperNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -160,15 +719,22 @@ def update_paper(id: str, request: Request, paper: PaperUpdate = Body(...)):
             status_code=status.HTTP_304_NOT_MODIFIED,
             detail=f"Paper with ID {id} not modified",
         )
+    except PaperPreconditionFailedError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Paper with ID {id} has changed",
+        )
     except Exception as e:
-        logger.error(f"Error updating paper with id {id}: {e}")
+        logger.error("Error updating paper with id %s: %s", id, e)
         raise e
 
-    logger.info(f"Updated paper with id {id}")
-    return updated_paper
+    logger.info("Updated paper with id %s", id)
+    return paper_response(
+        request, updated_paper, headers=paper_headers(updated_paper)
+    )
 
 @router.delete("/{id:path}", response_description="Delete a paper")
-def delete_paper(id: str, request: Request, response: Response):
+async def delete_paper(id: str, request: Request, response: Response):
     """
     Delete a paper from the database.
 
@@ -183,12 +749,72 @@ def delete_paper(id: str, request: Request, response: Response):
     """
     try:
         id = unquote(id)
-        logger.info(f"Deleting paper with id {id}")
-        request.app.paper_service.delete_paper(id)
+        await request.app.paper_service.delete_paper_async(id)
+        logger.info("Deleted paper with id %s", id)
         response.status_code = status.HTTP_200_OK
         return response
 
     except Exception as e:
-        logger.error(f"Error deleting paper with id {id}: {e}")
+        logger.error("Error deleting paper with id %s: %s", id, e)
         raise e
 
+
+
+async def read_only_handler(request: Request, exc: Exception):
+    """Answer writes to a read-only replica with HTTP 405."""
+    logger.info("Rejected %s %s on a read-only replica",
+                request.method, request.url.path)
+    return TrustedJSONResponse(
+        {"detail": "This replica is read-only"},
+        status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+        headers={"Allow": "GET, HEAD"},
+    )
+
+
+def ping_database(client, timeout):
+    """Round trip to MongoDB through the connection pool, giving up after
+    ``timeout`` seconds, waiting for a free connection included."""
+    with pymongo.timeout(timeout):
+        client.admin.command("ping")
+
+
+@health_router.get("/live", response_description="Liveness of the API")
+async def live():
+    """Report that the process serves requests, without touching MongoDB."""
+    return {"status": "alive"}
+
+
+@health_router.get("/ready", response_description="Readiness of the API")
+async def ready(request: Request):
+    """
+    Report whether the API can serve requests from MongoDB.
+
+    Pings the database (unless papers are served from memory) and returns
+    HTTP 200 with the round-trip time, or HTTP 503 when the ping fails or does not finish within
+    ``HEALTH_CHECK_TIMEOUT_MS``. Both include the connection pool stats
+    (connections checked out, checkout waits and failures) and, when the
+    paper cache is enabled, its stats.
+    """
+    app = request.app
+    content = {"status": "ready"}
+    status_code = status.HTTP_200_OK
+    start = time.perf_counter()
+    try:
+        if app.mongodb_client is not None:
+            await to_thread.run_sync(
+                partial(ping_database, app.mongodb_client,
+                        getattr(app, "ready_timeout", None))
+            )
+        content["ping_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    except pymongo.errors.PyMongoError as error:
+        logger.warning("Readiness check failed: %s", error)
+        content = {"status": "unavailable", "detail": str(error)}
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    pool_monitor = getattr(app, "pool_monitor", None)
+    if pool_monitor is not None:
+        content["pool"] = pool_monitor.stats()
+    paper_cache = getattr(app, "paper_cache", None)
+    if paper_cache is not None:
+        content["cache"] = paper_cache.stats()
+    return TrustedJSONResponse(content, status_code=status_code)
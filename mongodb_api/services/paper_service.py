@@ -1,7 +1,37 @@
 """Service layer for paper operations."""
 
+# Standard Library
+import threading
+import time
+from functools import partial
+from itertools import islice
+
+# Third Party
+from anyio import to_thread
+
 # Library
-from mongodb_api.repositories.paper_repository import PaperRepository
+from mongodb_api.repositories.paper_repository import (
+    CHANGE_SEQ_FIELD,
+    AsyncPaperRepository,
+    DuplicatePaperError,
+    PaperRepository,
+)
+from mongodb_api.services.search_index import SEARCH_FIELDS, SearchIndex
+from mongodb_api.utils import (
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
+    paper_etag,
+    parse_arxiv_id,
+)
+
+BULK_CHUNK_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_SEARCH_LIMIT = 20
+SORT_FIELDS = ("_id", "published", "updated")
+# Seconds a change waits before the change feed reports it.
+DEFAULT_CHANGE_LAG = 1.0
 
 
 class PaperAlreadyExistsError(Exception):
@@ -16,44 +46,836 @@ class PaperNotModifiedError(Exception):
     """Raised when update operation does not modify a paper."""
 
 
+class PaperPreconditionFailedError(Exception):
+    """Raised when a conditional update's ETag does not match the paper."""
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor is malformed or does not match the
+    requested ordering."""
+
+
+class ChangeClock:
+    """
+    Issue change sequence numbers: microseconds since the epoch, moved
+    past the last number issued so they strictly increase within the
+    process even if the wall clock stalls or steps back.
+    """
+
+    def __init__(self, clock=time.time_ns):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last = 0
+
+    def now(self):
+        return self._clock() // 1000
+
+    def tick(self):
+        with self._lock:
+            self._last = max(self.now(), self._last + 1)
+            return self._last
+
+
 class PaperService:
     """Business logic for paper CRUD, independent from route details."""
 
-    def __init__(self, repository: PaperRepository):
+    def __init__(
+        self,
+        repository: PaperRepository,
+        async_repository: AsyncPaperRepository | None = None,
+        search_index: SearchIndex | None = None,
+        collapse_versions: bool = False,
+        change_clock: ChangeClock | None = None,
+        change_lag: float = DEFAULT_CHANGE_LAG,
+    ):
+        """
+        ``collapse_versions`` deletes the older stored versions of an arXiv
+        paper whenever a version of it is created, so only the latest one
+        is kept.
+
+        Every write stamps the papers it changes with a ``change_seq`` from
+        ``change_clock`` and every delete leaves a tombstone, which the
+        change feed reads back once they are ``change_lag`` seconds old.
+        """
         self._repository = repository
+        self._async_repository = async_repository
+        self._search_index = search_index
+        self._collapse_versions = collapse_versions
+        self._clock = change_clock or ChangeClock()
+        self._change_lag = round(change_lag * 1_000_000)
 
     def create_paper(self, paper_data):
-        existing = self._repository.get_by_id(paper_data["_id"])
-        if existing:
-            raise PaperAlreadyExistsError
+        self._add_arxiv_id(paper_data)
+        paper_data[CHANGE_SEQ_FIELD] = self._clock.tick()
+        try:
+            paper = self._repository.create(paper_data)
+        except DuplicatePaperError as error:
+            raise PaperAlreadyExistsError from error
+        self._index_paper(paper)
+        self.delete_superseded([paper])
+        return paper
 
-        created = self._repository.create(paper_data)
-        if not created:
-            raise PaperNotFoundError
-        return created
+    def create_many(self, papers_data, chunk_size=BULK_CHUNK_SIZE):
+        statuses = []
+        for chunk in self._chunks(papers_data, chunk_size):
+            self._prepare_created(chunk)
+            chunk_statuses = self._repository.create_many(chunk)
+            self._index_created(chunk, chunk_statuses)
+            self.delete_superseded(self._created(chunk, chunk_statuses))
+            statuses.extend(chunk_statuses)
+        return statuses
 
-    def list_papers(self):
-        return self._repository.list(limit=100)
+    def find_version(self, arxiv_id, version=None, fields=None):
+        """
+        Return the latest stored version of an arXiv paper, or the given
+        ``version``. ``arxiv_id`` is the canonical unversioned id.
+        """
+        if version is None:
+            versions = self._repository.list_versions(
+                arxiv_id, limit=1, fields=fields
+            )
+        else:
+            versions = self._repository.list_versions(
+                arxiv_id, fields=self._with_version(fields)
+            )
+        return self._pick_version(versions, version, fields)
 
-    def find_paper(self, paper_id):
-        paper = self._repository.get_by_id(paper_id)
-        if not paper:
-            raise PaperNotFoundError
+    def list_versions(self, arxiv_id, fields=None):
+        """Return every stored version of an arXiv paper, latest first."""
+        versions = self._repository.list_versions(arxiv_id, fields=fields)
+        return self._check_found(versions)
+
+    def delete_superseded(self, papers):
+        """
+        With ``collapse_versions``, delete the stored versions older than
+        the latest one of each arXiv paper in ``papers``; returns how many
+        were deleted.
+        """
+        if not self._collapse_versions:
+            return 0
+        superseded = []
+        for arxiv_id in self._arxiv_ids(papers):
+            versions = self._repository.list_versions(
+                arxiv_id, fields=["version"]
+            )
+            superseded.extend(paper["_id"] for paper in versions[1:])
+        if not superseded:
+            return 0
+        return self.delete_matching({"ids": superseded})
+
+    def backfill_arxiv_ids(self, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Store ``arxiv_id`` and ``version`` on the papers written before they
+        were derived at write time. Scans the whole collection once and
+        returns the number of papers updated.
+        """
+        updates = []
+        modified = 0
+        for paper in self.export_papers(batch_size=batch_size):
+            if paper.get("arxiv_id") is not None:
+                continue
+            update_data = self._add_arxiv_id({"_id": paper["_id"]})
+            update_data.pop("_id")
+            if update_data:
+                updates.append((paper["_id"], update_data))
+            if len(updates) >= batch_size:
+                modified += self.update_many(updates)["modified"]
+                updates = []
+        if updates:
+            modified += self.update_many(updates)["modified"]
+        return modified
+
+    def list_papers(
+        self,
+        limit=DEFAULT_PAGE_SIZE,
+        sort_by="_id",
+        descending=False,
+        cursor=None,
+        filters=None,
+        fields=None,
+    ):
+        """
+        Return one page of papers and the cursor of the next page.
+
+        Pages are fetched with a keyset seek on ``(sort_by, _id)`` instead of
+        an offset, so deep pages are not slower to reach than the first one.
+        ``filters`` is passed to the repository as-is; ``fields`` limits the
+        fields read from it. The next cursor is ``None`` on the last page.
+        """
+        query = self._list_query(
+            limit, sort_by, descending, cursor, filters, fields
+        )
+        papers = self._repository.list(**query)
+        return self._list_page(papers, limit, sort_by, descending, fields)
+
+    def search_papers(self, query, limit=DEFAULT_SEARCH_LIMIT, offset=0):
+        """
+        Return papers matching ``query``, best first, with a ``score``.
+
+        With an in-process search index the ranking is computed locally and
+        only the papers of the requested page are read; otherwise the
+        repository's native text search is used.
+        """
+        if self._search_index is None:
+            return self._repository.search(query, limit=limit, offset=offset)
+
+        papers = []
+        for paper_id, score in self._search_index.search(
+            query, limit=limit, offset=offset
+        ):
+            paper = self._repository.get_by_id(paper_id)
+            if paper:
+                papers.append({**paper, "score": score})
+        return papers
+
+    def build_search_index(self, batch_size=EXPORT_BATCH_SIZE):
+        """Populate the in-process search index from the repository."""
+        if self._search_index is not None:
+            self._search_index.rebuild(
+                self._repository.iter_papers(batch_size=batch_size)
+            )
+
+    def export_papers(self, batch_size=EXPORT_BATCH_SIZE):
+        return self._repository.iter_papers(batch_size=batch_size)
+
+    def find_paper(self, paper_id, fields=None):
+        return self._check_found(
+            self._repository.get_by_id(paper_id, fields=fields)
+        )
+
+    def update_paper(self, paper_id, update_data, if_match=None):
+        """
+        Update a paper in one round trip and return it as stored.
+
+        The paper is only read back separately when the update matched
+        nothing, to tell a missing paper from an unchanged one.
+
+        ``if_match`` is an ``If-Match`` style list of ETags. The paper is
+        then read first and only updated, atomically, if it still is the
+        version one of the ETags names; otherwise
+        ``PaperPreconditionFailedError`` is raised.
+        """
+        update_data = self._stamped(update_data)
+        if not self._is_conditional(if_match):
+            updated = self._repository.update(paper_id, update_data)
+            if updated is None:
+                self._check_found(self._repository.get_by_id(paper_id))
+                raise PaperNotModifiedError
+            self._index_paper(updated)
+            return updated
+
+        current = self._check_found(self._repository.get_by_id(paper_id))
+        self._check_etag(if_match, current)
+        updated = self._repository.update(
+            paper_id, update_data, expected=current
+        )
+        if updated is None:
+            latest = self._check_found(self._repository.get_by_id(paper_id))
+            self._check_unchanged(current, latest)
+            raise PaperNotModifiedError
+        self._index_paper(updated)
+        return updated
+
+    def delete_paper(self, paper_id):
+        deleted_count = self._repository.delete(paper_id)
+        if deleted_count:
+            self._repository.add_tombstones([paper_id], self._clock.tick())
+        self._unindex_paper(paper_id, deleted_count)
+        return deleted_count
+
+    def update_many(self, updates, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Apply one partial update per ``(paper_id, update_data)`` pair, with
+        one batch write per chunk instead of a read-modify-read per paper.
+
+        Returns the ``matched``, ``modified`` and ``failed`` counts.
+        """
+        counts = {"matched": 0, "modified": 0, "failed": 0}
+        for chunk in self._chunks(updates, chunk_size):
+            chunk_counts = self._repository.update_many(
+                self._stamped_updates(chunk)
+            )
+            for key, count in chunk_counts.items():
+                counts[key] += count
+        self._reindex_updated(updates)
+        return counts
+
+    def update_matching(self, filters, update_data):
+        """
+        Set ``update_data`` on every paper matching ``filters`` in one
+        write and return the ``matched`` and ``modified`` counts.
+        """
+        self._check_bulk_filters(filters)
+        try:
+            counts = self._repository.update_matching(
+                filters, self._stamped(update_data)
+            )
+        except DuplicatePaperError as error:
+            raise PaperAlreadyExistsError from error
+        if self._touches_search_fields(update_data):
+            self.build_search_index()
+        return counts
+
+    def delete_matching(self, filters):
+        """
+        Delete every paper matching ``filters`` and return the count.
+
+        Unless the filter is a list of ids, the matching ids are read
+        first, a chunk at a time, and deleted by id, so every deleted
+        paper leaves a tombstone for the change feed.
+        """
+        self._check_bulk_filters(filters)
+        deleted_count = 0
+        for paper_ids in self._matching_id_chunks(filters):
+            chunk_count = self._repository.delete_matching({"ids": paper_ids})
+            if chunk_count:
+                self._repository.add_tombstones(paper_ids, self._clock.tick())
+                self._unindex_papers(paper_ids)
+            deleted_count += chunk_count
+        return deleted_count
+
+    def list_changes(self, token=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Return the papers written and deleted after ``token``.
+
+        Papers and tombstones are each read with an index seek past the
+        token on ``(change_seq, _id)`` and merged in that order, so a sync
+        only reads the changes since the previous one. Changes younger than
+        ``change_lag`` are held back: a write stamped before another one
+        but committed after it, or stamped by a worker whose clock is a
+        little behind, is then not skipped.
+
+        Returns ``{"changes", "token", "more"}``; see ``ChangeFeedPage``.
+        """
+        after = self._decode_change_token(token)
+        before = self._clock.now() - self._change_lag
+        papers = self._repository.list(
+            limit=limit + 1,
+            sort_by=CHANGE_SEQ_FIELD,
+            after=after,
+            filters={"changed_from": 0, "changed_to": before},
+        )
+        tombstones = self._repository.list_tombstones(
+            limit=limit + 1, after=after, before=before
+        )
+        return self._change_page(papers, tombstones, limit, token)
+
+    # Async variants used by the ``async def`` route handlers. With a native
+    # async repository they await the driver directly; otherwise the sync
+    # method runs on the anyio worker pool that FastAPI uses for plain
+    # ``def`` handlers, so the concurrency limit is unchanged.
+
+    async def create_paper_async(self, paper_data):
+        if self._async_repository is None:
+            return await self._run_sync(self.create_paper, paper_data)
+
+        self._add_arxiv_id(paper_data)
+        paper_data[CHANGE_SEQ_FIELD] = self._clock.tick()
+        try:
+            paper = await self._async_repository.create(paper_data)
+        except DuplicatePaperError as error:
+            raise PaperAlreadyExistsError from error
+        self._index_paper(paper)
+        await self.delete_superseded_async([paper])
         return paper
 
-    def update_paper(self, paper_id, update_data):
-        existing = self._repository.get_by_id(paper_id)
-        if not existing:
-            raise PaperNotFoundError
+    async def create_many_async(self, papers_data, chunk_size=BULK_CHUNK_SIZE):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.create_many, papers_data, chunk_size=chunk_size
+            )
+
+        statuses = []
+        for chunk in self._chunks(papers_data, chunk_size):
+            self._prepare_created(chunk)
+            chunk_statuses = await self._async_repository.create_many(chunk)
+            self._index_created(chunk, chunk_statuses)
+            await self.delete_superseded_async(
+                self._created(chunk, chunk_statuses)
+            )
+            statuses.extend(chunk_statuses)
+        return statuses
+
+    async def find_version_async(self, arxiv_id, version=None, fields=None):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.find_version, arxiv_id, version=version, fields=fields
+            )
+
+        if version is None:
+            versions = await self._async_repository.list_versions(
+                arxiv_id, limit=1, fields=fields
+            )
+        else:
+            versions = await self._async_repository.list_versions(
+                arxiv_id, fields=self._with_version(fields)
+            )
+        return self._pick_version(versions, version, fields)
+
+    async def list_versions_async(self, arxiv_id, fields=None):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.list_versions, arxiv_id, fields=fields
+            )
+
+        return self._check_found(
+            await self._async_repository.list_versions(
+                arxiv_id, fields=fields
+            )
+        )
+
+    async def delete_superseded_async(self, papers):
+        if not self._collapse_versions:
+            return 0
+        superseded = []
+        for arxiv_id in self._arxiv_ids(papers):
+            versions = await self._async_repository.list_versions(
+                arxiv_id, fields=["version"]
+            )
+            superseded.extend(paper["_id"] for paper in versions[1:])
+        if not superseded:
+            return 0
+        return await self.delete_matching_async({"ids": superseded})
+
+    async def list_papers_async(
+        self,
+        limit=DEFAULT_PAGE_SIZE,
+        sort_by="_id",
+        descending=False,
+        cursor=None,
+        filters=None,
+        fields=None,
+    ):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.list_papers,
+                limit=limit,
+                sort_by=sort_by,
+                descending=descending,
+                cursor=cursor,
+                filters=filters,
+                fields=fields,
+            )
+
+        query = self._list_query(
+            limit, sort_by, descending, cursor, filters, fields
+        )
+        papers = await self._async_repository.list(**query)
+        return self._list_page(papers, limit, sort_by, descending, fields)
 
-        modified_count = self._repository.update(paper_id, update_data)
-        if modified_count == 0:
+    async def search_papers_async(
+        self, query, limit=DEFAULT_SEARCH_LIMIT, offset=0
+    ):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.search_papers, query, limit=limit, offset=offset
+            )
+
+        if self._search_index is None:
+            return await self._async_repository.search(
+                query, limit=limit, offset=offset
+            )
+
+        papers = []
+        for paper_id, score in self._search_index.search(
+            query, limit=limit, offset=offset
+        ):
+            paper = await self._async_repository.get_by_id(paper_id)
+            if paper:
+                papers.append({**paper, "score": score})
+        return papers
+
+    async def export_papers_async(self, batch_size=EXPORT_BATCH_SIZE):
+        """Asynchronously iterate over every paper."""
+        if self._async_repository is not None:
+            async for paper in self._async_repository.iter_papers(
+                batch_size=batch_size
+            ):
+                yield paper
+            return
+
+        # Pull a whole batch per worker-thread hop rather than one document.
+        papers = iter(self.export_papers(batch_size=batch_size))
+        while True:
+            batch = await self._run_sync(list, islice(papers, batch_size))
+            if not batch:
+                return
+            for paper in batch:
+                yield paper
+
+    async def find_paper_async(self, paper_id, fields=None):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.find_paper, paper_id, fields=fields
+            )
+
+        return self._check_found(
+            await self._async_repository.get_by_id(paper_id, fields=fields)
+        )
+
+    async def update_paper_async(self, paper_id, update_data, if_match=None):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.update_paper, paper_id, update_data, if_match=if_match
+            )
+
+        repository = self._async_repository
+        update_data = self._stamped(update_data)
+        if not self._is_conditional(if_match):
+            updated = await repository.update(paper_id, update_data)
+            if updated is None:
+                self._check_found(await repository.get_by_id(paper_id))
+                raise PaperNotModifiedError
+            self._index_paper(updated)
+            return updated
+
+        current = self._check_found(await repository.get_by_id(paper_id))
+        self._check_etag(if_match, current)
+        updated = await repository.update(
+            paper_id, update_data, expected=current
+        )
+        if updated is None:
+            latest = self._check_found(await repository.get_by_id(paper_id))
+            self._check_unchanged(current, latest)
             raise PaperNotModifiedError
+        self._index_paper(updated)
+        return updated
+
+    async def delete_paper_async(self, paper_id):
+        if self._async_repository is None:
+            return await self._run_sync(self.delete_paper, paper_id)
+        deleted_count = await self._async_repository.delete(paper_id)
+        if deleted_count:
+            await self._async_repository.add_tombstones(
+                [paper_id], self._clock.tick()
+            )
+        self._unindex_paper(paper_id, deleted_count)
+        return deleted_count
+
+    async def update_many_async(self, updates, chunk_size=BULK_CHUNK_SIZE):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.update_many, updates, chunk_size=chunk_size
+            )
+
+        counts = {"matched": 0, "modified": 0, "failed": 0}
+        for chunk in self._chunks(updates, chunk_size):
+            chunk_counts = await self._async_repository.update_many(
+                self._stamped_updates(chunk)
+            )
+            for key, count in chunk_counts.items():
+                counts[key] += count
+        if self._search_index is not None:
+            await self._run_sync(self._reindex_updated, updates)
+        return counts
+
+    async def update_matching_async(self, filters, update_data):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.update_matching, filters, update_data
+            )
+
+        self._check_bulk_filters(filters)
+        try:
+            counts = await self._async_repository.update_matching(
+                filters, self._stamped(update_data)
+            )
+        except DuplicatePaperError as error:
+            raise PaperAlreadyExistsError from error
+        if self._touches_search_fields(update_data):
+            await self._run_sync(self.build_search_index)
+        return counts
+
+    async def delete_matching_async(self, filters):
+        if self._async_repository is None:
+            return await self._run_sync(self.delete_matching, filters)
+
+        self._check_bulk_filters(filters)
+        repository = self._async_repository
+        deleted_count = 0
+        async for paper_ids in self._matching_id_chunks_async(filters):
+            chunk_count = await repository.delete_matching({"ids": paper_ids})
+            if chunk_count:
+                await repository.add_tombstones(
+                    paper_ids, self._clock.tick()
+                )
+                self._unindex_papers(paper_ids)
+            deleted_count += chunk_count
+        return deleted_count
+
+    async def list_changes_async(self, token=None, limit=DEFAULT_PAGE_SIZE):
+        if self._async_repository is None:
+            return await self._run_sync(
+                self.list_changes, token=token, limit=limit
+            )
+
+        after = self._decode_change_token(token)
+        before = self._clock.now() - self._change_lag
+        papers = await self._async_repository.list(
+            limit=limit + 1,
+            sort_by=CHANGE_SEQ_FIELD,
+            after=after,
+            filters={"changed_from": 0, "changed_to": before},
+        )
+        tombstones = await self._async_repository.list_tombstones(
+            limit=limit + 1, after=after, before=before
+        )
+        return self._change_page(papers, tombstones, limit, token)
+
+    # Shared helpers for the sync and async code paths.
+
+    @staticmethod
+    async def _run_sync(func, *args, **kwargs):
+        return await to_thread.run_sync(partial(func, *args, **kwargs))
+
+    @staticmethod
+    def _chunks(items, chunk_size):
+        for start in range(0, len(items), chunk_size):
+            yield items[start:start + chunk_size]
+
+    @staticmethod
+    def _add_arxiv_id(paper_data):
+        # Papers whose id is not an arXiv URL are stored as they are.
+        try:
+            arxiv_id, version = parse_arxiv_id(str(paper_data["_id"]))
+        except ValueError:
+            return paper_data
+        paper_data["arxiv_id"] = arxiv_id
+        paper_data["version"] = version
+        return paper_data
+
+    @staticmethod
+    def _arxiv_ids(papers):
+        return {
+            paper["arxiv_id"] for paper in papers
+            if paper.get("arxiv_id") is not None
+        }
+
+    @staticmethod
+    def _created(papers_data, statuses):
+        return [
+            paper_data
+            for paper_data, status in zip(papers_data, statuses)
+            if status == "created"
+        ]
+
+    @staticmethod
+    def _with_version(fields):
+        if fields is None or "version" in fields:
+            return fields
+        return [*fields, "version"]
+
+    @staticmethod
+    def _pick_version(versions, version, fields):
+        if version is not None:
+            versions = [
+                paper for paper in versions if paper.get("version") == version
+            ]
+        paper = PaperService._check_found(versions and versions[0])
+        if fields is not None and "version" not in fields:
+            paper.pop("version", None)
+        return paper
+
+    def _index_paper(self, paper):
+        if self._search_index is not None:
+            self._search_index.add(paper)
+
+    def _index_created(self, papers_data, statuses):
+        if self._search_index is None:
+            return
+        for paper_data, status in zip(papers_data, statuses):
+            if status == "created":
+                self._search_index.add(paper_data)
+
+    def _unindex_paper(self, paper_id, deleted_count):
+        if self._search_index is not None and deleted_count:
+            self._search_index.remove(paper_id)
+
+    def _touches_search_fields(self, update_data):
+        return self._search_index is not None and any(
+            field in update_data for field in SEARCH_FIELDS
+        )
+
+    def _reindex_updated(self, updates):
+        # Bulk writes do not return the papers, so re-read the ones whose
+        # searchable text may have changed.
+        for paper_id, update_data in updates:
+            if self._touches_search_fields(update_data):
+                paper = self._repository.get_by_id(paper_id)
+                if paper:
+                    self._search_index.add(paper)
+
+    def _unindex_papers(self, paper_ids):
+        if self._search_index is not None:
+            for paper_id in paper_ids:
+                self._search_index.remove(paper_id)
+
+    @staticmethod
+    def _ids_only(filters):
+        criteria = {key for key, value in filters.items() if value is not None}
+        return criteria == {"ids"}
+
+    def _matching_id_chunks(self, filters, chunk_size=BULK_CHUNK_SIZE):
+        if self._ids_only(filters):
+            yield from self._chunks(list(filters["ids"]), chunk_size)
+            return
+        after = None
+        while True:
+            papers = self._repository.list(
+                limit=chunk_size, after=after, filters=filters,
+                fields=["_id"],
+            )
+            if not papers:
+                return
+            after = (papers[-1]["_id"], papers[-1]["_id"])
+            yield [paper["_id"] for paper in papers]
+
+    async def _matching_id_chunks_async(self, filters,
+                                        chunk_size=BULK_CHUNK_SIZE):
+        if self._ids_only(filters):
+            for chunk in self._chunks(list(filters["ids"]), chunk_size):
+                yield chunk
+            return
+        after = None
+        while True:
+            papers = await self._async_repository.list(
+                limit=chunk_size, after=after, filters=filters,
+                fields=["_id"],
+            )
+            if not papers:
+                return
+            after = (papers[-1]["_id"], papers[-1]["_id"])
+            yield [paper["_id"] for paper in papers]
+
+    def _stamped(self, update_data):
+        if not update_data:
+            return update_data
+        return {**update_data, CHANGE_SEQ_FIELD: self._clock.tick()}
+
+    def _stamped_updates(self, updates):
+        change_seq = self._clock.tick()
+        return [
+            (paper_id, {**update_data, CHANGE_SEQ_FIELD: change_seq}
+             if update_data else update_data)
+            for paper_id, update_data in updates
+        ]
+
+    def _prepare_created(self, papers_data):
+        change_seq = self._clock.tick()
+        for paper_data in papers_data:
+            self._add_arxiv_id(paper_data)
+            paper_data[CHANGE_SEQ_FIELD] = change_seq
+
+    @staticmethod
+    def _decode_change_token(token):
+        if token is None:
+            return None
+        try:
+            change_seq, paper_id = decode_cursor(token)["c"]
+            if not isinstance(change_seq, int) or not isinstance(
+                paper_id, str
+            ):
+                raise InvalidCursorError
+        except (ValueError, KeyError, TypeError) as error:
+            raise InvalidCursorError from error
+        return change_seq, paper_id
 
-        updated = self._repository.get_by_id(paper_id)
-        if not updated:
+    @staticmethod
+    def _change_page(papers, tombstones, limit, token):
+        changes = [
+            {"_id": paper["_id"], CHANGE_SEQ_FIELD: paper[CHANGE_SEQ_FIELD],
+             "deleted": False, "paper": paper}
+            for paper in papers
+        ]
+        changes.extend(
+            {"_id": tombstone["_id"],
+             CHANGE_SEQ_FIELD: tombstone[CHANGE_SEQ_FIELD],
+             "deleted": True, "paper": None}
+            for tombstone in tombstones
+        )
+        changes.sort(key=lambda change: (change[CHANGE_SEQ_FIELD],
+                                         change["_id"]))
+        more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            last = changes[-1]
+            token = encode_cursor({"c": [last[CHANGE_SEQ_FIELD], last["_id"]]})
+        return {"changes": changes, "token": token, "more": more}
+
+    @staticmethod
+    def _check_bulk_filters(filters):
+        # An empty filter would select the whole collection.
+        if not any(value is not None for value in (filters or {}).values()):
+            raise ValueError("Bulk writes need at least one filter")
+
+    @staticmethod
+    def _check_found(paper):
+        if not paper:
             raise PaperNotFoundError
-        return updated
+        return paper
 
-    def delete_paper(self, paper_id):
-        return self._repository.delete(paper_id)
+    @staticmethod
+    def _is_conditional(if_match):
+        # "*" only requires the paper to exist, which any update checks.
+        return if_match is not None and if_match.strip() != "*"
+
+    @staticmethod
+    def _check_etag(if_match, paper):
+        if not etag_matches(if_match, paper_etag(paper)):
+            raise PaperPreconditionFailedError
+
+    @staticmethod
+    def _check_unchanged(current, latest):
+        # The conditional update matched nothing: either it was a no-op or
+        # the paper changed between the read and the write.
+        if paper_etag(latest) != paper_etag(current):
+            raise PaperPreconditionFailedError
+
+    @staticmethod
+    def _list_query(limit, sort_by, descending, cursor, filters=None,
+                    fields=None):
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+
+        after = None
+        if cursor is not None:
+            try:
+                payload = decode_cursor(cursor)
+                if payload["s"] != sort_by or payload["d"] != descending:
+                    raise InvalidCursorError
+                sort_value, paper_id = payload["k"]
+            except (ValueError, KeyError, TypeError) as error:
+                raise InvalidCursorError from error
+            after = (sort_value, paper_id)
+
+        if fields is not None and sort_by not in fields:
+            # The sort key is needed to build the next cursor.
+            fields = [*fields, sort_by]
+
+        # Fetch one extra paper to know whether another page exists.
+        return {
+            "limit": limit + 1,
+            "sort_by": sort_by,
+            "descending": descending,
+            "after": after,
+            "filters": filters,
+            "fields": fields,
+        }
+
+    @staticmethod
+    def _list_page(papers, limit, sort_by, descending, fields=None):
+        next_cursor = None
+        if len(papers) > limit:
+            papers = papers[:limit]
+            last = papers[-1]
+            next_cursor = encode_cursor(
+                {
+                    "s": sort_by,
+                    "d": descending,
+                    "k": [last.get(sort_by), last["_id"]],
+                }
+            )
+        if fields is not None and sort_by != "_id" and sort_by not in fields:
+            for paper in papers:
+                paper.pop(sort_by, None)
+        return papers, next_cursor
@@ -0,0 +1,115 @@
+"""In-process BM25 inverted index over paper titles and summaries."""
+
+# Standard Library
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+SEARCH_FIELDS = ("title", "summary")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def paper_terms(paper):
+    """Term frequencies of the searchable fields of a paper."""
+    terms = Counter()
+    for field in SEARCH_FIELDS:
+        terms.update(tokenize(paper.get(field)))
+    return terms
+
+
+class SearchIndex:
+    """Inverted index ranking papers with Okapi BM25.
+
+    Used for repository backends without a native text index. It is kept
+    current incrementally through ``add`` and ``remove``, so writes cost
+    time proportional to the size of the paper, not of the collection.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self._k1 = k1
+        self._b = b
+        self._postings = {}
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def add(self, paper):
+        """Index a paper, replacing any previous version with the same id."""
+        terms = paper_terms(paper)
+        with self._lock:
+            self._remove(paper["_id"])
+            paper_id = paper["_id"]
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[paper_id] = frequency
+            self._doc_terms[paper_id] = tuple(terms)
+            length = sum(terms.values())
+            self._doc_lengths[paper_id] = length
+            self._total_length += length
+
+    def remove(self, paper_id):
+        with self._lock:
+            self._remove(paper_id)
+
+    def rebuild(self, papers):
+        """Replace the index contents with ``papers``."""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0
+        for paper in papers:
+            self.add(paper)
+
+    def search(self, query, limit=20, offset=0):
+        """Return ``(paper_id, score)`` pairs, best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._doc_lengths)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            scores = Counter()
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for paper_id, frequency in postings.items():
+                    norm = self._k1 * (
+                        1
+                        - self._b
+                        + self._b * self._doc_lengths[paper_id]
+                        / average_length
+                    )
+                    scores[paper_id] += (
+                        idf * frequency * (self._k1 + 1) / (frequency + norm)
+                    )
+        best = heapq.nlargest(
+            offset + limit, scores.items(), key=lambda item: (item[1], item[0])
+        )
+        return best[offset:]
+
+    def _remove(self, paper_id):
+        terms = self._doc_terms.pop(paper_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[paper_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(paper_id)
@@ -0,0 +1,51 @@
+"""Smoke tests for the end-to-end benchmark."""
+
+# Standard Library
+import asyncio
+import json
+
+# Library
+from mongodb_api.benchmark import SCENARIOS, compare, main, run_case
+
+
+def test_every_scenario_runs_without_errors():
+    results = asyncio.run(
+        run_case("memory", 20, 2, SCENARIOS, 5, bulk_size=3, alloc_samples=2)
+    )
+
+    assert [result["scenario"] for result in results] == list(SCENARIOS)
+    for result in results:
+        assert result["errors"] == 0
+        assert result["requests"] == 5
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        assert result["alloc"]["peak_kib_per_request"] > 0
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "results": [
+            {"scenario": "get", "backend": "memory", "corpus": 10,
+             "concurrency": 1, "rps": 1000.0, "latency_ms": {"p95": 1.0}},
+        ]
+    }
+    slower = [
+        {"scenario": "get", "backend": "memory", "corpus": 10,
+         "concurrency": 1, "rps": 700.0, "latency_ms": {"p95": 1.1}},
+    ]
+
+    assert len(compare(slower, baseline, tolerance=0.2)) == 1
+    assert compare(slower, baseline, tolerance=0.5) == []
+
+
+def test_main_writes_json_report(tmp_path):
+    output = tmp_path / "bench.json"
+    status = main([
+        "--backend", "mongomock", "--corpus", "10", "--requests", "3",
+        "--scenario", "get", "--alloc-samples", "0",
+        "--output", str(output),
+    ])
+
+    report = json.loads(output.read_text())
+    assert status == 0
+    assert report["results"][0]["scenario"] == "get"
+    assert report["results"][0]["errors"] == 0
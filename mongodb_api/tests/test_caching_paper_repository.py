@@ -0,0 +1,105 @@
+"""Tests for the read-through CachingPaperRepository."""
+
+# Standard Library
+from unittest.mock import MagicMock
+
+# Library
+from mongodb_api.repositories.caching_paper_repository import (
+    CachingPaperRepository,
+    PaperCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_repository(max_size=2, ttl=60.0):
+    inner = MagicMock()
+    inner.get_by_id.side_effect = lambda paper_id, fields=None: {
+        "_id": paper_id
+    }
+    clock = FakeClock()
+    cache = PaperCache(max_size=max_size, ttl=ttl, clock=clock)
+    return CachingPaperRepository(inner, cache), inner, clock
+
+
+def test_get_by_id_reads_through_once():
+    repository, inner, _ = make_repository()
+
+    assert repository.get_by_id("a") == {"_id": "a"}
+    assert repository.get_by_id("a") == {"_id": "a"}
+
+    assert inner.get_by_id.call_count == 1
+    assert repository.cache.stats()["hits"] == 1
+    assert repository.cache.stats()["misses"] == 1
+
+
+def test_misses_are_cached():
+    repository, inner, _ = make_repository()
+    inner.get_by_id.side_effect = None
+    inner.get_by_id.return_value = None
+
+    assert repository.get_by_id("missing") is None
+    assert repository.get_by_id("missing") is None
+    assert inner.get_by_id.call_count == 1
+
+
+def test_entries_expire_and_evict():
+    repository, inner, clock = make_repository(max_size=2, ttl=10.0)
+    for paper_id in ("a", "b", "c"):
+        repository.get_by_id(paper_id)
+    assert repository.cache.stats()["evictions"] == 1
+
+    clock.now = 11.0
+    repository.get_by_id("c")
+    assert inner.get_by_id.call_count == 4
+
+
+def test_writes_invalidate_entries():
+    repository, inner, _ = make_repository()
+    repository.get_by_id("a")
+
+    repository.update("a", {"title": "new"})
+    repository.get_by_id("a")
+    repository.delete("a")
+    repository.get_by_id("a")
+    repository.create({"_id": "a"})
+    repository.get_by_id("a")
+
+    assert inner.get_by_id.call_count == 4
+
+
+def test_projected_reads_use_cached_papers():
+    repository, inner, _ = make_repository()
+
+    assert repository.get_by_id("a", fields=["title"]) == {"_id": "a"}
+    inner.get_by_id.assert_called_once_with("a", fields=["title"])
+
+    repository.get_by_id("a")
+    assert repository.get_by_id("a", fields=["title"]) == {"_id": "a"}
+    assert inner.get_by_id.call_count == 2
+
+
+def test_returned_papers_do_not_alias_cache():
+    repository, _, _ = make_repository()
+    repository.get_by_id("a")["title"] = "mutated"
+
+    assert "title" not in repository.get_by_id("a")
+
+
+def test_bulk_writes_invalidate_entries():
+    repository, inner, _ = make_repository(max_size=4)
+    for paper_id in ("a", "b", "c"):
+        repository.get_by_id(paper_id)
+
+    repository.update_many([("a", {"title": "new"})])
+    repository.delete_matching({"ids": ["b"]})
+    assert repository.cache.stats()["size"] == 1
+
+    repository.update_matching({"doi": "10.1/a"}, {"title": "new"})
+    assert repository.cache.stats()["size"] == 0
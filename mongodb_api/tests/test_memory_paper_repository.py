@@ -0,0 +1,157 @@
+"""Tests for InMemoryPaperRepository.
+
+The repository contract tests of ``test_mongo_paper_repository`` are run
+against the in-memory backend as well, through the ``repository`` fixture
+below, so both backends are held to the same behaviour.
+"""
+
+# Standard Library
+import gzip
+import json
+
+# Third Party
+import anyio
+import pytest
+
+# Library
+from mongodb_api.repositories.memory_paper_repository import (
+    AsyncInMemoryPaperRepository,
+    InMemoryPaperRepository,
+)
+from mongodb_api.repositories.paper_repository import (
+    DuplicatePaperError,
+    ReadOnlyRepositoryError,
+)
+from mongodb_api.services.paper_service import PaperService
+from mongodb_api.tests.test_mongo_paper_repository import (  # noqa: F401
+    make_paper,
+    test_backfill_arxiv_ids,
+    test_bulk_updates_and_deletes_report_counts,
+    test_create_and_update_map_outcomes,
+    test_create_many_reports_duplicates,
+    test_cursor_must_match_sort_order,
+    test_filtered_pages_stay_in_range,
+    test_keyset_pages_cover_collection_once,
+    test_list_fields_keep_cursor_working,
+    test_collapse_versions_keeps_latest_only,
+    test_search_index_follows_service_writes,
+    test_update_if_match_is_compare_and_set,
+    test_versions_are_found_latest_first,
+)
+
+
+@pytest.fixture
+def repository():
+    return InMemoryPaperRepository()
+
+
+def test_descending_range_pages_seek_in_index(repository):
+    papers = [
+        make_paper(i, f"2022-01-{1 + i % 5:02d}T00:00:00Z") for i in range(20)
+    ]
+    papers[3]["published"] = None
+    repository.create_many(papers)
+    service = PaperService(repository)
+    filters = {"published_to": "2022-01-04T00:00:00Z"}
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = service.list_papers(
+            limit=4, sort_by="published", descending=True, cursor=cursor,
+            filters=filters,
+        )
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    expected = sorted(
+        (p for p in papers
+         if p["published"] and p["published"] < filters["published_to"]),
+        key=lambda p: (p["published"], p["_id"]),
+        reverse=True,
+    )
+    assert [p["_id"] for p in seen] == [p["_id"] for p in expected]
+
+
+def test_updates_move_index_entries(repository):
+    papers = [
+        make_paper(i, f"2022-01-{1 + i:02d}T00:00:00Z") for i in range(3)
+    ]
+    repository.create_many(papers)
+    repository.update(papers[0]["_id"], {"published": "2022-02-01T00:00:00Z"})
+    repository.delete(papers[1]["_id"])
+
+    listed = repository.list(sort_by="published")
+
+    assert [p["_id"] for p in listed] == [papers[2]["_id"], papers[0]["_id"]]
+
+
+def test_doi_is_unique(repository):
+    first = {**make_paper(0, "2022-01-01T00:00:00Z"), "doi": "10.1/a"}
+    second = {**make_paper(1, "2022-01-01T00:00:00Z"), "doi": "10.1/a"}
+    repository.create(first)
+
+    with pytest.raises(DuplicatePaperError):
+        repository.create(second)
+    assert repository.create_many([second]) == ["duplicate"]
+
+
+def test_bulk_updates_enforce_doi_uniqueness(repository):
+    papers = [make_paper(i, "2022-01-01T00:00:00Z") for i in range(3)]
+    repository.create_many(papers)
+
+    counts = repository.update_many(
+        [(papers[0]["_id"], {"doi": "10.1/a"}),
+         (papers[1]["_id"], {"doi": "10.1/a"})]
+    )
+
+    assert counts == {"matched": 1, "modified": 1, "failed": 1}
+    with pytest.raises(DuplicatePaperError):
+        repository.update_matching(
+            {"published_from": "2022-01-01T00:00:00Z"}, {"doi": "10.1/b"}
+        )
+
+
+def test_returned_papers_do_not_alias_storage(repository):
+    paper = make_paper(0, "2022-01-01T00:00:00Z")
+    repository.create(paper)
+    repository.get_by_id(paper["_id"])["title"] = "mutated"
+    repository.list()[0]["title"] = "mutated"
+
+    assert repository.get_by_id(paper["_id"])["title"] == paper["title"]
+
+
+def test_read_only_snapshot_replica(tmp_path):
+    papers = [make_paper(i, "2022-01-01T00:00:00Z") for i in range(3)]
+    path = tmp_path / "papers.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+        for paper in papers:
+            snapshot.write(json.dumps(paper) + "\n")
+
+    replica = InMemoryPaperRepository.from_snapshot(str(path))
+
+    assert len(replica) == 3
+    assert list(replica.iter_papers(batch_size=2)) == papers
+    with pytest.raises(ReadOnlyRepositoryError):
+        replica.create(make_paper(3, "2022-01-01T00:00:00Z"))
+    with pytest.raises(ReadOnlyRepositoryError):
+        replica.delete(papers[0]["_id"])
+
+
+def test_async_service_runs_on_memory_repository(repository):
+    service = PaperService(
+        repository, async_repository=AsyncInMemoryPaperRepository(repository)
+    )
+    paper = make_paper(0, "2022-01-01T00:00:00Z")
+
+    async def scenario():
+        await service.create_paper_async(paper)
+        page, _ = await service.list_papers_async()
+        exported = [p async for p in service.export_papers_async()]
+        return page, exported
+
+    page, exported = anyio.run(scenario)
+
+    assert page == [paper]
+    assert exported == [paper]
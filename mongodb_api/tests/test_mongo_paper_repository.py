@@ -0,0 +1,311 @@
+"""Tests for MongoPaperRepository against an in-process mongomock backend."""
+
+# Third Party
+import mongomock
+import pytest
+
+# Library
+from mongodb_api.repositories.mongo_paper_repository import (
+    MongoPaperRepository,
+    ensure_indexes,
+    plan_stages,
+)
+from mongodb_api.services.paper_service import (
+    InvalidCursorError,
+    PaperAlreadyExistsError,
+    PaperNotFoundError,
+    PaperNotModifiedError,
+    PaperPreconditionFailedError,
+    PaperService,
+)
+from mongodb_api.services.search_index import SearchIndex
+from mongodb_api.utils import paper_etag
+
+
+def make_paper(index, published):
+    return {
+        "_id": f"http://arxiv.org/abs/0000.{index:05d}v1",
+        "title": f"Paper {index}",
+        "summary": "Summary",
+        "published": published,
+        "updated": published,
+        "pdf_url": f"http://arxiv.org/pdf/0000.{index:05d}v1",
+    }
+
+
+@pytest.fixture
+def repository():
+    collection = mongomock.MongoClient().db.papers
+    return MongoPaperRepository(collection)
+
+
+def test_create_many_reports_duplicates(repository):
+    repository.create(make_paper(0, "2022-01-01T00:00:00Z"))
+
+    statuses = repository.create_many(
+        [
+            make_paper(1, "2022-01-01T00:00:00Z"),
+            make_paper(0, "2022-01-01T00:00:00Z"),
+            make_paper(1, "2022-01-01T00:00:00Z"),
+        ]
+    )
+
+    assert statuses == ["created", "duplicate", "duplicate"]
+
+
+def test_create_and_update_map_outcomes(repository):
+    service = PaperService(repository)
+    paper = make_paper(0, "2022-01-01T00:00:00Z")
+    service.create_paper(dict(paper))
+
+    with pytest.raises(PaperAlreadyExistsError):
+        service.create_paper(dict(paper))
+
+    updated = service.update_paper(paper["_id"], {"title": "New title"})
+    assert updated["title"] == "New title"
+
+    with pytest.raises(PaperNotModifiedError):
+        service.update_paper(paper["_id"], {"title": "New title"})
+
+    with pytest.raises(PaperNotFoundError):
+        service.update_paper("missing", {"title": "New title"})
+
+
+def test_update_if_match_is_compare_and_set(repository):
+    service = PaperService(repository)
+    paper = service.create_paper(make_paper(0, "2022-01-01T00:00:00Z"))
+    etag = paper_etag(service.find_paper(paper["_id"]))
+
+    updated = service.update_paper(
+        paper["_id"], {"title": "First"}, if_match=etag
+    )
+    assert updated["title"] == "First"
+
+    # The old ETag no longer names the stored version.
+    with pytest.raises(PaperPreconditionFailedError):
+        service.update_paper(paper["_id"], {"title": "Second"}, if_match=etag)
+
+    # A stale read that races a concurrent write loses the compare-and-set.
+    stale = service.find_paper(paper["_id"])
+    repository.update(paper["_id"], {"comment": "concurrent"})
+    assert repository.update(paper["_id"], {"title": "Third"},
+                             expected=stale) is None
+
+    with pytest.raises(PaperNotModifiedError):
+        service.update_paper(
+            paper["_id"], {"comment": "concurrent"},
+            if_match=paper_etag(service.find_paper(paper["_id"])),
+        )
+
+
+def test_search_index_follows_service_writes(repository):
+    service = PaperService(repository, search_index=SearchIndex())
+    first = make_paper(0, "2022-01-01T00:00:00Z")
+    second = make_paper(1, "2022-01-01T00:00:00Z")
+    service.create_paper(first)
+    service.create_many([second])
+
+    assert [p["_id"] for p in service.search_papers("paper")] == [
+        second["_id"],
+        first["_id"],
+    ]
+
+    service.update_paper(first["_id"], {"title": "Quantum annealing"})
+    hits = service.search_papers("quantum")
+    assert [p["_id"] for p in hits] == [first["_id"]]
+    assert hits[0]["score"] > 0
+
+    service.delete_paper(first["_id"])
+    assert service.search_papers("quantum") == []
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_cover_collection_once(repository, descending):
+    # Several papers share a publication date to exercise the _id tiebreak.
+    papers = [
+        make_paper(i, f"2022-01-0{1 + i % 3}T00:00:00Z") for i in range(10)
+    ]
+    repository.create_many(papers)
+    service = PaperService(repository)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = service.list_papers(
+            limit=3, sort_by="published", descending=descending, cursor=cursor
+        )
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    expected = sorted(
+        papers, key=lambda p: (p["published"], p["_id"]), reverse=descending
+    )
+    assert [p["_id"] for p in seen] == [p["_id"] for p in expected]
+
+
+def test_filtered_pages_stay_in_range(repository):
+    papers = [
+        make_paper(i, f"2022-01-{1 + i:02d}T00:00:00Z") for i in range(10)
+    ]
+    papers[4]["doi"] = "10.1234/abcd"
+    repository.create_many(papers)
+    service = PaperService(repository)
+    filters = {
+        "published_from": "2022-01-03T00:00:00Z",
+        "published_to": "2022-01-08T00:00:00Z",
+    }
+
+    first, cursor = service.list_papers(
+        limit=3, sort_by="published", cursor=None, filters=filters
+    )
+    second, cursor = service.list_papers(
+        limit=3, sort_by="published", cursor=cursor, filters=filters
+    )
+
+    assert [p["_id"] for p in first + second] == [
+        p["_id"] for p in papers[2:7]
+    ]
+    assert cursor is None
+    by_doi, _ = service.list_papers(filters={"doi": "10.1234/abcd"})
+    assert [p["_id"] for p in by_doi] == [papers[4]["_id"]]
+
+
+def test_list_fields_keep_cursor_working(repository):
+    papers = [
+        make_paper(i, f"2022-01-{1 + i:02d}T00:00:00Z") for i in range(4)
+    ]
+    repository.create_many(papers)
+    service = PaperService(repository)
+
+    first, cursor = service.list_papers(
+        limit=2, sort_by="published", fields=["title"]
+    )
+    second, _ = service.list_papers(
+        limit=2, sort_by="published", cursor=cursor, fields=["title"]
+    )
+
+    assert first + second == [
+        {"_id": p["_id"], "title": p["title"]} for p in papers
+    ]
+
+
+def test_bulk_updates_and_deletes_report_counts(repository):
+    papers = [
+        make_paper(i, f"2022-01-{1 + i:02d}T00:00:00Z") for i in range(5)
+    ]
+    repository.create_many(papers)
+    service = PaperService(repository)
+
+    counts = service.update_many(
+        [
+            (papers[0]["_id"], {"comment": "backfilled"}),
+            (papers[1]["_id"], {"title": papers[1]["title"]}),
+            ("missing", {"comment": "backfilled"}),
+        ],
+        chunk_size=2,
+    )
+    # Unchanged papers are not matched, so they keep their change_seq.
+    assert counts == {"matched": 1, "modified": 1, "failed": 0}
+    assert service.find_paper(papers[0]["_id"])["comment"] == "backfilled"
+
+    filters = {"published_from": "2022-01-03T00:00:00Z"}
+    update = {"download_path": "/pdfs"}
+    assert service.update_matching(filters, update) == {
+        "matched": 3, "modified": 3,
+    }
+    assert service.update_matching(filters, update)["modified"] == 0
+    assert service.find_paper(papers[1]["_id"]).get("download_path") is None
+
+    assert service.delete_matching(
+        {"ids": [papers[0]["_id"], "missing"]}
+    ) == 1
+    assert service.delete_matching(filters) == 3
+    assert [p["_id"] for p in service.list_papers()[0]] == [papers[1]["_id"]]
+
+    with pytest.raises(ValueError):
+        service.delete_matching({})
+
+
+def test_versions_are_found_latest_first(repository):
+    service = PaperService(repository)
+    for version in (1, 3, 2):
+        paper = make_paper(0, "2022-01-01T00:00:00Z")
+        paper["_id"] = paper["_id"].replace("v1", f"v{version}")
+        service.create_paper(paper)
+    service.create_paper(make_paper(1, "2022-01-01T00:00:00Z"))
+
+    assert service.find_version("0000.00000")["_id"].endswith("v3")
+    assert service.find_version("0000.00000", version=2)["version"] == 2
+    assert service.find_version(
+        "0000.00000", version=1, fields=["title"]
+    ).keys() == {"_id", "title"}
+    assert [p["version"] for p in service.list_versions("0000.00000")] == [
+        3, 2, 1,
+    ]
+    with pytest.raises(PaperNotFoundError):
+        service.find_version("0000.00000", version=4)
+    with pytest.raises(PaperNotFoundError):
+        service.list_versions("0000.99999")
+
+
+def test_collapse_versions_keeps_latest_only(repository):
+    service = PaperService(repository, collapse_versions=True)
+    first = make_paper(0, "2022-01-01T00:00:00Z")
+    second = dict(first, _id=first["_id"].replace("v1", "v2"))
+    service.create_paper(dict(second))
+
+    assert service.create_many([first]) == ["created"]
+    assert [p["_id"] for p in service.list_versions("0000.00000")] == [
+        second["_id"],
+    ]
+
+
+def test_backfill_arxiv_ids(repository):
+    repository.create_many(
+        [make_paper(i, "2022-01-01T00:00:00Z") for i in range(3)]
+        + [dict(make_paper(3, "2022-01-01T00:00:00Z"), _id="not-arxiv")]
+    )
+    service = PaperService(repository)
+
+    assert service.backfill_arxiv_ids(batch_size=2) == 3
+    assert service.find_version("0000.00002")["version"] == 1
+    assert service.backfill_arxiv_ids() == 0
+
+
+def test_ensure_indexes_is_idempotent(repository):
+    collection = mongomock.MongoClient().db.papers
+    ensure_indexes(collection, text_index=False)
+    ensure_indexes(collection, text_index=False)
+
+    assert {
+        "published_id", "updated_id", "doi_unique", "arxiv_id_version",
+    } <= set(
+        collection.index_information()
+    )
+
+
+def test_plan_stages_flags_collection_scans():
+    plan = {
+        "stage": "LIMIT",
+        "inputStage": {
+            "stage": "FETCH",
+            "inputStage": {"stage": "IXSCAN", "indexName": "published_id"},
+        },
+    }
+
+    assert plan_stages(plan) == ["LIMIT", "FETCH", "IXSCAN"]
+    assert "COLLSCAN" in plan_stages(
+        {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+    )
+
+
+def test_cursor_must_match_sort_order(repository):
+    repository.create_many(
+        [make_paper(i, "2022-01-01T00:00:00Z") for i in range(3)]
+    )
+    service = PaperService(repository)
+    _, cursor = service.list_papers(limit=1, sort_by="published")
+
+    with pytest.raises(InvalidCursorError):
+        service.list_papers(limit=1, sort_by="updated", cursor=cursor)
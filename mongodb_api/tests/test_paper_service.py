@@ -1,12 +1,14 @@
 """Unit tests for PaperService using repository doubles."""
 
 # Standard Library
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 # Third Party
 import pytest
 
 # Library
+from mongodb_api.repositories.paper_repository import DuplicatePaperError
 from mongodb_api.services.paper_service import (
     PaperAlreadyExistsError,
     PaperNotFoundError,
@@ -17,7 +19,7 @@ from mongodb_api.services.paper_service import (
 
 def test_create_paper_conflict():
     repository = MagicMock()
-    repository.get_by_id.return_value = {"_id": "abc"}
+    repository.create.side_effect = DuplicatePaperError("abc")
     service = PaperService(repository)
 
     with pytest.raises(PaperAlreadyExistsError):
@@ -36,7 +38,7 @@ def test_find_paper_not_found():
 def test_update_not_modified():
     repository = MagicMock()
     repository.get_by_id.return_value = {"_id": "abc"}
-    repository.update.return_value = 0
+    repository.update.return_value = None
     service = PaperService(repository)
 
     with pytest.raises(PaperNotModifiedError):
@@ -45,8 +47,85 @@ def test_update_not_modified():
 
 def test_update_missing_paper():
     repository = MagicMock()
+    repository.update.return_value = None
     repository.get_by_id.return_value = None
     service = PaperService(repository)
 
     with pytest.raises(PaperNotFoundError):
         service.update_paper("abc", {"title": "new"})
+
+
+def test_update_paper_single_round_trip():
+    repository = MagicMock()
+    repository.update.return_value = {"_id": "abc", "title": "new"}
+    service = PaperService(repository)
+
+    paper = service.update_paper("abc", {"title": "new"})
+
+    assert paper == {"_id": "abc", "title": "new"}
+    repository.get_by_id.assert_not_called()
+
+
+def test_create_many_writes_in_chunks():
+    repository = MagicMock()
+    repository.create_many.side_effect = lambda chunk: ["created"] * len(chunk)
+    service = PaperService(repository)
+
+    statuses = service.create_many(
+        [{"_id": str(i)} for i in range(5)], chunk_size=2
+    )
+
+    assert statuses == ["created"] * 5
+    assert repository.create_many.call_count == 3
+
+
+def test_find_paper_async_uses_async_repository():
+    repository = MagicMock()
+    async_repository = AsyncMock()
+    async_repository.get_by_id.return_value = {"_id": "abc"}
+    service = PaperService(repository, async_repository=async_repository)
+
+    paper = asyncio.run(service.find_paper_async("abc"))
+
+    assert paper == {"_id": "abc"}
+    repository.get_by_id.assert_not_called()
+
+
+def test_update_paper_async_not_modified():
+    async_repository = AsyncMock()
+    async_repository.get_by_id.return_value = {"_id": "abc"}
+    async_repository.update.return_value = None
+    service = PaperService(MagicMock(), async_repository=async_repository)
+
+    with pytest.raises(PaperNotModifiedError):
+        asyncio.run(service.update_paper_async("abc", {"title": "new"}))
+
+
+def test_find_paper_async_falls_back_to_sync_repository():
+    repository = MagicMock()
+    repository.get_by_id.return_value = None
+    service = PaperService(repository)
+
+    with pytest.raises(PaperNotFoundError):
+        asyncio.run(service.find_paper_async("abc"))
+
+
+def test_bulk_writes_keep_search_index_current():
+    repository = MagicMock()
+    repository.update_many.return_value = {
+        "matched": 1, "modified": 1, "failed": 0,
+    }
+    repository.get_by_id.return_value = {"_id": "a", "title": "Quantum"}
+    repository.delete_matching.return_value = 1
+    search_index = MagicMock()
+    service = PaperService(repository, search_index=search_index)
+
+    service.update_many([("a", {"title": "Quantum"}), ("b", {"doi": "x"})])
+    search_index.add.assert_called_once_with({"_id": "a", "title": "Quantum"})
+
+    service.delete_matching({"ids": ["a"]})
+    search_index.remove.assert_called_once_with("a")
+
+    repository.iter_papers.return_value = []
+    service.delete_matching({"doi": "x"})
+    search_index.rebuild.assert_called_once()
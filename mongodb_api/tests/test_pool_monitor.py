@@ -0,0 +1,83 @@
+"""Tests for the connection pool telemetry and client settings."""
+
+# Third Party
+from pymongo import monitoring
+
+# Library
+from mongodb_api.main import mongo_client_options
+from mongodb_api.pool_monitor import PoolMonitor
+
+ADDRESS = ("localhost", 27017)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def check_out(monitor, clock, wait):
+    monitor.connection_check_out_started(
+        monitoring.ConnectionCheckOutStartedEvent(ADDRESS)
+    )
+    clock.now += wait
+    monitor.connection_checked_out(
+        monitoring.ConnectionCheckedOutEvent(ADDRESS, 1)
+    )
+
+
+def test_tracks_checked_out_connections_and_waits():
+    clock = FakeClock()
+    monitor = PoolMonitor(clock=clock)
+    check_out(monitor, clock, 0.002)
+    check_out(monitor, clock, 0.010)
+    monitor.connection_checked_in(
+        monitoring.ConnectionCheckedInEvent(ADDRESS, 1)
+    )
+
+    stats = monitor.stats()
+    assert stats["checked_out"] == 1
+    assert stats["max_checked_out"] == 2
+    assert stats["checkouts"] == 2
+    assert stats["wait_ms"]["max"] == 10.0
+    assert stats["wait_ms"]["p50"] == 2.0
+    assert stats["wait_ms"]["mean"] == 6.0
+
+
+def test_counts_failed_checkouts_by_reason():
+    clock = FakeClock()
+    monitor = PoolMonitor(clock=clock)
+    monitor.connection_check_out_started(
+        monitoring.ConnectionCheckOutStartedEvent(ADDRESS)
+    )
+    clock.now += 0.5
+    monitor.connection_check_out_failed(
+        monitoring.ConnectionCheckOutFailedEvent(
+            ADDRESS, monitoring.ConnectionCheckOutFailedReason.TIMEOUT
+        )
+    )
+
+    stats = monitor.stats()
+    assert stats["failed_checkouts"] == 1
+    assert stats["failed_checkouts_by_reason"] == {"timeout": 1}
+    assert stats["checked_out"] == 0
+    assert "p50" not in stats["wait_ms"]
+
+
+def test_mongo_client_options_only_passes_set_values():
+    options = mongo_client_options(
+        {
+            "MONGO_MAX_POOL_SIZE": "50",
+            "MONGO_WAIT_QUEUE_TIMEOUT_MS": "250",
+            "MONGO_COMPRESSORS": " zstd,zlib ",
+            "MONGO_SOCKET_TIMEOUT_MS": "",
+        }
+    )
+
+    assert options == {
+        "maxPoolSize": 50,
+        "waitQueueTimeoutMS": 250,
+        "compressors": "zstd,zlib",
+    }
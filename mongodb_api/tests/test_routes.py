@@ -4,15 +4,22 @@
 
 # Standard Library
 # Importing necessary libraries and modules
+import json
 import os
 from unittest.mock import MagicMock
+from urllib.parse import quote
 
 # Third Party
 from fastapi.testclient import TestClient
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
 
 # Library
-from mongodb_api.main import app  # Import your FastAPI app
+from mongodb_api.main import app, create_app  # Import your FastAPI app
 from mongodb_api.models.models import Paper, PaperUpdate
+from mongodb_api.pool_monitor import PoolMonitor
+from mongodb_api.repositories.memory_paper_repository import (
+    InMemoryPaperRepository,
+)
 from mongodb_api.repositories.mongo_paper_repository import MongoPaperRepository
 from mongodb_api.services.paper_service import PaperService
 from mongodb_api.utils import custom_serialize, load_paper_json
@@ -48,6 +55,74 @@ def test_app_is_running():
     assert response.status_code == 200  # Expecting a successful response
 
 
+def test_list_papers_rejects_invalid_cursor():
+    """
+    Test to verify that a malformed pagination cursor is a client error.
+    """
+    response = client.get("/paper/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_papers_filters():
+    """
+    Test to verify that listing filters become a range and DOI query.
+    """
+    response = client.get(
+        "/paper/",
+        params={
+            "published_from": "2022-01-01T00:00:00+02:00",
+            "published_to": "2022-02-01T00:00:00Z",
+            "doi": "10.1234/abcd",
+        },
+    )
+
+    assert response.status_code == 200
+    query = app.database["papers"].find.call_args.args[0]
+    assert query == {
+        "published": {
+            "$gte": "2021-12-31T22:00:00Z",
+            "$lt": "2022-02-01T00:00:00Z",
+        },
+        "doi": "10.1234/abcd",
+    }
+
+
+def test_export_papers_streams_ndjson():
+    """
+    Test to verify that the export endpoint streams one paper per line,
+    both plain and gzip-encoded.
+    """
+    second_paper = {**paper_data, "_id": "http://arxiv.org/abs/0000.00001v1"}
+    app.database["papers"].find.return_value = [paper_data, second_paper]
+
+    for params in ({}, {"gzip": "true"}):
+        response = client.get("/paper/export", params=params)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line) for line in lines] == [
+            paper_data,
+            second_paper,
+        ]
+
+    assert response.headers["content-encoding"] == "gzip"
+    app.database["papers"].find.return_value = MagicMock()
+
+
+def test_search_papers():
+    """
+    Test to verify that search results are returned with their score.
+    """
+    app.database["papers"].find.return_value = [{**paper_data, "score": 1.5}]
+
+    response = client.get("/paper/search", params={"q": "insert"})
+
+    assert response.status_code == 200
+    assert response.json() == [{**paper_data, "score": 1.5}]
+    assert client.get("/paper/search").status_code == 422
+    app.database["papers"].find.return_value = MagicMock()
+
+
 # def test_create_paper():
 #    """
 #    Test to verify the creation of a paper in the database.
@@ -72,6 +147,71 @@ def test_read_paper():
     assert response.json() == paper_data  # Verifying the response data
 
 
+def test_read_paper_conditional():
+    """
+    Test to verify ETag/Last-Modified validators and 304 responses.
+    """
+    app.database["papers"].find_one.return_value = dict(paper_data)
+    url = "/paper/" + str(entry_paper_test.entry_id)
+
+    response = client.get(url)
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+    assert last_modified == "Mon, 09 Jan 2023 16:33:43 GMT"
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    app.database["papers"].find_one.reset_mock()
+    response = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    # Only the updated timestamp was read.
+    assert app.database["papers"].find_one.call_args.args[1] == {
+        "updated": 1
+    }
+
+    response = client.get(
+        url, headers={"If-Modified-Since": "Sun, 01 Jan 2023 00:00:00 GMT"}
+    )
+    assert response.status_code == 200
+
+
+def test_read_paper_fields():
+    """
+    Test to verify that requested fields are pushed down as a projection.
+    """
+    app.database["papers"].find_one.return_value = {
+        "_id": paper_data["_id"],
+        "title": paper_data["title"],
+    }
+    url = "/paper/" + str(entry_paper_test.entry_id)
+
+    response = client.get(url, params={"fields": "title"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "_id": paper_data["_id"],
+        "title": paper_data["title"],
+    }
+    assert app.database["papers"].find_one.call_args.args[1] == {"title": 1}
+    assert client.get(url, params={"fields": "authors"}).status_code == 400
+
+
+def test_read_paper_strict_validation():
+    """
+    Test to verify that strict response validation returns the same paper.
+    """
+    app.database["papers"].find_one.return_value = dict(paper_data)
+    app.strict_responses = True
+    try:
+        response = client.get("/paper/" + str(entry_paper_test.entry_id))
+    finally:
+        app.strict_responses = False
+    assert response.status_code == 200
+    assert response.json() == paper_data
+
+
 def test_read_inexisting_paper():
     """
     Test to verify the behavior when trying to read a non-existing paper.
@@ -89,14 +229,9 @@ def test_update_paper():
     """
     existing_id = str(entry_paper_test.entry_id)
     update_data_with_id = {**update_data, "_id": existing_id}
-    app.database["papers"].find_one.side_effect = [
-        paper_data,
-        update_data_with_id,
-    ]
-
-    update_result_mock = MagicMock()
-    update_result_mock.modified_count = 1
-    app.database["papers"].update_one.return_value = update_result_mock
+    app.database["papers"].find_one_and_update.return_value = (
+        update_data_with_id
+    )
 
     response = client.put(f"/paper/{existing_id}", json=update_data)
     assert response.status_code == 200
@@ -108,6 +243,7 @@ def test_update_inexisting_paper():
     Test to verify the behavior when trying to update a non-existing paper.
     """
     non_existing_id = "1234"
+    app.database["papers"].find_one_and_update.return_value = None
     app.database["papers"].find_one.return_value = None
     response = client.put(f"/paper/{non_existing_id}", json=update_data)
     assert response.status_code == 404
@@ -125,6 +261,182 @@ def test_update_inexisting_paper():
 #    assert response.status_code == 304
 
 
+def test_create_papers_bulk():
+    """
+    Test to verify per-item outcomes of a bulk paper creation.
+    """
+    duplicate_data = {**paper_data, "_id": "http://arxiv.org/abs/0000.00001v1"}
+    app.database["papers"].insert_many.side_effect = BulkWriteError(
+        {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "dup"}]}
+    )
+    response = client.post(
+        "/paper/bulk",
+        json=[paper_data, duplicate_data, {"_id": "not-a-paper"}],
+    )
+    app.database["papers"].insert_many.side_effect = None
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["duplicate"], body["invalid"]) == (1, 1, 1)
+    assert [item["status"] for item in body["items"]] == [
+        "created",
+        "duplicate",
+        "invalid",
+    ]
+    assert body["items"][2]["id"] == "not-a-paper"
+
+
 def test_delete_paper():
     response = client.delete("/paper/" + str(entry_paper_test.entry_id))
     assert response.status_code == 200
+
+
+def test_health_ready_reports_pool_stats():
+    """
+    Test to verify that readiness pings MongoDB and reports pool stats.
+    """
+    app.mongodb_client = MagicMock()
+    app.pool_monitor = PoolMonitor()
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["pool"]["checked_out"] == 0
+    app.mongodb_client.admin.command.assert_called_once_with("ping")
+
+
+def test_health_ready_is_unavailable_when_ping_fails():
+    """
+    Test to verify that a failed ping makes the API not ready.
+    """
+    app.mongodb_client = MagicMock()
+    app.mongodb_client.admin.command.side_effect = ServerSelectionTimeoutError(
+        "no servers"
+    )
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+
+
+def test_read_only_replica_rejects_writes():
+    """
+    Test to verify that writes to a read-only replica get HTTP 405.
+    """
+    replica_app = create_app()
+    replica_app.mongodb_client = None
+    replica_app.paper_service = PaperService(
+        InMemoryPaperRepository([paper_data], read_only=True)
+    )
+    replica_client = TestClient(replica_app)
+    paper_id = quote(paper_data["_id"], safe="")
+
+    assert replica_client.get(f"/paper/{paper_id}").status_code == 200
+    response = replica_client.delete(f"/paper/{paper_id}")
+    assert response.status_code == 405
+    assert response.headers["Allow"] == "GET, HEAD"
+    assert replica_client.get("/health/ready").status_code == 200
+
+
+def test_bulk_update_by_ids_sets_given_fields_only():
+    """
+    Test to verify that bulk updates by id become one batch write.
+    """
+    collection = app.database["papers"]
+    collection.bulk_write.reset_mock()
+    collection.bulk_write.return_value = MagicMock(
+        matched_count=2, modified_count=1
+    )
+
+    response = client.patch(
+        "/paper/bulk",
+        json={
+            "updates": [
+                {"id": "a", "update": {"doi": "10.1/a"}},
+                {"id": "b", "update": {"download_path": None}},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"matched": 2, "modified": 1, "failed": 0}
+    operations = collection.bulk_write.call_args.args[0]
+    assert [operation._doc for operation in operations] == [
+        {"$set": {"doi": "10.1/a"}},
+        {"$set": {"download_path": None}},
+    ]
+
+
+def test_bulk_update_by_filter():
+    """
+    Test to verify that a filtered bulk update becomes one update_many.
+    """
+    collection = app.database["papers"]
+    collection.update_many.return_value = MagicMock(
+        matched_count=3, modified_count=3
+    )
+
+    response = client.patch(
+        "/paper/bulk",
+        json={
+            "filter": {"published_from": "2022-01-01T00:00:00+02:00"},
+            "set": {"comment": "backfilled"},
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["modified"] == 3
+    collection.update_many.assert_called_with(
+        {"published": {"$gte": "2021-12-31T22:00:00Z"}},
+        {"$set": {"comment": "backfilled"}},
+    )
+    assert client.patch(
+        "/paper/bulk", json={"filter": {"doi": "10.1/a"}}
+    ).status_code == 422
+
+
+def test_bulk_delete_needs_a_filter():
+    """
+    Test to verify that bulk deletes are filtered and never unbounded.
+    """
+    collection = app.database["papers"]
+    collection.delete_many.return_value = MagicMock(deleted_count=2)
+
+    response = client.post("/paper/bulk-delete", json={"ids": ["a", "b"]})
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 2}
+    collection.delete_many.assert_called_with({"_id": {"$in": ["a", "b"]}})
+    assert client.post("/paper/bulk-delete", json={}).status_code == 422
+
+
+def test_find_paper_by_arxiv_id():
+    """
+    Test to verify that arXiv ids resolve to their latest or given version.
+    """
+    versions_app = create_app()
+    versions_app.mongodb_client = None
+    versions_app.paper_service = PaperService(InMemoryPaperRepository())
+    versions_client = TestClient(versions_app)
+    for version in (1, 2):
+        paper = dict(paper_data)
+        paper["_id"] = paper["_id"].replace("v2", f"v{version}")
+        assert versions_client.post("/paper/", json=paper).status_code == 201
+
+    response = versions_client.get("/paper/arxiv/2210.06998")
+    assert response.status_code == 200
+    assert response.json()["_id"] == paper_data["_id"]
+    assert response.json()["version"] == 2
+    assert "ETag" in response.headers
+    url = quote("http://arxiv.org/abs/2210.06998v1", safe="")
+    assert versions_client.get(
+        f"/paper/arxiv/{url}?fields=title"
+    ).json() == {"_id": paper_data["_id"].replace("v2", "v1"),
+                 "title": paper_data["title"]}
+
+    response = versions_client.get("/paper/arxiv/2210.06998/versions")
+    assert [paper["version"] for paper in response.json()] == [2, 1]
+    assert versions_client.get("/paper/arxiv/2210.06999").status_code == 404
+    assert versions_client.get("/paper/arxiv/not-an-id").status_code == 400
@@ -0,0 +1,54 @@
+"""Tests for the in-process BM25 SearchIndex."""
+
+# Library
+from mongodb_api.services.search_index import SearchIndex, tokenize
+
+
+def make_paper(paper_id, title, summary=""):
+    return {"_id": paper_id, "title": title, "summary": summary}
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("Graph Neural-Networks, 2023!") == [
+        "graph",
+        "neural",
+        "networks",
+        "2023",
+    ]
+
+
+def test_search_ranks_by_relevance():
+    index = SearchIndex()
+    index.add(make_paper("a", "Graph neural networks", "graph graph"))
+    index.add(make_paper("b", "Neural networks", "vision"))
+    index.add(make_paper("c", "Protein folding", "biology"))
+
+    hits = index.search("graph networks")
+
+    assert [paper_id for paper_id, _ in hits] == ["a", "b"]
+    assert hits[0][1] > hits[1][1]
+
+
+def test_search_paginates():
+    index = SearchIndex()
+    for i in range(5):
+        index.add(make_paper(str(i), "quantum " * (i + 1)))
+
+    first = index.search("quantum", limit=2)
+    second = index.search("quantum", limit=2, offset=2)
+
+    assert len(first) == len(second) == 2
+    assert not {p for p, _ in first} & {p for p, _ in second}
+
+
+def test_add_replaces_and_remove_forgets():
+    index = SearchIndex()
+    index.add(make_paper("a", "Quantum computing"))
+    index.add(make_paper("a", "Classical computing"))
+
+    assert index.search("quantum") == []
+    assert [p for p, _ in index.search("classical")] == ["a"]
+
+    index.remove("a")
+    assert index.search("computing") == []
+    assert len(index) == 0
@@ -0,0 +1,77 @@
+"""Import-time benchmark and side-effect checks for mongodb_api.main."""
+
+# Standard Library
+import json
+import os
+import subprocess
+import sys
+
+# Budget, in seconds, for importing the package itself once its third-party
+# dependencies are loaded. Override with IMPORT_TIME_BUDGET on slow machines.
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "0.5"))
+
+IMPORT_PROBE = """
+import json
+import logging
+import os
+import sys
+import time
+
+opened = []
+
+
+def audit(event, args):
+    if event == "open" and isinstance(args[0], str):
+        opened.append(args[0])
+
+
+# Third-party imports are not what this benchmark measures.
+import anyio, dateutil.parser, dotenv, fastapi, fastapi.responses
+import pydantic, pymongo
+
+cwd = os.getcwd()
+sys.addaudithook(audit)
+start = time.perf_counter()
+import mongodb_api.main
+elapsed = time.perf_counter() - start
+
+print(json.dumps({
+    "elapsed": elapsed,
+    "cwd_changed": os.getcwd() != cwd,
+    "root_handlers": len(logging.getLogger().handlers),
+    "opened": [
+        path for path in opened
+        if path.endswith((".json", ".conf", ".env"))
+    ],
+}))
+"""
+
+
+def probe_import():
+    root = os.path.join(os.path.dirname(__file__), "..", "..")
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=os.path.abspath(root),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_has_no_side_effects():
+    probe = probe_import()
+
+    assert probe["opened"] == []
+    assert not probe["cwd_changed"]
+    assert probe["root_handlers"] == 0
+
+
+def test_import_time_within_budget():
+    # Best of three runs, to keep scheduler noise out of the measurement.
+    elapsed = min(probe_import()["elapsed"] for _ in range(3))
+
+    assert elapsed < IMPORT_TIME_BUDGET, (
+        f"importing mongodb_api.main took {elapsed:.3f}s, "
+        f"budget is {IMPORT_TIME_BUDGET:.3f}s"
+    )
@@ -0,0 +1,29 @@
+"""Tests for the serialization and identifier helpers."""
+
+# Third Party
+import pytest
+
+# Library
+from mongodb_api.utils import parse_arxiv_id
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2210.06998", ("2210.06998", None)),
+        ("2210.06998v2", ("2210.06998", 2)),
+        ("arXiv:2210.06998v12", ("2210.06998", 12)),
+        ("http://arxiv.org/abs/2210.06998v2", ("2210.06998", 2)),
+        ("https://arxiv.org/pdf/2210.06998v1.pdf", ("2210.06998", 1)),
+        ("http://arxiv.org/abs/hep-th/9901001v3", ("hep-th/9901001", 3)),
+        ("math.GT/0309136", ("math.GT/0309136", None)),
+    ],
+)
+def test_parse_arxiv_id(value, expected):
+    assert parse_arxiv_id(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "not-an-id", "2210.069", "/paper/1"])
+def test_parse_arxiv_id_rejects_other_ids(value):
+    with pytest.raises(ValueError):
+        parse_arxiv_id(value)
@@ -1,11 +1,25 @@
 # Standard Library
+import base64
+import binascii
+import email.utils
+import hashlib
 import json
+import re
+import zlib
 from collections import OrderedDict
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
 
 # Third Party
 import dateutil.parser
-from pydantic import AnyUrl, BaseModel
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    # Third Party
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
 
 def load_paper_json(file_path):
@@ -24,20 +38,237 @@ def load_paper_json(file_path):
 def custom_serialize(model: BaseModel,
                      json_dump: bool = False,
                      ignore_none: bool = False):
+    """Dump a model with MongoDB/JSON-friendly values in a single pass.
+
+    Datetimes become ISO 8601 strings ("Z" for UTC) and URLs become plain
+    strings. ``ignore_none`` is kept for backwards compatibility; ``None``
+    values are preserved either way.
+    """
     if json_dump:
-        serialized_data = model.model_dump_json(by_alias=True)
-    else:
-        serialized_data = model.model_dump(by_alias=True)
-
-    # Manually handle specific types
-    for key, value in serialized_data.items():
-        if ignore_none and value is None:
-            #logger.info(f"Skipping serialization of {key} as it is None")
-            continue
-        if isinstance(value, datetime):
-            serialized_data[key] = value.isoformat().replace("+00:00", "Z")
-        elif isinstance(value, AnyUrl):
-            serialized_data[key] = str(value)
-        # Add more conditions for other special types if needed
-
-    return serialized_data
+        return model.model_dump_json(by_alias=True)
+    return model.model_dump(mode="json", by_alias=True)
+
+
+# arXiv identifiers, e.g. 2210.06998v2 or (before April 2007)
+# math.GT/0309136v1, optionally as an abs/pdf URL or with an "arXiv:" prefix.
+_ARXIV_ID_PATTERN = re.compile(
+    r"^(?:https?://(?:export\.)?arxiv\.org/(?:abs|pdf)/|arxiv:)?"
+    r"(?P<id>\d{4}\.\d{4,5}|[a-z][a-z\-]*(?:\.[a-z]{2})?/\d{7})"
+    r"(?:v(?P<version>\d+))?(?:\.pdf)?/?$",
+    re.IGNORECASE,
+)
+
+
+def parse_arxiv_id(value: str) -> tuple[str, int | None]:
+    """Split an arXiv identifier or ``entry_id`` URL into its canonical,
+    unversioned id and its version (``None`` when it has none).
+
+    Raises ``ValueError`` if ``value`` is not an arXiv identifier.
+    """
+    match = _ARXIV_ID_PATTERN.match(value.strip())
+    if match is None:
+        raise ValueError(f"Not an arXiv identifier: {value}")
+    arxiv_id = match.group("id")
+    if "/" in arxiv_id:
+        # Archive names are lowercase, subject classes uppercase.
+        archive, number = arxiv_id.split("/")
+        name, dot, subject = archive.partition(".")
+        arxiv_id = f"{name.lower()}{dot}{subject.upper()}/{number}"
+    version = match.group("version")
+    return arxiv_id, None if version is None else int(version)
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime the way papers store it: ISO 8601 in UTC with a
+    "Z" suffix. Naive datetimes are taken to be in UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def dump_json(document) -> bytes:
+    """Encode a stored document as JSON bytes without model validation.
+
+    Uses orjson when it is installed. Values without a native JSON type
+    (e.g. ``ObjectId``) are encoded with ``str``.
+    """
+    if orjson is not None:
+        return orjson.dumps(document, default=str)
+    return json.dumps(document, default=str,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def paper_etag(paper) -> str:
+    """Strong ETag of a paper: a hash of its JSON representation."""
+    digest = hashlib.blake2b(dump_json(paper), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = False) -> bool:
+    """Check ``etag`` against an ``If-Match``/``If-None-Match`` header.
+
+    ``If-Match`` uses the strong comparison, so weak validators never
+    match; pass ``weak=True`` for ``If-None-Match``.
+    """
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def paper_last_modified(paper) -> datetime | None:
+    """The ``updated`` timestamp of a paper as an aware datetime."""
+    value = paper.get("updated")
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = dateutil.parser.isoparse(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP date (``Last-Modified``)."""
+    return email.utils.format_datetime(
+        value.astimezone(timezone.utc), usegmt=True
+    )
+
+
+def parse_http_date(header: str | None) -> datetime | None:
+    """Parse an HTTP date header, returning ``None`` if it is invalid."""
+    if not header:
+        return None
+    try:
+        value = email.utils.parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class TrustedJSONResponse(JSONResponse):
+    """JSON response that encodes content as-is with ``dump_json``.
+
+    Meant for documents read back from our own database, which were
+    validated on the way in, so they skip ``response_model`` validation.
+    """
+
+    def render(self, content) -> bytes:
+        return dump_json(content)
+
+
+def encode_cursor(payload) -> str:
+    """Encode a JSON-serializable pagination payload as an opaque token."""
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Decode a token produced by ``encode_cursor``.
+
+    Raises:
+    ValueError: If the token is not a valid cursor.
+    """
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+        return json.loads(raw)
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as error:
+        raise ValueError(f"Invalid cursor: {token!r}") from error
+
+
+class _ChunkBuffer:
+    """Accumulate byte strings and release them in chunks of
+    roughly ``chunk_size`` bytes."""
+
+    def __init__(self, chunk_size: int):
+        self._chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+
+    def add(self, data: bytes) -> bytes | None:
+        self._parts.append(data)
+        self._size += len(data)
+        if self._size >= self._chunk_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> bytes | None:
+        if not self._parts:
+            return None
+        chunk = b"".join(self._parts)
+        self._parts = []
+        self._size = 0
+        return chunk
+
+
+def _ndjson_line(document: dict) -> bytes:
+    return dump_json(document) + b"\n"
+
+
+def iter_ndjson(documents: Iterable[dict],
+                chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encode documents as newline-delimited JSON.
+
+    Lines are buffered into chunks of roughly ``chunk_size`` bytes so a
+    streaming response is not flushed once per document. Only one chunk is
+    held in memory at a time.
+    """
+    buffer = _ChunkBuffer(chunk_size)
+    for document in documents:
+        chunk = buffer.add(_ndjson_line(document))
+        if chunk:
+            yield chunk
+    chunk = buffer.flush()
+    if chunk:
+        yield chunk
+
+
+async def aiter_ndjson(documents: AsyncIterable[dict],
+                       chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Async counterpart of ``iter_ndjson``."""
+    buffer = _ChunkBuffer(chunk_size)
+    async for document in documents:
+        chunk = buffer.add(_ndjson_line(document))
+        if chunk:
+            yield chunk
+    chunk = buffer.flush()
+    if chunk:
+        yield chunk
+
+
+def _gzip_compressor(compresslevel: int):
+    return zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+
+
+def iter_gzip(chunks: Iterable[bytes],
+              compresslevel: int = 6) -> Iterator[bytes]:
+    """Incrementally gzip-compress a stream of byte chunks."""
+    compressor = _gzip_compressor(compresslevel)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+async def aiter_gzip(chunks: AsyncIterable[bytes],
+                     compresslevel: int = 6) -> AsyncIterator[bytes]:
+    """Async counterpart of ``iter_gzip``."""
+    compressor = _gzip_compressor(compresslevel)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()